@@ -0,0 +1,65 @@
+"""
+임베딩 전송 형식 파싱 벤치마크
+엔드포인트 응답 본문 하나를 1차원 float32 배열로 만드는 비용을 형식별로 비교
+
+사용법:
+    python benchmarks/embedding_wire_format.py --dim 192 --repeat 20000
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import embedding_codec  # noqa: E402
+from utils.embedding_codec import from_base64, from_npy, from_raw, loads_json  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 응답 형식별 파싱 비용")
+    parser.add_argument("--dim", type=int, default=192)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    embedding = np.random.default_rng(0).standard_normal(args.dim).astype(np.float32)
+    json_body = json.dumps({"embedding": embedding.tolist(), "dimension": args.dim}).encode()
+    npy_buffer = io.BytesIO()
+    np.save(npy_buffer, embedding)
+    raw_body = embedding.tobytes()
+    base64_body = base64.b64encode(raw_body)
+    json_base64_body = json.dumps({"embedding": base64_body.decode()}).encode()
+
+    cases = [
+        # 기존 경로: 표준 json → 파이썬 float 리스트 → np.array
+        ("json (stdlib) + np.array", json_body,
+         lambda: np.array(json.loads(json_body)["embedding"], dtype=np.float32)),
+        ("json (fast) + np.asarray", json_body,
+         lambda: np.asarray(loads_json(json_body)["embedding"], dtype=np.float32)),
+        ("json + base64 float32", json_base64_body,
+         lambda: from_base64(loads_json(json_base64_body)["embedding"])),
+        ("base64 float32", base64_body, lambda: from_base64(base64_body)),
+        ("npy", npy_buffer.getvalue(), lambda: from_npy(npy_buffer.getvalue())),
+        ("raw float32", raw_body, lambda: from_raw(raw_body)),
+    ]
+
+    decoder = "orjson" if embedding_codec.orjson is not None else "json (orjson 미설치)"
+    print(f"차원 {args.dim}, 반복 {args.repeat}회, 빠른 JSON 디코더: {decoder}\n")
+    print(f"{'format':<28}{'bytes':>8}{'µs/embedding':>15}{'vs json':>10}")
+
+    baseline = None
+    for name, body, parse in cases:
+        assert np.allclose(parse(), embedding)
+        per_call = min(timeit.repeat(parse, number=args.repeat, repeat=3)) / args.repeat
+        baseline = baseline or per_call
+        print(f"{name:<28}{len(body):>8}{per_call * 1e6:>15.2f}{baseline / per_call:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+STFT/멜 특징 벤치마크
+전체 프레임을 한 번에 변환하는 단순 구현과 블록 단위 구현(클립별 할당/출력 배열 공유 루프)의 처리 시간 비교
+
+사용법:
+    python benchmarks/mel_features.py --clips 32 --seconds 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.spectral_features import (  # noqa: E402
+    HOP_LENGTH, N_FFT, compute_features, compute_features_batch, frame_view, mel_filterbank
+)
+
+SAMPLE_RATE = 16000
+
+
+def naive_log_mel(audio: np.ndarray) -> np.ndarray:
+    """프레임 복사 + 전체 rfft + 필터뱅크 매번 생성 (캐시/블록 없음)"""
+    padded = np.pad(audio, N_FFT // 2, mode="reflect")
+    n_frames = 1 + (len(padded) - N_FFT) // HOP_LENGTH
+    frames = np.stack([padded[i * HOP_LENGTH:i * HOP_LENGTH + N_FFT] for i in range(n_frames)])
+    spectrum = np.fft.rfft(frames * np.hanning(N_FFT + 1)[:-1], axis=-1)
+    mel = (np.abs(spectrum) ** 2) @ mel_filterbank.__wrapped__(SAMPLE_RATE).T
+    db = 10 * np.log10(np.maximum(mel, 1e-10))
+    return np.maximum(db - db.max(), -80.0).T
+
+
+def timed(fn, repeat: int) -> float:
+    fn()  # 윈도우/필터뱅크 캐시 준비
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STFT/멜 특징 처리 시간")
+    parser.add_argument("--clips", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    clips = [
+        (rng.standard_normal(int(SAMPLE_RATE * args.seconds * rng.uniform(0.7, 1.0))) * 0.1).astype(np.float32)
+        for _ in range(args.clips)
+    ]
+    frames = sum(len(frame_view(np.pad(clip, N_FFT // 2), N_FFT, HOP_LENGTH)) for clip in clips)
+
+    print(f"{args.clips}개 클립 x 최대 {args.seconds:g}초, 총 {frames} 프레임\n")
+    print(f"{'method':<12}{'ms':>9}{'us/frame':>10}")
+    for name, fn in (
+        ("naive", lambda: [naive_log_mel(clip) for clip in clips]),
+        ("per-clip", lambda: [compute_features(clip, SAMPLE_RATE).log_mel() for clip in clips]),
+        ("shared-out", lambda: [features.log_mel() for features in compute_features_batch(clips, SAMPLE_RATE)]),
+    ):
+        ms = timed(fn, args.repeat)
+        print(f"{name:<12}{ms:>9.1f}{ms * 1e3 / frames:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+성문 양자화 저장 벤치마크
+float16/int8 저장 시 성문당 메모리, 질의 지연 시간, float32 대비 판정 변화(drift)를 측정
+
+사용법:
+    python benchmarks/voiceprint_quantization.py --size 100000 --rescore 0 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.voiceprint_index import synthetic_embeddings  # noqa: E402
+from models.voiceprint_gallery import VoiceprintGallery  # noqa: E402
+from models.voiceprint_index import ExactIndex  # noqa: E402
+
+
+def graded_queries(vectors: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    임계값 부근까지 고르게 퍼진 질의
+
+    잡음 크기를 질의마다 달리하여 본인 성문과의 유사도가 약 0.45~0.95에 걸치도록 합니다.
+    """
+    picked = vectors[rng.integers(0, len(vectors), count)]
+    sigma = rng.uniform(0.02, 0.15, (count, 1)).astype(np.float32)
+    noisy = picked + rng.standard_normal(picked.shape).astype(np.float32) * sigma
+    return noisy / np.linalg.norm(noisy, axis=1, keepdims=True)
+
+
+def python_list_bytes(dim: int) -> int:
+    """기존 방식(파이썬 float 리스트) 성문 하나의 크기"""
+    embedding = [float(v) for v in np.random.randn(dim)]
+    return sys.getsizeof(embedding) + sum(sys.getsizeof(v) for v in embedding)
+
+
+def run(gallery: VoiceprintGallery, queries: np.ndarray, k: int):
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        results.append(gallery.search(query, k))
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="성문 양자화 저장 메모리/정확도 벤치마크")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=192)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--rescore", type=int, nargs="+", default=[0, 50])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = synthetic_embeddings(args.size, args.dim, rng)
+    queries = graded_queries(vectors, args.queries, rng)
+    ids = [f"v{i}" for i in range(args.size)]
+    originals = dict(zip(ids, vectors))
+
+    print(f"기존 파이썬 리스트 방식: 성문당 약 {python_list_bytes(args.dim)}바이트\n")
+
+    baseline = None
+    print(
+        f"{'storage':<10}{'rescore':>8}{'B/voice':>9}{'ms/query':>10}"
+        f"{'top1 diff':>11}{'decision diff':>15}{'max |Δscore|':>14}"
+    )
+    for storage in ("float32", "float16", "int8"):
+        index = ExactIndex(args.dim, storage=storage)
+        for item_id, vector in zip(ids, vectors):
+            index.add(item_id, vector)
+        bytes_per_voice = index.nbytes / len(index)
+
+        for rescore in (args.rescore if storage != "float32" else [0]):
+            gallery = VoiceprintGallery(args.dim, index=index, exact_source=originals.get, rescore=rescore)
+            results, latency = run(gallery, queries, args.k)
+            if baseline is None:
+                baseline = results
+
+            top1_diff = decision_diff = 0
+            max_delta = 0.0
+            for found, truth in zip(results, baseline):
+                top1_diff += found[0][0] != truth[0][0]
+                decision_diff += (found[0][1] >= args.threshold) != (truth[0][1] >= args.threshold)
+                max_delta = max(max_delta, abs(found[0][1] - truth[0][1]))
+
+            print(
+                f"{storage:<10}{rescore:>8}{bytes_per_voice:>9.0f}{latency * 1e3:>10.3f}"
+                f"{top1_diff:>11}{decision_diff:>15}{max_delta:>14.5f}"
+            )
+
+    print(f"\n질의 {args.queries}개 기준, 판정 임계값 {args.threshold}")
+
+
+if __name__ == "__main__":
+    main()
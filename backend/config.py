@@ -2,6 +2,8 @@
 Deep Truth 설정 파일
 """
 from pathlib import Path
+from typing import Optional
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -15,21 +17,104 @@ class Settings(BaseSettings):
     HUGGINGFACE_DEEPFAKE_MODEL: str = "facebook/wav2vec2-base"
     HUGGINGFACE_SPEAKER_MODEL: str = "speechbrain/spkrec-ecapa-voxceleb"
 
+    # HTTP 커넥션 풀 설정 (HuggingFace Endpoint 공유 클라이언트)
+    HTTP_POOL_LIMIT: int = 100  # 전체 동시 연결 수
+    HTTP_POOL_LIMIT_PER_HOST: int = 20  # 엔드포인트별 동시 연결 수
+    HTTP_DNS_CACHE_TTL: int = 300  # DNS 캐시 유지 시간 (초)
+    HTTP_KEEPALIVE_TIMEOUT: float = 60.0  # 유휴 연결 유지 시간 (초)
+    HTTP_CONNECT_TIMEOUT: float = 5.0  # 연결 타임아웃 (초)
+    HTTP_TOTAL_TIMEOUT: float = 30.0  # 요청 전체 타임아웃 (초)
+
     # 경로 설정
     BASE_DIR: Path = Path(__file__).parent
     DATA_DIR: Path = BASE_DIR / "data"
     VOICEPRINTS_DIR: Path = DATA_DIR / "voiceprints"
     REAL_VOICES_DIR: Path = DATA_DIR / "real_voices"
     FAKE_VOICES_DIR: Path = DATA_DIR / "fake_voices"
+    RESULT_CACHE_DIR: Path = DATA_DIR / "cache"
+
+    # 분석 결과 캐시 설정 (오디오 SHA-256 기반)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # 메모리 계층 예산 (32MB)
+    RESULT_CACHE_TTL: float = 86400.0  # 항목 유효 시간 (초)
+    RESULT_CACHE_DISK: bool = False  # 디스크 계층 사용 여부 (재시작 후 유지)
 
     # 오디오 설정
     SAMPLE_RATE: int = 16000
     MIN_AUDIO_DURATION: float = 1.0  # 최소 1초
     MAX_AUDIO_DURATION: float = 60.0  # 최대 60초
+    MIN_AUDIO_SAMPLE_RATE: int = 8000  # 헤더상의 샘플레이트 허용 범위 (벗어나면 415)
+    MAX_AUDIO_SAMPLE_RATE: int = 192000
+
+    # 업로드 수신 설정
+    UPLOAD_MAX_BYTE_RATE: int = 48000 * 2 * 2  # 최악의 비압축 바이트율 (48kHz, 스테레오, 16bit)
+    UPLOAD_HEADER_SLACK: int = 1024 * 1024  # 헤더/메타데이터/멀티파트 여유분
+    UPLOAD_SPILL_THRESHOLD: int = 1024 * 1024  # 이 크기를 넘으면 임시 파일로 스필
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024  # 읽기 청크 크기
+
+    # 원격 추론 전송 오디오 설정 (한 번 디코딩 → 16kHz 모노 → 앞뒤 무음 제거 → 16bit PCM WAV)
+    OUTBOUND_ENCODING_ENABLED: bool = True  # False면 업로드 원본을 그대로 전송
+    OUTBOUND_TRIM_SILENCE: bool = True  # 앞뒤 무음 제거 여부
+    OUTBOUND_TRIM_THRESHOLD: float = 0.01  # 무음 판정 프레임 RMS
+    OUTBOUND_TRIM_PAD: float = 0.25  # 음성 앞뒤로 남길 여유 (초)
 
     # 모델 설정
     DEEPFAKE_THRESHOLD: float = 0.5
     SPEAKER_VERIFICATION_THRESHOLD: float = 0.7
+    SPEAKER_EMBEDDING_CONCURRENCY: int = 4  # 요청 하나가 동시에 보내는 화자 임베딩 호출 수 (등록 샘플 등)
+
+    # 긴 클립 구간 임베딩 설정
+    SPEAKER_SEGMENT_MIN_CLIP: float = 6.0  # 이 길이(초) 이상인 클립은 음성 구간 윈도우로 나누어 임베딩
+    SPEAKER_SEGMENT_SECONDS: float = 3.0  # 윈도우 길이 (초)
+    SPEAKER_SEGMENT_AGGREGATION: str = "quality"  # "mean", "quality" (품질 가중 평균), "best_k" (품질 상위 k개 평균)
+    SPEAKER_SEGMENT_TOP_K: int = 3  # best_k 집계에 사용할 윈도우 수
+    SPEAKER_SEGMENT_LATENCY_BUDGET: float = 2.0  # 구간 임베딩 목표 소요 시간 (초, 윈도우 수 상한 결정)
+
+    # 성문 검색 인덱스 설정
+    VOICEPRINT_INDEX: str = "exact"  # "exact" (전수 검색) 또는 "ivf" (근사 검색, 대규모 갤러리)
+    VOICEPRINT_IVF_NLIST: int = 1024  # IVF 최대 중심점 수 (실제 수는 학습 시점 벡터 수 N에 맞춰 약 √N)
+    VOICEPRINT_IVF_TRAIN_SIZE: int = 2048  # 이 수 이상인 파티션만 IVF 학습 (가족 규모 파티션은 전수 검색)
+    VOICEPRINT_IVF_NPROBE: int = 16  # 질의당 검색할 목록 수 (클수록 재현율↑ 지연↑)
+    VOICEPRINT_MAX_RESIDENT_FAMILIES: int = 1000  # 메모리에 상주시킬 최대 가족 파티션 수
+    VOICEPRINT_STORE_FSYNC: bool = True  # 성문 저장소 쓰기마다 fsync (False면 전원 장애 시 마지막 쓰기 유실 가능)
+    VOICEPRINT_STORAGE: str = "float32"  # 메모리 벡터 형식: "float32", "float16" (1/2), "int8" (약 1/4, 행별 배율)
+    VOICEPRINT_RESCORE: int = 50  # 양자화 형식일 때 저장소의 float32 원본으로 다시 채점할 상위 후보 수 (0이면 안 함)
+
+    # 코호트 점수 정규화 설정 (S-norm / AS-norm)
+    SCORE_NORM_ENABLED: bool = True  # 코호트 파일이 있을 때만 적용
+    SCORE_NORM_COHORT_PATH: Optional[Path] = None  # 사칭자 코호트 임베딩 (N x 192 float32, 기본: VOICEPRINTS_DIR/cohort.npy)
+    SCORE_NORM_MODE: str = "asnorm"  # "snorm" (코호트 전체) 또는 "asnorm" (가까운 top_k개)
+    SCORE_NORM_TOP_K: int = 200  # asnorm 코호트 수
+    SCORE_NORM_THRESHOLD: float = 3.0  # 정규화 점수 일치 판정 임계값 (표준편차 단위, 코호트에 맞춰 조정)
+
+    # 딥페이크 탐지 캐스케이드 설정 (무음/너무 짧은 클립은 원격 호출 없이 로컬에서 확정)
+    CASCADE_ENABLED: bool = True
+    # 로컬 아티팩트 점수로 실제/합성을 확정하는 구간 - 보정된 분류기가 아니므로 기본은 사용 안 함.
+    # 라벨이 있는 데이터로 오판율을 확인한 임계값을 설정한 경우에만 지정
+    CASCADE_REAL_BELOW: Optional[float] = None  # 로컬 점수가 이 값 미만이면 실제 음성으로 확정
+    CASCADE_FAKE_ABOVE: Optional[float] = None  # 로컬 점수가 이 값 초과면 합성 음성으로 확정
+    CASCADE_SILENCE_RMS: float = 0.001  # 이 RMS 미만이면 무음으로 판정
+
+    # 분석 파이프라인 설정
+    ANALYSIS_DEADLINE: float = 45.0  # 탐지+검증 전체 마감 시간 (초)
+    BATCH_MAX_FILES: int = 50  # 일괄 분석 최대 파일 수
+    BATCH_CONCURRENCY: int = 4  # 일괄 분석 동시 실행 수 (원격 엔드포인트 보호)
+    VOICEPRINT_ENROLL_MAX_FILES: int = 10  # 성문 일괄 등록(/api/voiceprint/enroll) 최대 샘플 수
+
+    # 비동기 분석 작업 큐 설정
+    JOB_WORKERS: int = 2  # 워커 수
+    JOB_QUEUE_SIZE: int = 100  # 최대 대기 작업 수
+    JOB_DEADLINE: float = 180.0  # 작업별 마감 시간 (초, 제출 시점 기준)
+    JOB_MAX_ATTEMPTS: int = 5  # 모델 로딩 중(503)일 때 최대 시도 횟수
+    JOB_RETRY_DELAY: float = 10.0  # 재시도 대기 시간 (초)
+    JOB_RESULT_TTL: float = 600.0  # 완료 결과 보관 시간 (초)
+
+    # 실시간 통화 분석 (WebSocket) 설정
+    STREAM_WINDOW_SECONDS: float = 3.0  # 분석 윈도우 길이 (초)
+    STREAM_HOP_SECONDS: float = 1.5  # 윈도우 간격 (초)
+    STREAM_MAX_PENDING_WINDOWS: int = 2  # 연결별 분석 대기 윈도우 상한 (초과 시 오래된 윈도우 폐기)
+    STREAM_MAX_FRAME_BYTES: int = 64 * 1024  # 수신 프레임 최대 크기
+    STREAM_SMOOTHING: float = 0.5  # 롤링 위험도 지수 이동 평균 계수
 
     # CORS 설정
     CORS_ORIGINS: list = [
@@ -41,6 +126,13 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
 
+    @model_validator(mode="after")
+    def _derive_paths(self) -> "Settings":
+        """다른 경로 설정에서 파생되는 기본 경로 (환경변수로 바꾼 VOICEPRINTS_DIR을 따라감)"""
+        if self.SCORE_NORM_COHORT_PATH is None:
+            self.SCORE_NORM_COHORT_PATH = self.VOICEPRINTS_DIR / "cohort.npy"
+        return self
+
 settings = Settings()
 
 # 디렉토리 생성
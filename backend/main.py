@@ -3,19 +3,53 @@ Deep Truth API - FastAPI 메인 엔트리 포인트
 딥페이크 음성 탐지 및 화자 검증 서비스
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from config import settings
+from models.job_queue import get_job_queue
+from utils.http_client import get_http_client
+from utils.upload_ingest import UploadLimitMiddleware, UploadRejectedError, max_upload_bytes
 
 # 라우터 임포트
 from routers import analysis, voiceprint, family_code, history
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명 주기 - 공유 HTTP 커넥션 풀 및 분석 작업 워커 시작/종료"""
+    http_client = get_http_client()
+    await http_client.start()
+    job_queue = get_job_queue()
+    job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await http_client.close()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="딥페이크 음성 탐지 및 화자 검증 API",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
+)
+
+# 업로드 본문 크기/형식 제한 (본문 수신 전/수신 중 조기 거부)
+# CORS보다 먼저 등록해 안쪽에서 실행 - 413/415 응답에도 CORS 헤더가 붙음
+app.add_middleware(
+    UploadLimitMiddleware,
+    limits=[
+        ("/api/analyze/batch", max_upload_bytes() * settings.BATCH_MAX_FILES),
+        ("/api/analyze", max_upload_bytes()),
+        ("/api/voiceprint/enroll", max_upload_bytes() * settings.VOICEPRINT_ENROLL_MAX_FILES),
+        ("/api/voiceprint", max_upload_bytes()),
+    ]
 )
 
 # CORS 설정
@@ -27,6 +61,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(UploadRejectedError)
+async def upload_rejected_handler(request: Request, exc: UploadRejectedError):
+    """업로드 거부 예외를 HTTP 응답으로 변환"""
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
+
+
 # 라우터 등록
 app.include_router(analysis.router, prefix="/api/analyze", tags=["Analysis"])
 app.include_router(voiceprint.router, prefix="/api/voiceprint", tags=["Voiceprint"])
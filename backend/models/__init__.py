@@ -5,5 +5,17 @@ Deep Truth AI Models
 
 from .deepfake_detector import DeepfakeDetector
 from .speaker_verifier import SpeakerVerifier
+from .voiceprint_gallery import VoiceprintGallery
+from .voiceprint_index import VoiceprintIndex, ExactIndex, IVFIndex
+from .voiceprint_partitions import VoiceprintPartitions
+from .embedding_store import EmbeddingStore
+from .score_normalizer import CohortScoreNormalizer
+from .analysis_pipeline import AnalysisPipeline, AnalysisTimeoutError
+from .job_queue import AnalysisJobQueue, JobQueueFullError
 
-__all__ = ['DeepfakeDetector', 'SpeakerVerifier']
+__all__ = [
+    'DeepfakeDetector', 'SpeakerVerifier', 'AnalysisPipeline', 'AnalysisTimeoutError',
+    'VoiceprintGallery', 'VoiceprintIndex', 'ExactIndex', 'IVFIndex',
+    'VoiceprintPartitions', 'EmbeddingStore', 'CohortScoreNormalizer',
+    'AnalysisJobQueue', 'JobQueueFullError'
+]
@@ -0,0 +1,243 @@
+"""
+분석 파이프라인 모듈
+딥페이크 탐지와 화자 검증을 동시에 실행하고 단계별 소요 시간을 기록
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.outbound_audio import OutboundEncoder, PendingOutbound, get_outbound_encoder
+from utils.result_cache import audio_digest
+
+from .deepfake_detector import DeepfakeDetector, get_detector
+from .speaker_verifier import SpeakerVerifier, get_verifier
+
+
+class AnalysisTimeoutError(Exception):
+    """분석 마감 시간 초과"""
+
+
+class StageTimer:
+    """
+    단계별 소요 시간 기록기
+
+    각 단계의 경과 시간(초)을 이름별로 누적합니다.
+    """
+
+    def __init__(self, initial: Optional[Dict[str, float]] = None):
+        self.timings: Dict[str, float] = dict(initial or {})
+
+    def record(self, stage: str, elapsed: float):
+        """단계 소요 시간 기록"""
+        self.timings[stage] = round(self.timings.get(stage, 0.0) + elapsed, 4)
+
+    async def measure(self, stage: str, coro):
+        """코루틴 실행 시간을 측정하며 결과 반환"""
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+
+def assess_risk(
+    deepfake_prob: float,
+    voiceprint_match: float,
+    voiceprint_verified: Optional[bool] = None
+) -> Tuple[str, List[str]]:
+    """
+    위험도 판정
+
+    Args:
+        deepfake_prob: 딥페이크 확률 (0-100)
+        voiceprint_match: 성문 일치율 (0-100, 원시 코사인)
+        voiceprint_verified: 코호트 정규화 점수로 내린 일치 판정 (있으면 일치율 60% 기준 대신 사용)
+
+    Returns:
+        (위험도 레벨, 권장 조치 리스트)
+    """
+    mismatch = voiceprint_match < 60 if voiceprint_verified is None else not voiceprint_verified
+    if deepfake_prob > 70 or (mismatch and voiceprint_match < 30):
+        return "high", [
+            "⚠️ 본인에게 영상통화로 직접 확인하세요",
+            "🚨 경찰청 112에 신고하세요",
+            "💰 절대 송금하지 마세요"
+        ]
+    if deepfake_prob > 40 or mismatch:
+        return "medium", [
+            "📞 추가 확인이 필요합니다",
+            "👤 본인에게 직접 연락하여 확인하세요"
+        ]
+    return "low", [
+        "✅ 정상적인 음성으로 판단됩니다",
+        "💡 그래도 의심되면 직접 확인하세요"
+    ]
+
+
+class AnalysisPipeline:
+    """
+    딥페이크 탐지 + 화자 검증 통합 파이프라인
+
+    두 원격 추론 호출은 서로 독립적이므로 동시에 실행합니다.
+    한쪽이 실패하거나 마감 시간을 넘기면 남은 작업을 취소합니다.
+    """
+
+    def __init__(
+        self,
+        detector: Optional[DeepfakeDetector] = None,
+        verifier: Optional[SpeakerVerifier] = None,
+        deadline: Optional[float] = None,
+        encoder: Optional[OutboundEncoder] = None
+    ):
+        """
+        파이프라인 초기화
+
+        Args:
+            detector: 딥페이크 탐지기 (없으면 싱글톤 사용)
+            verifier: 화자 검증기 (없으면 싱글톤 사용)
+            deadline: 전체 분석 마감 시간(초)
+            encoder: 전송 오디오 인코더 (없으면 싱글톤 사용)
+        """
+        if deadline is None:
+            from config import settings
+            deadline = settings.ANALYSIS_DEADLINE
+
+        self.detector = detector or get_detector()
+        self.verifier = verifier or get_verifier()
+        self.deadline = deadline
+        self.encoder = encoder or get_outbound_encoder()
+
+    async def run(
+        self,
+        audio_bytes: bytes,
+        timer: Optional[StageTimer] = None,
+        digest: Optional[str] = None,
+        deadline: Optional[float] = None,
+        family_id: Optional[str] = None,
+        decoded: Optional[Tuple[np.ndarray, int]] = None,
+        use_cache: bool = True
+    ) -> Dict:
+        """
+        음성 분석 실행
+
+        Args:
+            audio_bytes: 오디오 바이너리 데이터
+            timer: 단계별 시간 기록기 (업로드 읽기 등 선행 단계 포함 가능)
+            digest: 오디오 SHA-256 해시 (업로드 수신 시 계산된 값 재사용)
+            deadline: 이번 실행의 마감 시간(초) (없으면 파이프라인 기본값)
+            family_id: 가족 ID (해당 가족의 성문과만 대조)
+            decoded: 업로드 수신 중 디코딩한 (모노 float32 오디오, 샘플레이트)
+            use_cache: False면 탐지 결과/임베딩 캐시를 쓰지 않음 (실시간 스트림 윈도우처럼
+                같은 바이트가 다시 올 일 없는 입력이 캐시를 밀어내지 않도록)
+
+        Returns:
+            탐지/검증 원본 결과와 위험도, 단계별 소요 시간, 전송 페이로드 정보(outbound - 두 단계 모두
+            캐시에 적중해 인코딩하지 않았으면 None)를 담은 딕셔너리
+
+        Raises:
+            AnalysisTimeoutError: 마감 시간 내에 분석이 끝나지 않은 경우
+        """
+        timer = timer or StageTimer()
+
+        # 두 단계가 같은 캐시 키를 쓰도록 해시는 한 번만 계산
+        digest = digest or audio_digest(audio_bytes)
+
+        # 전송용 페이로드는 캐시에 적중하지 않은 단계가 처음 필요로 할 때 한 번만 인코딩해 공유
+        # (작업 스레드에서 실행, 수신 중 디코딩한 샘플 재사용)
+        outbound = PendingOutbound(audio_bytes, decoded, self.encoder)
+        audio_data, sample_rate = decoded if decoded is not None else (None, self.encoder.target_rate)
+
+        deepfake_result, voiceprint_result = await self._run_concurrently([
+            timer.measure("detect", self.detector.detect(
+                audio_data=audio_data, audio_bytes=audio_bytes, sample_rate=sample_rate,
+                audio_digest=digest, outbound=outbound, use_cache=use_cache
+            )),
+            timer.measure("verify", self.verifier.verify(
+                audio_bytes=audio_bytes, audio_data=audio_data, sample_rate=sample_rate,
+                audio_digest=digest, family_id=family_id, outbound=outbound, use_cache=use_cache
+            )),
+        ], deadline or self.deadline)
+        if outbound.elapsed is not None:
+            timer.record("encode", outbound.elapsed)
+
+        start = time.perf_counter()
+        result = self._score(deepfake_result, voiceprint_result)
+        timer.record("scoring", time.perf_counter() - start)
+
+        result["timings"] = timer.timings
+        result["outbound"] = outbound.result.to_dict() if outbound.result is not None else None
+        return result
+
+    async def _run_concurrently(self, coros: List, deadline: float) -> List:
+        """
+        코루틴 동시 실행
+
+        첫 예외 또는 마감 시간 초과 시 나머지 작업을 취소하고 정리합니다.
+        """
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+
+        try:
+            done, pending = await asyncio.wait(
+                tasks,
+                timeout=deadline,
+                return_when=asyncio.FIRST_EXCEPTION
+            )
+        except asyncio.CancelledError:
+            await self._cancel(tasks)
+            raise
+
+        if pending:
+            await self._cancel(pending)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            raise AnalysisTimeoutError(f"분석 시간이 {deadline:.0f}초를 초과했습니다")
+
+        return [task.result() for task in tasks]
+
+    @staticmethod
+    async def _cancel(tasks):
+        """작업 취소 후 종료 대기"""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _score(self, deepfake_result: Dict, voiceprint_result: Dict) -> Dict:
+        """탐지/검증 결과를 종합하여 위험도 산출"""
+        deepfake_prob = deepfake_result.get("probability", 50.0)
+        voiceprint_match = voiceprint_result.get("similarity", 0.0)
+
+        # 분석 모드 확인
+        deepfake_mode = deepfake_result.get("status", "mock")
+        voiceprint_mode = voiceprint_result.get("mode", "mock")
+        analysis_mode = "api" if deepfake_mode == "success" or voiceprint_mode == "api" else "mock"
+
+        # 정규화 점수가 있으면 원시 코사인이 아니라 검증기의 일치 판정으로 위험도 산출
+        verified = voiceprint_result.get("verified") if "normalized_score" in voiceprint_result else None
+        risk_level, recommendations = assess_risk(deepfake_prob, voiceprint_match, verified)
+
+        return {
+            "deepfake": deepfake_result,
+            "voiceprint": voiceprint_result,
+            "deepfake_probability": deepfake_prob,
+            "voiceprint_match": voiceprint_match,
+            "matched_person": voiceprint_result.get("matched_member"),
+            "settled_by": deepfake_result.get("settled_by"),
+            "risk_level": risk_level,
+            "recommendations": recommendations,
+            "analysis_mode": analysis_mode
+        }
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_pipeline_instance = None
+
+def get_pipeline() -> AnalysisPipeline:
+    """분석 파이프라인 싱글톤 인스턴스 반환"""
+    global _pipeline_instance
+    if _pipeline_instance is None:
+        _pipeline_instance = AnalysisPipeline()
+    return _pipeline_instance
@@ -3,12 +3,21 @@
 HuggingFace Inference API를 사용한 AI 합성 음성 탐지
 """
 
+import asyncio
+
 import aiohttp
 import numpy as np
 from typing import Dict, Tuple, Optional
 import random
 import os
 
+from utils.audio_processor import get_processor
+from utils.http_client import get_http_client
+from utils.outbound_audio import PendingOutbound, audio_content_type
+from utils.spectral_analyzer import get_spectral_analyzer
+from utils.single_flight import SingleFlight
+from utils.result_cache import ResultCache, audio_digest as _digest, create_result_cache
+
 
 class DeepfakeDetector:
     """
@@ -25,15 +34,50 @@ class DeepfakeDetector:
     # 딥페이크 탐지용 모델 (audio-classification)
     DEEPFAKE_MODEL = "MelodyMachine/Deepfake-audio-detection-V2"
 
-    def __init__(self, api_token: Optional[str] = None):
+    # 로컬 아티팩트 점수 가중치 (합 1.0)
+    LOCAL_SCORE_WEIGHTS = {
+        "high_freq_anomaly": 0.3,
+        "phase_discontinuity": 0.3,
+        "mel_spectrogram_score": 0.2,
+        "vocoder_artifacts": 0.2
+    }
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        cache: Optional[ResultCache] = None,
+        cascade: bool = True,
+        real_below: Optional[float] = None,
+        fake_above: Optional[float] = None,
+        min_duration: float = 1.0,
+        silence_rms: float = 0.001
+    ):
         """
         딥페이크 탐지기 초기화
 
         Args:
             api_token: HuggingFace API 토큰 (없으면 환경변수에서 로드)
+            cache: 오디오 해시 기반 결과 캐시 (None이면 캐시 미사용)
+            cascade: 로컬 사전 판정 사용 여부 (False면 모든 클립을 원격 호출)
+            real_below: 로컬 점수가 이 값 미만이면 원격 호출 없이 실제 음성으로 판정
+                (None이면 사용 안 함 - 보정된 임계값이 있을 때만 지정)
+            fake_above: 로컬 점수가 이 값 초과면 원격 호출 없이 합성 음성으로 판정
+                (None이면 사용 안 함)
+            min_duration: 이보다 짧은 클립은 원격 호출 없이 분석 불가로 판정 (초)
+            silence_rms: 이 RMS 미만인 클립은 원격 호출 없이 무음으로 판정
         """
         self.api_token = api_token or os.getenv("HUGGINGFACE_API_TOKEN", "")
         self.is_loaded = False
+        self.cache = cache
+        self.inflight = SingleFlight("deepfake")
+        self.cascade = cascade
+        self.real_below = real_below
+        self.fake_above = fake_above
+        self.min_duration = min_duration
+        self.silence_rms = silence_rms
+        self._cascade_counts = {
+            "screened": 0, "escalated": 0, "real": 0, "fake": 0, "silence": 0, "too_short": 0
+        }
         self._prototype_mode = not bool(self.api_token)
 
         if self._prototype_mode:
@@ -63,35 +107,36 @@ class DeepfakeDetector:
         api_url = self.ENDPOINT_URL
 
         try:
-            async with aiohttp.ClientSession() as session:
-                # Content-Type을 명시적으로 설정
-                headers = {
-                    "Authorization": f"Bearer {self.api_token}",
-                    "Content-Type": "audio/wav"
-                }
-                async with session.post(
-                    api_url,
-                    headers=headers,
-                    data=audio_bytes,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return self._parse_api_result(result)
-                    elif response.status == 503:
-                        # 모델 로딩 중
-                        error_data = await response.json()
-                        estimated_time = error_data.get("estimated_time", 20)
-                        return {
-                            "status": "loading",
-                            "message": f"모델 로딩 중 (약 {estimated_time}초 소요)",
-                            "is_deepfake": None,
-                            "probability": 50.0
-                        }
-                    else:
-                        error_text = await response.text()
-                        print(f"[DeepfakeDetector] API 에러: {response.status} - {error_text}")
-                        return self._generate_fallback_result()
+            # 공유 커넥션 풀 사용 (keep-alive)
+            session = await get_http_client().session()
+            # Content-Type은 실제 페이로드 형식으로 지정
+            headers = {
+                "Authorization": f"Bearer {self.api_token}",
+                "Content-Type": audio_content_type(audio_bytes)
+            }
+            async with session.post(
+                api_url,
+                headers=headers,
+                data=audio_bytes
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return self._parse_api_result(result)
+                elif response.status == 503:
+                    # 모델 로딩 중
+                    error_data = await response.json()
+                    estimated_time = error_data.get("estimated_time", 20)
+                    return {
+                        "status": "loading",
+                        "message": f"모델 로딩 중 (약 {estimated_time}초 소요)",
+                        "estimated_time": estimated_time,
+                        "is_deepfake": None,
+                        "probability": 50.0
+                    }
+                else:
+                    error_text = await response.text()
+                    print(f"[DeepfakeDetector] API 에러: {response.status} - {error_text}")
+                    return self._generate_fallback_result()
 
         except aiohttp.ClientError as e:
             print(f"[DeepfakeDetector] 연결 에러: {e}")
@@ -169,72 +214,239 @@ class DeepfakeDetector:
             "status": "fallback"
         }
 
-    async def detect(self, audio_data: np.ndarray = None, audio_bytes: bytes = None, sample_rate: int = 16000) -> Dict:
+    async def detect(
+        self,
+        audio_data: np.ndarray = None,
+        audio_bytes: bytes = None,
+        sample_rate: int = 16000,
+        audio_digest: Optional[str] = None,
+        outbound: Optional[PendingOutbound] = None,
+        use_cache: bool = True
+    ) -> Dict:
         """
         딥페이크 여부 탐지
 
+        결과 캐시는 업로드 원본 해시로 먼저 확인하고, 적중하지 않은 경우에만
+        전송용 페이로드를 (작업 스레드에서) 인코딩합니다.
+
         Args:
-            audio_data: 오디오 신호 데이터 (numpy array)
+            audio_data: 오디오 신호 데이터 (numpy array, audio_bytes를 디코딩한 샘플이면 다시 디코딩하지 않음)
             audio_bytes: 오디오 바이너리 데이터 (bytes)
             sample_rate: 샘플링 레이트
+            audio_digest: 오디오 SHA-256 해시 (캐시/요청 병합 키, 없으면 계산)
+            outbound: 다른 단계와 공유하는 전송 페이로드 (없으면 audio_bytes로 생성)
+            use_cache: False면 결과 캐시를 조회/저장하지 않음 (다시 올 일 없는 실시간 스트림 윈도우)
 
         Returns:
             탐지 결과 딕셔너리
         """
         # API 모드
         if not self._prototype_mode and audio_bytes:
-            api_result = await self.analyze_with_api(audio_bytes)
-
-            # 상세 아티팩트 분석 추가
-            artifacts = self._analyze_artifacts_from_result(api_result)
-
-            return {
-                "is_deepfake": api_result.get("is_deepfake", False),
-                "probability": api_result.get("probability", 50.0),
-                "confidence": api_result.get("confidence", 0.85),
-                "artifacts": artifacts,
-                "detection_method": api_result.get("analysis_method", "huggingface_api"),
-                "model_version": "huggingface_v1",
-                "status": api_result.get("status", "success")
-            }
+            digest = audio_digest or _digest(audio_bytes)
+            if self.cache is not None and use_cache:
+                cached = self.cache.get(digest)
+                if cached is not None:
+                    cached["cached"] = True
+                    return cached
+
+            # 전송용 16kHz 모노 WAV (파이프라인에서 공유하는 인코딩이 있으면 그 결과 사용)
+            if outbound is None:
+                decoded = (audio_data, sample_rate) if audio_data is not None else None
+                outbound = PendingOutbound(audio_bytes, decoded)
+            encoded = await outbound.get()
+
+            # 1단계: 로컬 사전 판정 (확실한 경우 원격 호출 생략, STFT는 작업 스레드에서 계산)
+            prescreen = None
+            if self.cascade:
+                prescreen = await asyncio.to_thread(self._prescreen, encoded.payload, encoded.decoded)
+            if prescreen is not None and prescreen["decision"] != "escalate":
+                return self._settled_result(prescreen)
+
+            # 2단계: 같은 오디오로 진행 중인 호출이 있으면 그 결과를 공유
+            artifacts = prescreen["artifacts"] if prescreen else None
+            result = await self.inflight.do(digest, lambda: self._detect_with_api(
+                encoded.payload, digest, artifacts, encoded.audio, encoded.sample_rate, use_cache
+            ))
+            return dict(result)
 
         # 목업 모드
-        return self._generate_mock_result()
+        result = self._generate_mock_result()
+        local = await asyncio.to_thread(self._local_artifacts, audio_data, audio_bytes, sample_rate)
+        if local is not None:
+            result["artifacts"] = local
+            result["artifacts_available"] = True
+        return result
+
+    def _prescreen(self, audio_bytes: bytes, decoded: Optional[Tuple[np.ndarray, int]] = None) -> Dict:
+        """
+        로컬 사전 판정
 
-    def _analyze_artifacts_from_result(self, api_result: Dict) -> Dict[str, float]:
-        """API 결과를 바탕으로 아티팩트 점수 생성"""
-        probability = api_result.get("probability", 50) / 100
+        Args:
+            audio_bytes: 전송 페이로드
+            decoded: 페이로드의 (모노 float32 오디오, 샘플레이트) - 없을 때만 디코딩
 
-        # 확률에 기반한 아티팩트 점수 생성
-        base = probability
-        variance = 0.15
+        Returns:
+            판정 딕셔너리 (decision: escalate / real / fake / silence / too_short)
+        """
+        self._cascade_counts["screened"] += 1
+        prescreen = {"decision": "escalate", "score": None, "artifacts": None}
+
+        if decoded is None:
+            decoded = get_processor().decode(audio_bytes)
+        if decoded is None:
+            # 디코딩할 수 없는 형식은 원격 모델에 맡김
+            self._cascade_counts["escalated"] += 1
+            return prescreen
+
+        audio, sample_rate = decoded
+        duration = len(audio) / sample_rate
+        rms = float(np.sqrt(np.mean(np.square(audio, dtype=np.float64)))) if len(audio) else 0.0
+        prescreen["duration"] = round(duration, 2)
+
+        if duration < self.min_duration:
+            prescreen["decision"] = "too_short"
+        elif rms < self.silence_rms:
+            prescreen["decision"] = "silence"
+        else:
+            artifacts = self._local_artifacts(audio, None, sample_rate)
+            if artifacts is not None:
+                score = sum(artifacts[name] * weight for name, weight in self.LOCAL_SCORE_WEIGHTS.items())
+                prescreen["artifacts"] = artifacts
+                prescreen["score"] = round(score, 3)
+                # 아티팩트 점수는 보정된 분류기가 아니므로 임계값이 설정된 경우에만 확정
+                if self.real_below is not None and score < self.real_below:
+                    prescreen["decision"] = "real"
+                elif self.fake_above is not None and score > self.fake_above:
+                    prescreen["decision"] = "fake"
+
+        decision = prescreen["decision"]
+        self._cascade_counts["escalated" if decision == "escalate" else decision] += 1
+        return prescreen
+
+    def _settled_result(self, prescreen: Dict) -> Dict:
+        """원격 호출 없이 로컬 판정으로 확정한 결과"""
+        decision = prescreen["decision"]
+        result = {
+            "artifacts": prescreen["artifacts"],
+            "artifacts_available": prescreen["artifacts"] is not None,
+            "detection_method": "local_prescreen",
+            "model_version": "spectral_v1",
+            "settled_by": "local",
+            "prescreen": {"decision": decision, "score": prescreen["score"]}
+        }
 
+        if decision in ("silence", "too_short"):
+            # 판정할 음성이 없음 - 원격 모델도 의미 있는 결과를 줄 수 없음
+            result.update({
+                "is_deepfake": None,
+                "probability": 50.0,
+                "confidence": 0.0,
+                "status": "insufficient_audio",
+                "message": "무음입니다" if decision == "silence" else f"오디오가 너무 짧습니다 (최소 {self.min_duration:g}초)"
+            })
+        else:
+            score = prescreen["score"]
+            result.update({
+                "is_deepfake": decision == "fake",
+                "probability": round(score * 100, 2),
+                "confidence": round(score if decision == "fake" else 1 - score, 2),
+                "status": "success"
+            })
+        return result
+
+    def cascade_stats(self) -> Dict:
+        """캐스케이드 통계 (원격 호출 비율 포함)"""
+        screened = self._cascade_counts["screened"]
         return {
-            "high_freq_anomaly": round(max(0, min(1, base + random.uniform(-variance, variance))), 2),
-            "phase_discontinuity": round(max(0, min(1, base + random.uniform(-variance, variance))), 2),
-            "mel_spectrogram_score": round(max(0, min(1, base + random.uniform(-variance, variance))), 2),
-            "vocoder_artifacts": round(max(0, min(1, base + random.uniform(-variance, variance))), 2)
+            "enabled": self.cascade,
+            "bands": {"real_below": self.real_below, "fake_above": self.fake_above},
+            **self._cascade_counts,
+            "escalation_rate": round(self._cascade_counts["escalated"] / screened, 3) if screened else None
+        }
+
+    async def _detect_with_api(
+        self,
+        audio_bytes: bytes,
+        digest: str,
+        artifacts: Optional[Dict[str, float]] = None,
+        audio_data: Optional[np.ndarray] = None,
+        sample_rate: Optional[int] = None,
+        use_cache: bool = True
+    ) -> Dict:
+        """원격 탐지 호출 후 결과 캐시 (audio_data: 페이로드를 디코딩한 샘플, use_cache=False면 저장 안 함)"""
+        api_result = await self.analyze_with_api(audio_bytes)
+
+        # 상세 아티팩트 분석 추가 (사전 판정에서 계산한 값 재사용)
+        # 파형을 분석할 수 없는 형식이면 지표를 지어내지 않고 None으로 표시
+        if artifacts is None:
+            artifacts = await asyncio.to_thread(self._local_artifacts, audio_data, audio_bytes, sample_rate)
+
+        result = {
+            "is_deepfake": api_result.get("is_deepfake", False),
+            "probability": api_result.get("probability", 50.0),
+            "confidence": api_result.get("confidence", 0.85),
+            "artifacts": artifacts,
+            "artifacts_available": artifacts is not None,
+            "detection_method": api_result.get("analysis_method", "huggingface_api"),
+            "model_version": "huggingface_v1",
+            "settled_by": "remote",
+            "status": api_result.get("status", "success")
         }
+        if "estimated_time" in api_result:
+            result["estimated_time"] = api_result["estimated_time"]
+
+        # 실제 추론에 성공한 결과만 캐시 (로딩 중/폴백 결과 제외)
+        if self.cache is not None and use_cache and result["status"] == "success":
+            self.cache.set(digest, result)
+
+        return result
+
+    def _local_artifacts(
+        self,
+        audio_data: Optional[np.ndarray],
+        audio_bytes: Optional[bytes],
+        sample_rate: int = 16000
+    ) -> Optional[Dict[str, float]]:
+        """
+        파형에서 스펙트럼 아티팩트 지표 계산 (로컬 CPU, 네트워크 호출 없음)
+
+        분석기가 표본 구간의 프레임만 STFT하므로 긴 클립도 비용이 일정합니다 (멜 변환 없음).
+        수 밀리초 걸리는 CPU 작업이므로 비동기 경로에서는 작업 스레드에서 호출합니다.
+
+        Returns:
+            아티팩트 점수 딕셔너리 (디코딩할 수 없거나 너무 짧으면 None)
+        """
+        if audio_data is None and audio_bytes:
+            decoded = get_processor().decode(audio_bytes)
+            if decoded is None:
+                return None
+            audio_data, sample_rate = decoded
+        if audio_data is None:
+            return None
+
+        try:
+            return get_spectral_analyzer().analyze(audio_data, sample_rate)
+        except Exception as e:
+            print(f"[DeepfakeDetector] 아티팩트 분석 실패: {e}")
+            return None
 
     def _generate_mock_result(self) -> Dict:
         """목업 결과 생성"""
         is_fake = random.random() > 0.5
         fake_probability = random.uniform(70, 95) if is_fake else random.uniform(5, 30)
 
-        return {
+        result = {
             "is_deepfake": is_fake,
             "probability": round(fake_probability, 2),
             "confidence": round(random.uniform(0.85, 0.98), 2),
-            "artifacts": {
-                "high_freq_anomaly": round(random.uniform(0.1, 0.9), 2),
-                "phase_discontinuity": round(random.uniform(0.1, 0.9), 2),
-                "mel_spectrogram_score": round(random.uniform(0.1, 0.9), 2),
-                "vocoder_artifacts": round(random.uniform(0.1, 0.9), 2)
-            },
             "detection_method": "mock",
             "model_version": "prototype_v1",
-            "status": "mock"
+            "status": "mock",
+            # 목업 확률로 아티팩트 지표를 만들지 않음 (파형을 분석한 경우에만 채움)
+            "artifacts": None,
+            "artifacts_available": False
         }
+        return result
 
     async def detect_from_bytes(self, audio_bytes: bytes) -> Dict:
         """
@@ -259,6 +471,14 @@ def get_detector() -> DeepfakeDetector:
         # 환경변수에서 토큰 로드
         from config import settings
         api_token = settings.HUGGINGFACE_API_TOKEN
-        _detector_instance = DeepfakeDetector(api_token=api_token)
+        _detector_instance = DeepfakeDetector(
+            api_token=api_token,
+            cache=create_result_cache("deepfake"),
+            cascade=settings.CASCADE_ENABLED,
+            real_below=settings.CASCADE_REAL_BELOW,
+            fake_above=settings.CASCADE_FAKE_ABOVE,
+            min_duration=settings.MIN_AUDIO_DURATION,
+            silence_rms=settings.CASCADE_SILENCE_RMS
+        )
         _detector_instance.load_model()
     return _detector_instance
@@ -0,0 +1,492 @@
+"""
+성문 임베딩 영속 저장소
+메모리 맵 float32 임베딩 파일 + 고정 폭 메타데이터 레코드 (추가 전용, 세대 교체 방식 압축)
+
+디렉토리 구성:
+    CURRENT               현재 세대 정보 ("세대 기준레코드수 차원")
+    embeddings-<세대>.f32  임베딩 행 (레코드와 같은 순서, 행당 dim * 4바이트)
+    records-<세대>.rec     고정 폭 레코드 (RECORD_DTYPE)
+
+앞쪽 기준 레코드(base)는 (가족, 멤버) 순으로 정렬된 중복 없는 구간이라
+메모리 맵 위에서 이진 탐색으로 바로 조회합니다. 이후 변경 사항은 파일 끝에
+추가되고(log), 시작 시 이 꼬리 구간만 읽어 덮어쓰기 맵을 만듭니다.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+RECORD_DTYPE = np.dtype([
+    ("family", "S64"),
+    ("member", "S64"),
+    ("op", "u1"),  # 1: 등록/갱신, 0: 삭제
+    ("name", "S96"),
+    ("relation", "S32"),
+    ("registered_at", "S32"),
+    ("updated_at", "S32"),
+    ("sample_count", "<u4"),
+    ("weight", "<f4"),
+])
+
+OP_DELETE = 0
+OP_PUT = 1
+
+# 가족/멤버 ID 최대 바이트 수 (RECORD_DTYPE의 S64 필드)
+ID_BYTES = 64
+
+
+def _encode_id(text: str, field: str) -> bytes:
+    """
+    키 필드(가족/멤버 ID) 인코딩
+
+    자르면 접두사가 같은 두 ID가 같은 레코드를 덮어쓰므로, 자르지 않고 거부합니다.
+    고정 폭 필드는 끝의 NUL을 버리므로 NUL 문자도 허용하지 않습니다.
+    """
+    data = str(text).encode("utf-8")
+    if not data or len(data) > ID_BYTES or b"\x00" in data:
+        raise ValueError(f"{field} ID는 1~{ID_BYTES}바이트(UTF-8)여야 하며 NUL 문자를 포함할 수 없습니다")
+    return data
+
+
+def _encode(text, size: int) -> bytes:
+    """UTF-8 인코딩 후 문자 경계를 지키며 size 바이트로 자름 (메타데이터 필드용)"""
+    data = str(text or "").encode("utf-8")
+    if len(data) <= size:
+        return data
+    return data[:size].decode("utf-8", errors="ignore").encode("utf-8")
+
+
+def _decode(value: bytes) -> str:
+    return value.decode("utf-8", errors="ignore")
+
+
+class EmbeddingStore:
+    """
+    추가 전용 성문 임베딩 저장소
+
+    - 시작 시 기준 구간은 메모리 맵으로 열기만 하므로 규모와 무관하게 즉시 준비
+    - 쓰기는 임베딩 행을 먼저 기록·fsync한 뒤 레코드를 추가·fsync (레코드가 커밋 역할)
+    - 비정상 종료로 잘린 꼬리는 다음 시작 시 잘라냄
+    - 꼬리가 커지면 백그라운드 스레드가 새 세대 파일로 압축한 뒤 CURRENT를 원자적으로 교체
+      (압축 중 추가된 레코드는 교체 직전에 새 세대 꼬리로 옮김)
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        dim: int = 192,
+        compact_min_records: int = 1024,
+        compact_ratio: float = 0.25,
+        sync: bool = True,
+        background_compaction: bool = True
+    ):
+        """
+        Args:
+            directory: 저장 디렉토리 (VOICEPRINTS_DIR 하위)
+            dim: 임베딩 차원
+            compact_min_records: 압축을 시작할 최소 꼬리 레코드 수
+            compact_ratio: 꼬리 레코드 수가 기준 레코드 수의 이 비율을 넘으면 압축
+            sync: 쓰기마다 os.fsync로 디스크에 반영 (False면 flush만 - 프로세스 종료에는 안전,
+                전원 장애에는 마지막 쓰기가 유실될 수 있음)
+            background_compaction: True면 쓰기 경로에서 압축을 백그라운드 스레드로 넘김
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.compact_min_records = compact_min_records
+        self.compact_ratio = compact_ratio
+        self.sync = sync
+        self.background_compaction = background_compaction
+
+        self.generation = 0
+        self.base_count = 0
+        self._base_records: Optional[np.ndarray] = None
+        self._base_embeddings: Optional[np.ndarray] = None
+        # 꼬리 구간: 가족 -> 멤버 -> (임베딩, 레코드) 또는 삭제 표시(None)
+        self._overlay: Dict[str, Dict[str, Optional[Tuple[np.ndarray, np.void]]]] = {}
+        self._tail_count = 0
+        self._embedding_file = None
+        self._record_file = None
+        self.compactions = 0
+
+        # 쓰기/조회/세대 교체 직렬화, 압축은 한 번에 하나만
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+        self._open()
+
+    # ---------- 파일 경로 ----------
+
+    def _embedding_path(self, generation: int) -> Path:
+        return self.directory / f"embeddings-{generation}.f32"
+
+    def _record_path(self, generation: int) -> Path:
+        return self.directory / f"records-{generation}.rec"
+
+    @property
+    def _current_path(self) -> Path:
+        return self.directory / "CURRENT"
+
+    # ---------- 열기 ----------
+
+    def _open(self):
+        """CURRENT가 가리키는 세대를 열고 꼬리 구간 복구"""
+        start = time.perf_counter()
+        if self._current_path.exists():
+            generation, base_count, dim = (int(v) for v in self._current_path.read_text().split())
+            if dim != self.dim:
+                raise ValueError(f"저장소 임베딩 차원이 맞지 않습니다 ({dim} != {self.dim})")
+            self.generation, self.base_count = generation, base_count
+        else:
+            self._write_current(0, 0)
+
+        self._remove_stale_generations()
+
+        embedding_path = self._embedding_path(self.generation)
+        record_path = self._record_path(self.generation)
+        embedding_path.touch()
+        record_path.touch()
+
+        # 잘린 꼬리 정리: 임베딩과 레코드가 모두 온전한 행까지만 유지
+        row_bytes = self.dim * 4
+        rows = min(embedding_path.stat().st_size // row_bytes, record_path.stat().st_size // RECORD_DTYPE.itemsize)
+        if rows < self.base_count:
+            raise ValueError("저장소 기준 구간이 손상되었습니다")
+        os.truncate(embedding_path, rows * row_bytes)
+        os.truncate(record_path, rows * RECORD_DTYPE.itemsize)
+
+        self._map_base()
+        self._load_tail(rows)
+
+        self._embedding_file = open(embedding_path, "ab")
+        self._record_file = open(record_path, "ab")
+        print(
+            f"[EmbeddingStore] 세대 {self.generation} 열기 완료 - 기준 {self.base_count}개, "
+            f"꼬리 {self._tail_count}개 ({(time.perf_counter() - start) * 1000:.1f}ms)"
+        )
+
+    def _map_base(self):
+        """기준 구간 메모리 맵 (읽기 전용)"""
+        if self.base_count == 0:
+            self._base_records = np.zeros(0, dtype=RECORD_DTYPE)
+            self._base_embeddings = np.zeros((0, self.dim), dtype=np.float32)
+            return
+        self._base_records = np.memmap(
+            self._record_path(self.generation), dtype=RECORD_DTYPE, mode="r", shape=(self.base_count,)
+        )
+        self._base_embeddings = np.memmap(
+            self._embedding_path(self.generation), dtype="<f4", mode="r", shape=(self.base_count, self.dim)
+        )
+
+    def _load_tail(self, rows: int):
+        """기준 구간 이후 추가된 레코드를 덮어쓰기 맵으로 적재"""
+        self._overlay = {}
+        self._tail_count = rows - self.base_count
+        if self._tail_count == 0:
+            return
+        records = np.fromfile(
+            self._record_path(self.generation), dtype=RECORD_DTYPE,
+            count=self._tail_count, offset=self.base_count * RECORD_DTYPE.itemsize
+        )
+        embeddings = np.fromfile(
+            self._embedding_path(self.generation), dtype="<f4",
+            count=self._tail_count * self.dim, offset=self.base_count * self.dim * 4
+        ).reshape(-1, self.dim)
+        for record, embedding in zip(records, embeddings):
+            self._apply(record, embedding)
+
+    def _apply(self, record: np.void, embedding: np.ndarray):
+        family = _decode(record["family"])
+        member = _decode(record["member"])
+        entry = (embedding, record) if record["op"] == OP_PUT else None
+        self._overlay.setdefault(family, {})[member] = entry
+
+    def _remove_stale_generations(self):
+        """현재 세대가 아닌 파일 삭제 (압축 도중 중단된 잔여 파일 포함)"""
+        keep = {self._embedding_path(self.generation).name, self._record_path(self.generation).name}
+        for path in list(self.directory.glob("embeddings-*.f32")) + list(self.directory.glob("records-*.rec")):
+            if path.name not in keep:
+                path.unlink()
+
+    def _write_current(self, generation: int, base_count: int):
+        """CURRENT 원자적 교체"""
+        tmp = self.directory / "CURRENT.tmp"
+        with open(tmp, "w") as f:
+            f.write(f"{generation} {base_count} {self.dim}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._current_path)
+        self._fsync_directory()
+
+    def _fsync_directory(self):
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # ---------- 조회 ----------
+
+    def _base_range(self, family: str) -> Tuple[int, int]:
+        """기준 구간에서 가족 레코드 범위 (이진 탐색)"""
+        if self.base_count == 0:
+            return 0, 0
+        key = str(family).encode("utf-8")
+        families = self._base_records["family"]
+        return (
+            int(np.searchsorted(families, key, side="left")),
+            int(np.searchsorted(families, key, side="right"))
+        )
+
+    def load_family(self, family: str) -> List[Tuple[str, np.ndarray, Dict]]:
+        """
+        가족의 성문 목록
+
+        Returns:
+            (멤버 ID, 임베딩, 메타데이터) 리스트
+        """
+        entries: Dict[str, Tuple[np.ndarray, Dict]] = {}
+        with self._lock:
+            lo, hi = self._base_range(family)
+            if hi > lo:
+                records = self._base_records[lo:hi]
+                embeddings = np.array(self._base_embeddings[lo:hi])
+                for record, embedding in zip(records, embeddings):
+                    member = _decode(record["member"])
+                    entries[member] = (embedding, self._record_to_meta(member, record))
+
+            for member, entry in self._overlay.get(family, {}).items():
+                if entry is None:
+                    entries.pop(member, None)
+                else:
+                    embedding, record = entry
+                    entries[member] = (embedding, self._record_to_meta(member, record))
+
+        return [(member, embedding, meta) for member, (embedding, meta) in entries.items()]
+
+    def get(self, family: str, member: str) -> Optional[np.ndarray]:
+        """멤버 한 명의 float32 임베딩 (없으면 None)"""
+        with self._lock:
+            members = self._overlay.get(family)
+            if members is not None and member in members:
+                entry = members[member]
+                return None if entry is None else entry[0]
+
+            lo, hi = self._base_range(family)
+            if hi > lo:
+                key = str(member).encode("utf-8")
+                position = lo + int(np.searchsorted(self._base_records["member"][lo:hi], key))
+                if position < hi and self._base_records["member"][position] == key:
+                    return np.array(self._base_embeddings[position])
+            return None
+
+    # ---------- 쓰기 ----------
+
+    def put(self, family: str, member: str, embedding: np.ndarray, meta: Dict):
+        """
+        성문 등록/갱신 기록
+
+        Raises:
+            ValueError: 가족/멤버 ID가 ID_BYTES를 넘거나 비어 있는 경우
+        """
+        record = np.zeros(1, dtype=RECORD_DTYPE)[0]
+        record["family"] = _encode_id(family, "가족")
+        record["member"] = _encode_id(member, "멤버")
+        record["op"] = OP_PUT
+        record["name"] = _encode(meta.get("name"), 96)
+        record["relation"] = _encode(meta.get("relation"), 32)
+        record["registered_at"] = _encode(meta.get("registered_at"), 32)
+        record["updated_at"] = _encode(meta.get("updated_at"), 32)
+        record["sample_count"] = int(meta.get("sample_count", 0))
+        record["weight"] = float(meta.get("weight", 0.0))
+        self._append(record, np.asarray(embedding, dtype="<f4").reshape(self.dim))
+
+    def delete(self, family: str, member: str):
+        """성문 삭제 기록 (삭제 표시 레코드 추가)"""
+        record = np.zeros(1, dtype=RECORD_DTYPE)[0]
+        record["family"] = _encode_id(family, "가족")
+        record["member"] = _encode_id(member, "멤버")
+        record["op"] = OP_DELETE
+        self._append(record, np.zeros(self.dim, dtype="<f4"))
+
+    def _append(self, record: np.void, embedding: np.ndarray):
+        with self._lock:
+            # 임베딩을 먼저 디스크에 반영한 뒤 레코드를 써서, 레코드가 있으면 임베딩도 온전함을 보장
+            self._write(self._embedding_file, embedding.tobytes())
+            self._write(self._record_file, record.tobytes())
+
+            self._apply(record.copy(), embedding)
+            self._tail_count += 1
+            due = self._tail_count >= max(self.compact_min_records, self.base_count * self.compact_ratio)
+        if due:
+            self._schedule_compaction()
+
+    def _write(self, f, data: bytes):
+        f.write(data)
+        f.flush()
+        if self.sync:
+            os.fsync(f.fileno())
+
+    def _schedule_compaction(self):
+        """압축 시작 (백그라운드 모드면 스레드로 넘기고 바로 반환, 진행 중이면 생략)"""
+        if not self.background_compaction:
+            self.compact()
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._compact_background, name="store-compact", daemon=True)
+        self._compactor.start()
+
+    def _compact_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"[EmbeddingStore] 압축 실패 (이전 세대 유지): {e}")
+
+    def wait_for_compaction(self, timeout: Optional[float] = None):
+        """진행 중인 백그라운드 압축 종료 대기"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join(timeout)
+
+    # ---------- 압축 ----------
+
+    def compact(self):
+        """
+        살아 있는 성문만 모아 새 세대로 압축
+
+        시작 시점의 꼬리 구간을 스냅샷으로 삼아 잠금 없이 새 세대 파일을 기록·동기화하고,
+        교체할 때만 잠가서 그 사이 추가된 레코드를 새 세대 꼬리로 옮긴 뒤 CURRENT를 바꿉니다.
+        도중에 중단되어도 이전 세대가 그대로 유효합니다.
+        """
+        with self._compact_lock:
+            start = time.perf_counter()
+            with self._lock:
+                overlay = {family: dict(members) for family, members in self._overlay.items()}
+                snapshot_tail = self._tail_count
+                previous, base_count = self.generation, self.base_count
+                base_records, base_embeddings = self._base_records, self._base_embeddings
+            generation = previous + 1
+
+            records, embeddings = self._merge(overlay, base_count, base_records, base_embeddings)
+            for path, data in (
+                (self._embedding_path(generation), embeddings),
+                (self._record_path(generation), records)
+            ):
+                with open(path, "wb") as f:
+                    f.write(np.ascontiguousarray(data).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            with self._lock:
+                moved = self._copy_tail(previous, base_count + snapshot_tail, generation)
+                self.close()
+                self._write_current(generation, len(records))
+                self.generation, self.base_count = generation, len(records)
+                for path in (self._embedding_path(previous), self._record_path(previous)):
+                    path.unlink(missing_ok=True)
+
+                self._map_base()
+                self._load_tail(len(records) + moved)
+                self._embedding_file = open(self._embedding_path(generation), "ab")
+                self._record_file = open(self._record_path(generation), "ab")
+                self.compactions += 1
+
+            print(
+                f"[EmbeddingStore] 세대 {generation}로 압축 완료 - {len(records)}개, 압축 중 추가 {moved}개 "
+                f"({(time.perf_counter() - start) * 1000:.1f}ms)"
+            )
+
+    def _merge(
+        self,
+        overlay: Dict[str, Dict[str, Optional[Tuple[np.ndarray, np.void]]]],
+        base_count: int,
+        base_records: np.ndarray,
+        base_embeddings: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """기준 구간과 꼬리 스냅샷을 합쳐 (가족, 멤버) 순으로 정렬한 살아 있는 레코드/임베딩"""
+        keep = np.ones(base_count, dtype=bool)
+        tail_records = []
+        tail_embeddings = []
+        for family, members in overlay.items():
+            key = str(family).encode("utf-8")
+            lo = int(np.searchsorted(base_records["family"], key, side="left")) if base_count else 0
+            hi = int(np.searchsorted(base_records["family"], key, side="right")) if base_count else 0
+            base_members = base_records["member"][lo:hi] if hi > lo else None
+            for member, entry in members.items():
+                if base_members is not None:
+                    member_key = str(member).encode("utf-8")
+                    position = int(np.searchsorted(base_members, member_key))
+                    if position < len(base_members) and base_members[position] == member_key:
+                        keep[lo + position] = False
+                if entry is not None:
+                    tail_embeddings.append(entry[0])
+                    tail_records.append(entry[1])
+
+        records = np.concatenate([
+            np.asarray(base_records[keep]),
+            np.array(tail_records, dtype=RECORD_DTYPE)
+        ])
+        embeddings = np.concatenate([
+            np.asarray(base_embeddings[keep]),
+            np.array(tail_embeddings, dtype="<f4").reshape(-1, self.dim)
+        ])
+        order = np.argsort(records, order=("family", "member"), kind="stable")
+        return records[order], embeddings[order]
+
+    def _copy_tail(self, source: int, start_row: int, target: int) -> int:
+        """source 세대의 start_row 이후 레코드를 target 세대 파일 끝에 복사 (복사한 행 수, 호출자가 _lock 보유)"""
+        row_bytes = self.dim * 4
+        rows = self.base_count + self._tail_count - start_row
+        if rows <= 0:
+            return 0
+        for path, target_path, width in (
+            (self._embedding_path(source), self._embedding_path(target), row_bytes),
+            (self._record_path(source), self._record_path(target), RECORD_DTYPE.itemsize)
+        ):
+            with open(path, "rb") as src:
+                src.seek(start_row * width)
+                data = src.read(rows * width)
+            with open(target_path, "ab") as dst:
+                dst.write(data)
+                dst.flush()
+                os.fsync(dst.fileno())
+        return rows
+
+    def close(self):
+        """쓰기 파일 닫기"""
+        for f in (self._embedding_file, self._record_file):
+            if f is not None and not f.closed:
+                f.close()
+
+    @staticmethod
+    def _record_to_meta(member: str, record: np.void) -> Dict:
+        meta = {
+            "id": member,
+            "name": _decode(record["name"]),
+            "relation": _decode(record["relation"]),
+            "registered_at": _decode(record["registered_at"]),
+            "updated_at": _decode(record["updated_at"]) or _decode(record["registered_at"]),
+            "sample_count": int(record["sample_count"])
+        }
+        if record["weight"] > 0:
+            meta["weight"] = float(record["weight"])
+        return meta
+
+    def stats(self) -> Dict:
+        return {
+            "generation": self.generation,
+            "base_records": self.base_count,
+            "tail_records": self._tail_count,
+            "compactions": self.compactions
+        }
@@ -0,0 +1,282 @@
+"""
+비동기 분석 작업 큐
+작업 제출 즉시 ID를 반환하고, 워커 풀이 백그라운드에서 분석을 수행
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .analysis_pipeline import AnalysisPipeline, AnalysisTimeoutError, get_pipeline
+
+
+class JobQueueFullError(Exception):
+    """작업 큐가 가득 참"""
+
+
+class AnalysisJobQueue:
+    """
+    인프로세스 분석 작업 큐
+
+    - 크기가 제한된 대기열과 고정 크기 워커 풀
+    - 작업별 마감 시간 (제출 시점 기준)
+    - 엔드포인트가 모델 로딩 중(503)이면 대기 후 재시도
+    - 완료된 작업 결과는 일정 시간 후 만료
+    """
+
+    def __init__(
+        self,
+        pipeline: Optional[AnalysisPipeline] = None,
+        workers: int = 2,
+        max_queued: int = 100,
+        job_deadline: float = 180.0,
+        max_attempts: int = 5,
+        retry_delay: float = 10.0,
+        result_ttl: float = 600.0
+    ):
+        """
+        작업 큐 초기화
+
+        Args:
+            pipeline: 분석 파이프라인 (없으면 싱글톤 사용)
+            workers: 워커 수
+            max_queued: 최대 대기 작업 수
+            job_deadline: 작업별 마감 시간 (초, 제출 시점 기준)
+            max_attempts: 모델 로딩 중일 때 최대 시도 횟수
+            retry_delay: 재시도 기본 대기 시간 (초)
+            result_ttl: 완료 결과 보관 시간 (초)
+        """
+        self._pipeline = pipeline
+        self.worker_count = workers
+        self.job_deadline = job_deadline
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.result_ttl = result_ttl
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._jobs: Dict[str, Dict] = {}
+        self._workers: List[asyncio.Task] = []
+        self._janitor: Optional[asyncio.Task] = None
+
+    @property
+    def pipeline(self) -> AnalysisPipeline:
+        if self._pipeline is None:
+            self._pipeline = get_pipeline()
+        return self._pipeline
+
+    @property
+    def is_running(self) -> bool:
+        return any(not worker.done() for worker in self._workers)
+
+    def start(self):
+        """워커 풀 및 만료 정리 작업 시작"""
+        if self.is_running:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+        self._janitor = asyncio.create_task(self._expire_loop())
+        print(f"[AnalysisJobQueue] 워커 {self.worker_count}개 시작")
+
+    async def stop(self):
+        """워커 풀 종료 (진행 중인 작업은 취소)"""
+        tasks = self._workers + ([self._janitor] if self._janitor else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._janitor = None
+
+    def submit(
+        self,
+        audio_bytes: bytes,
+        digest: Optional[str] = None,
+        filename: Optional[str] = None,
+        family_id: Optional[str] = None,
+        audio_duration: Optional[float] = None,
+        decoded: Optional[Tuple[np.ndarray, int]] = None
+    ) -> Dict:
+        """
+        분석 작업 제출
+
+        decoded(업로드 수신 중 디코딩한 샘플)가 있으면 작업자가 다시 디코딩하지 않습니다.
+
+        Returns:
+            작업 상태 딕셔너리
+
+        Raises:
+            JobQueueFullError: 대기열이 가득 찬 경우
+        """
+        self.start()
+
+        now = time.time()
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "filename": filename,
+            "file_size": len(audio_bytes),
+            "audio_duration": audio_duration,
+            "attempts": 0,
+            "created_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "result": None,
+            "analysis_time": None,
+            "error": None,
+            "_submitted": now,
+            "_deadline": now + self.job_deadline,
+            "_finished": None,
+            "_audio": audio_bytes,
+            "_digest": digest,
+            "_decoded": decoded,
+            "_family_id": family_id,
+        }
+
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise JobQueueFullError("분석 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요")
+
+        self._jobs[job_id] = job
+        return self._public(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 조회 (없거나 만료되면 None)"""
+        job = self._jobs.get(job_id)
+        if job is None or self._is_expired(job, time.time()):
+            return None
+        return self._public(job)
+
+    def stats(self) -> Dict:
+        """큐 상태 통계"""
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {
+            "workers": self.worker_count,
+            "running": self.is_running,
+            "queued": self._queue.qsize(),
+            "max_queued": self._queue.maxsize,
+            "jobs": counts
+        }
+
+    async def _worker(self, worker_id: int):
+        """대기열에서 작업을 꺼내 처리"""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    await self._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[AnalysisJobQueue] 워커 {worker_id} 예외: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job: Dict):
+        """작업 실행 (로딩 중이면 재시도)"""
+        job["status"] = "running"
+
+        while True:
+            remaining = job["_deadline"] - time.time()
+            if remaining <= 0:
+                self._finish(job, "failed", error="작업 마감 시간을 초과했습니다")
+                return
+
+            job["attempts"] += 1
+            start = time.time()
+            try:
+                result = await self.pipeline.run(
+                    job["_audio"],
+                    digest=job["_digest"],
+                    deadline=min(self.pipeline.deadline, remaining),
+                    family_id=job["_family_id"],
+                    decoded=job["_decoded"]
+                )
+            except AnalysisTimeoutError:
+                self._finish(job, "failed", error="작업 마감 시간을 초과했습니다")
+                return
+            except Exception as e:
+                print(f"[AnalysisJobQueue] 작업 {job['id']} 실패: {e}")
+                self._finish(job, "failed", error="분석 중 오류가 발생했습니다")
+                return
+
+            wait = self._loading_wait(result)
+            if wait is None:
+                job["analysis_time"] = round(time.time() - start, 2)
+                self._finish(job, "completed", result=result)
+                return
+
+            if job["attempts"] >= self.max_attempts or time.time() + wait >= job["_deadline"]:
+                self._finish(job, "failed", error="모델 로딩이 끝나지 않아 분석하지 못했습니다")
+                return
+
+            job["status"] = "retrying"
+            print(f"[AnalysisJobQueue] 작업 {job['id']} 모델 로딩 중 - {wait:.1f}초 후 재시도")
+            await asyncio.sleep(wait)
+            job["status"] = "running"
+
+    def _loading_wait(self, result: Dict) -> Optional[float]:
+        """엔드포인트가 로딩 중이면 재시도 대기 시간, 아니면 None"""
+        estimates = [
+            stage.get("estimated_time")
+            for stage in (result["deepfake"], result["voiceprint"])
+            if stage.get("status") == "loading"
+        ]
+        if not estimates:
+            return None
+        known = [float(e) for e in estimates if e is not None]
+        # 예상 시간이 너무 길면 기본 대기 시간 단위로 나누어 재확인
+        return min(max(known) if known else self.retry_delay, self.retry_delay)
+
+    def _finish(self, job: Dict, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """작업 종료 처리 (오디오 데이터 해제)"""
+        job["status"] = status
+        job["result"] = result
+        job["error"] = error
+        job["finished_at"] = datetime.now().isoformat()
+        job["_finished"] = time.time()
+        job["_audio"] = None
+        job["_decoded"] = None
+
+    def _is_expired(self, job: Dict, now: float) -> bool:
+        return job["_finished"] is not None and now - job["_finished"] > self.result_ttl
+
+    async def _expire_loop(self):
+        """만료된 작업 결과 주기적 정리"""
+        while True:
+            await asyncio.sleep(min(60.0, self.result_ttl))
+            now = time.time()
+            expired = [job_id for job_id, job in self._jobs.items() if self._is_expired(job, now)]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    @staticmethod
+    def _public(job: Dict) -> Dict:
+        """내부 필드(_ 접두사)를 제외한 작업 정보"""
+        return {key: value for key, value in job.items() if not key.startswith("_")}
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_job_queue_instance = None
+
+def get_job_queue() -> AnalysisJobQueue:
+    """분석 작업 큐 싱글톤 인스턴스 반환"""
+    global _job_queue_instance
+    if _job_queue_instance is None:
+        from config import settings
+        _job_queue_instance = AnalysisJobQueue(
+            workers=settings.JOB_WORKERS,
+            max_queued=settings.JOB_QUEUE_SIZE,
+            job_deadline=settings.JOB_DEADLINE,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            retry_delay=settings.JOB_RETRY_DELAY,
+            result_ttl=settings.JOB_RESULT_TTL
+        )
+    return _job_queue_instance
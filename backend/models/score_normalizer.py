@@ -0,0 +1,97 @@
+"""
+코호트 점수 정규화 모듈
+사칭자(impostor) 코호트 임베딩 대비 점수 분포로 원시 코사인 점수를 정규화 (S-norm / AS-norm)
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+# (평균, 표준편차)
+CohortStats = Tuple[float, float]
+
+
+class CohortScoreNormalizer:
+    """
+    코호트 기반 대칭 점수 정규화
+
+        s_norm = ((s - μ_e) / σ_e + (s - μ_t) / σ_t) / 2
+
+    - μ_e, σ_e: 등록 성문과 코호트 점수의 통계 (등록/갱신 시 한 번 계산해 갤러리에 보관)
+    - μ_t, σ_t: 질의 임베딩과 코호트 점수의 통계 (질의당 행렬-벡터 곱 한 번)
+    - snorm: 코호트 전체 통계, asnorm: 가장 가까운 top_k개 코호트만의 통계 (적응형)
+
+    마이크/코덱에 따라 원시 점수 분포가 이동해도 양쪽이 같은 방향으로 움직이므로
+    정규화된 점수의 임계값은 환경에 덜 민감합니다.
+    """
+
+    MODES = ("snorm", "asnorm")
+
+    def __init__(self, cohort: np.ndarray, mode: str = "asnorm", top_k: int = 200):
+        """
+        Args:
+            cohort: 사칭자 코호트 임베딩 (N x dim, 정규화 전이어도 됨)
+            mode: "snorm" (코호트 전체) 또는 "asnorm" (상위 top_k개)
+            top_k: asnorm에서 사용할 코호트 수
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 점수 정규화 방식입니다: {mode}")
+        cohort = np.asarray(cohort, dtype=np.float32)
+        if cohort.ndim != 2 or len(cohort) < 2:
+            raise ValueError("코호트는 2개 이상의 임베딩 행렬이어야 합니다")
+        norms = np.linalg.norm(cohort, axis=1, keepdims=True)
+        self.cohort = np.ascontiguousarray(cohort / np.maximum(norms, 1e-12))
+        self.dim = cohort.shape[1]
+        self.mode = mode
+        self.top_k = max(2, min(top_k, len(cohort)))
+
+    def __len__(self) -> int:
+        return len(self.cohort)
+
+    def stats(self, vector: np.ndarray) -> CohortStats:
+        """
+        정규화된 벡터의 코호트 점수 통계
+
+        Args:
+            vector: L2 정규화된 임베딩
+
+        Returns:
+            (평균, 표준편차)
+        """
+        scores = self.cohort @ vector
+        if self.mode == "asnorm" and self.top_k < len(scores):
+            scores = np.partition(scores, len(scores) - self.top_k)[-self.top_k:]
+        return float(scores.mean()), max(float(scores.std()), 1e-6)
+
+    @staticmethod
+    def normalize(score: float, enroll: CohortStats, test: CohortStats) -> float:
+        """대칭 정규화 점수"""
+        return 0.5 * ((score - enroll[0]) / enroll[1] + (score - test[0]) / test[1])
+
+
+def load_cohort(path: Path) -> Optional[np.ndarray]:
+    """코호트 임베딩 파일(.npy, N x dim) 로드 (없으면 None)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return np.load(path, mmap_mode="r")
+
+
+def create_score_normalizer(dim: int = 192) -> Optional[CohortScoreNormalizer]:
+    """설정값으로 점수 정규화기 생성 (비활성화되었거나 코호트가 없으면 None)"""
+    from config import settings
+    if not settings.SCORE_NORM_ENABLED:
+        return None
+
+    cohort = load_cohort(settings.SCORE_NORM_COHORT_PATH)
+    if cohort is None:
+        print(f"[ScoreNormalizer] 코호트 파일 없음 ({settings.SCORE_NORM_COHORT_PATH}) - 원시 점수 사용")
+        return None
+    if cohort.ndim != 2 or cohort.shape[1] != dim:
+        print(f"[ScoreNormalizer] 코호트 차원이 맞지 않습니다 ({cohort.shape}) - 원시 점수 사용")
+        return None
+
+    normalizer = CohortScoreNormalizer(cohort, mode=settings.SCORE_NORM_MODE, top_k=settings.SCORE_NORM_TOP_K)
+    print(f"[ScoreNormalizer] 코호트 {len(normalizer)}개 로드 ({normalizer.mode}, top_k={normalizer.top_k})")
+    return normalizer
@@ -3,14 +3,30 @@
 HuggingFace Inference API를 사용한 성문(Voiceprint) 검증
 """
 
+import asyncio
 import aiohttp
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 import random
 import hashlib
 import os
+import time
 from datetime import datetime
 
+from utils.audio_processor import get_processor
+from utils.embedding_codec import EMBEDDING_ACCEPT, decode_binary_embedding, from_base64, loads_json, to_base64
+from utils.http_client import get_http_client
+from utils.outbound_audio import PendingOutbound, audio_content_type, get_outbound_encoder
+from utils.single_flight import SingleFlight
+from utils.speech_segmenter import SpeechSegmenter, get_speech_segmenter
+from utils.result_cache import ResultCache, audio_digest as _digest, create_result_cache
+
+from .voiceprint_gallery import VoiceprintGallery
+from .voiceprint_index import create_voiceprint_index
+from .embedding_store import EmbeddingStore
+from .voiceprint_partitions import VoiceprintPartitions
+from .score_normalizer import CohortScoreNormalizer, CohortStats, create_score_normalizer
+
 
 class SpeakerVerifier:
     """
@@ -26,23 +42,65 @@ class SpeakerVerifier:
 
     # 화자 검증용 모델 (speaker-embedding)
     SPEAKER_MODEL = "speechbrain/spkrec-ecapa-voxceleb"
+    EMBEDDING_DIM = 192
 
-    def __init__(self, api_token: Optional[str] = None):
+    # 긴 클립 구간 임베딩 집계 방식
+    SEGMENT_AGGREGATIONS = ("mean", "quality", "best_k")
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        cache: Optional[ResultCache] = None,
+        partitions: Optional[VoiceprintPartitions] = None,
+        embedding_concurrency: int = 4,
+        segmenter: Optional[SpeechSegmenter] = None,
+        segment_min_clip: float = 6.0,
+        segment_aggregation: str = "quality",
+        segment_top_k: int = 3,
+        segment_latency_budget: float = 2.0,
+        normalized_threshold: float = 3.0
+    ):
         """
         화자 검증기 초기화
 
         Args:
             api_token: HuggingFace API 토큰 (없으면 환경변수에서 로드)
+            cache: 오디오 해시 기반 임베딩 캐시 (None이면 캐시 미사용)
+            partitions: 가족별 성문 파티션 (없으면 메모리 전용, 전수 검색)
+            embedding_concurrency: 요청 하나가 동시에 보내는 임베딩 호출 수
+            segmenter: 긴 클립 음성 구간 분할기 (None이면 항상 클립 전체를 한 번에 임베딩)
+            segment_min_clip: 구간 임베딩을 적용할 최소 클립 길이 (초)
+            segment_aggregation: 구간 임베딩 집계 방식 ("mean", "quality", "best_k")
+            segment_top_k: best_k 집계에 사용할 구간 수
+            segment_latency_budget: 구간 임베딩 목표 소요 시간 (초)
+            normalized_threshold: 코호트 정규화 점수 일치 판정 임계값 (파티션에 정규화기가 있을 때)
         """
+        if segment_aggregation not in self.SEGMENT_AGGREGATIONS:
+            raise ValueError(f"지원하지 않는 구간 집계 방식입니다: {segment_aggregation}")
+
         self.api_token = api_token or os.getenv("HUGGINGFACE_API_TOKEN", "")
         self.is_loaded = False
+        self.cache = cache
+        self.embedding_concurrency = max(1, embedding_concurrency)
+        self.segmenter = segmenter
+        self.segment_min_clip = segment_min_clip
+        self.segment_aggregation = segment_aggregation
+        self.segment_top_k = max(1, segment_top_k)
+        self.segment_latency_budget = segment_latency_budget
+        self.normalized_threshold = normalized_threshold
+        self._embedding_latency = 1.0  # 엔드포인트 호출 소요 시간 이동 평균 (초)
+        self.inflight = SingleFlight("speaker_embedding")
+        self._loading_until = 0.0  # 엔드포인트가 로딩 중이라고 응답한 경우 예상 완료 시각
+        # 샘플 추가의 읽기-갱신-기록 구간 보호 (저장소 기록을 기다리는 동안 다른 갱신이 끼어들지 않도록)
+        self._enroll_lock = asyncio.Lock()
         self._prototype_mode = not bool(self.api_token)
 
-        # 등록된 성문 저장소 (인메모리)
-        self.voiceprints: Dict[str, Dict] = {}
+        # 등록된 성문 저장소 (가족별 파티션, 정규화 임베딩 행렬 + 메타데이터)
+        self.partitions = partitions or VoiceprintPartitions(dim=self.EMBEDDING_DIM)
 
-        # 목업 데이터 초기화
-        self._init_mock_voiceprints()
+        # 목업 데이터 초기화 (목업 모드에서만, 저장소에는 기록하지 않음)
+        if self._prototype_mode:
+            self._init_mock_voiceprints()
 
         if self._prototype_mode:
             print("[SpeakerVerifier] API 토큰 없음 - 목업 모드로 동작")
@@ -54,6 +112,21 @@ class SpeakerVerifier:
         """API 요청 헤더 (Authorization만)"""
         return {"Authorization": f"Bearer {self.api_token}"}
 
+    @property
+    def voiceprints(self) -> VoiceprintGallery:
+        """기본 파티션 성문 갤러리"""
+        return self.partitions.get(create=True)
+
+    def _gallery(self, family_id: Optional[str]) -> VoiceprintGallery:
+        """가족 파티션 갤러리 (등록된 성문이 없으면 빈 갤러리)"""
+        gallery = self.partitions.get(family_id)
+        return gallery if gallery is not None else VoiceprintGallery(dim=self.EMBEDDING_DIM)
+
+    @property
+    def endpoint_loading(self) -> bool:
+        """엔드포인트가 모델 로딩 중(503)이라고 보고한 상태인지 여부"""
+        return time.time() < self._loading_until
+
     def _init_mock_voiceprints(self):
         """목업 성문 데이터 초기화"""
         mock_members = [
@@ -65,54 +138,107 @@ class SpeakerVerifier:
         for member in mock_members:
             # 고정 시드로 일관된 임베딩 생성
             np.random.seed(hash(member["id"]) % (2**31))
-            self.voiceprints[member["id"]] = {
+            self.voiceprints.add(member["id"], np.random.randn(self.EMBEDDING_DIM), {
                 "id": member["id"],
                 "name": member["name"],
                 "relation": member["relation"],
-                "embedding": np.random.randn(192).tolist(),  # 192차원 임베딩
                 "registered_at": datetime.now().isoformat(),
+                "updated_at": datetime.now().isoformat(),
                 "sample_count": random.randint(3, 5)
-            }
+            })
 
     def load_model(self):
         """모델 로딩 (API 모드에서는 실제 로딩 불필요)"""
         self.is_loaded = True
 
-    async def get_embedding_from_api(self, audio_bytes: bytes) -> Optional[List[float]]:
+    async def get_embedding_from_api(
+        self,
+        audio_bytes: bytes,
+        audio_digest: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Optional[np.ndarray]:
         """
         HuggingFace API를 사용하여 화자 임베딩 추출
 
+        임베딩만 캐시하므로 매칭 결과는 항상 현재 성문 목록으로 다시 계산됩니다.
+
         Args:
             audio_bytes: 오디오 바이너리 데이터
+            audio_digest: 오디오 SHA-256 해시 (캐시/요청 병합 키, 없으면 계산)
+            use_cache: False면 캐시를 조회/저장하지 않음 (요청 병합은 유지)
 
         Returns:
-            임베딩 벡터 (리스트) 또는 None
+            1차원 float32 임베딩 (읽기 전용으로 취급) 또는 None
         """
+        digest = audio_digest or _digest(audio_bytes)
+        if not use_cache:
+            return await self.inflight.do(digest, lambda: self._request_embedding(audio_bytes))
+
+        cached = self._cached_embedding(digest)
+        if cached is not None:
+            return cached
+
+        # 같은 오디오로 진행 중인 호출이 있으면 그 결과를 공유
+        return await self.inflight.do(digest, lambda: self._fetch_embedding(audio_bytes, digest))
+
+    def _cached_embedding(self, digest: Optional[str]) -> Optional[np.ndarray]:
+        """업로드 해시로 캐시된 임베딩 조회 (없으면 None)"""
+        if self.cache is None or digest is None:
+            return None
+        cached = self.cache.get(digest)
+        if cached is None:
+            return None
+        # 캐시에는 base64 float32로 저장 (이전 형식인 float 리스트도 허용)
+        return from_base64(cached) if isinstance(cached, str) else np.asarray(cached, dtype=np.float32)
+
+    async def _fetch_embedding(self, audio_bytes: bytes, digest: str) -> Optional[np.ndarray]:
+        """임베딩 호출 후 결과 캐시"""
+        embedding = await self._request_embedding(audio_bytes)
+        if embedding is not None and self.cache is not None:
+            self.cache.set(digest, to_base64(embedding))
+        return embedding
+
+    async def _request_embedding(self, audio_bytes: bytes) -> Optional[np.ndarray]:
+        """임베딩 엔드포인트 호출 (바이너리 응답 우선, JSON 하위 호환)"""
         api_url = self.ENDPOINT_URL
 
         try:
-            async with aiohttp.ClientSession() as session:
-                # Content-Type을 명시적으로 설정
-                headers = {
-                    "Authorization": f"Bearer {self.api_token}",
-                    "Content-Type": "audio/wav"
-                }
-                async with session.post(
-                    api_url,
-                    headers=headers,
-                    data=audio_bytes,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return self._parse_embedding_result(result)
-                    elif response.status == 503:
-                        print("[SpeakerVerifier] 모델 로딩 중...")
-                        return None
-                    else:
-                        error_text = await response.text()
-                        print(f"[SpeakerVerifier] API 에러: {response.status} - {error_text}")
-                        return None
+            started = time.perf_counter()
+            # 공유 커넥션 풀 사용 (keep-alive)
+            session = await get_http_client().session()
+            # Content-Type은 실제 페이로드 형식으로 지정
+            headers = {
+                "Authorization": f"Bearer {self.api_token}",
+                "Content-Type": audio_content_type(audio_bytes),
+                "Accept": EMBEDDING_ACCEPT
+            }
+            async with session.post(
+                api_url,
+                headers=headers,
+                data=audio_bytes
+            ) as response:
+                if response.status == 200:
+                    self._loading_until = 0.0
+                    body = await response.read()
+                    self._embedding_latency += 0.2 * (time.perf_counter() - started - self._embedding_latency)
+                    embedding = decode_binary_embedding(body, response.content_type)
+                    if embedding is None:
+                        return self._parse_embedding_result(loads_json(body))
+                    return embedding if len(embedding) else None
+                elif response.status == 503:
+                    # 모델 로딩 중 - 예상 소요 시간 동안 로딩 상태로 표시
+                    try:
+                        error_data = await response.json()
+                        estimated_time = float(error_data.get("estimated_time", 20))
+                    except (aiohttp.ContentTypeError, ValueError, AttributeError):
+                        estimated_time = 20.0
+                    self._loading_until = time.time() + estimated_time
+                    print(f"[SpeakerVerifier] 모델 로딩 중... (약 {estimated_time:.0f}초 소요)")
+                    return None
+                else:
+                    error_text = await response.text()
+                    print(f"[SpeakerVerifier] API 에러: {response.status} - {error_text}")
+                    return None
 
         except aiohttp.ClientError as e:
             print(f"[SpeakerVerifier] 연결 에러: {e}")
@@ -121,19 +247,21 @@ class SpeakerVerifier:
             print(f"[SpeakerVerifier] 예외 발생: {e}")
             return None
 
-    def _parse_embedding_result(self, result: any) -> Optional[List[float]]:
-        """HuggingFace API 임베딩 응답 파싱"""
+    def _parse_embedding_result(self, result: any) -> Optional[np.ndarray]:
+        """HuggingFace API JSON 임베딩 응답 파싱"""
         # Custom Endpoint는 {"embedding": [...], "dimension": 192} 형식 반환
         if isinstance(result, dict):
-            # embedding 키가 있는 경우 (Custom Endpoint)
+            # embedding 키가 있는 경우 (Custom Endpoint, base64 float32 문자열도 허용)
             if "embedding" in result:
                 embedding = result["embedding"]
+                if isinstance(embedding, str) and embedding:
+                    return from_base64(embedding)
                 if isinstance(embedding, list) and len(embedding) > 0:
                     print(f"[SpeakerVerifier] 임베딩 추출 성공: {len(embedding)}차원")
-                    return embedding
+                    return np.asarray(embedding, dtype=np.float32).reshape(-1)
             # embeddings 키가 있는 경우 (기존 호환)
             if "embeddings" in result:
-                return result["embeddings"]
+                return self._parse_embedding_result(result["embeddings"])
             # 에러가 있는 경우
             if "error" in result:
                 print(f"[SpeakerVerifier] API 에러: {result['error']}")
@@ -148,10 +276,10 @@ class SpeakerVerifier:
                     return None
                 # 중첩 리스트인 경우 평탄화
                 if isinstance(result[0], list):
-                    return result[0]
+                    return self._parse_embedding_result(result[0])
                 # float 리스트인 경우 (실제 임베딩)
                 if isinstance(result[0], (int, float)):
-                    return result
+                    return np.asarray(result, dtype=np.float32)
 
         return None
 
@@ -177,127 +305,406 @@ class SpeakerVerifier:
         member_id: str,
         name: str,
         relation: str,
-        audio_samples: List[bytes]
+        audio_samples: List[bytes],
+        family_id: Optional[str] = None,
+        decoded: Optional[List[Optional[Tuple[np.ndarray, int]]]] = None
     ) -> Dict:
         """
         성문 등록
 
+        샘플 임베딩은 동시에 추출하며, 일부 샘플이 실패하면 성공한 샘플만으로 등록합니다.
+        모든 샘플이 실패하면 등록하지 않습니다.
+
         Args:
             member_id: 가족 구성원 ID
             name: 이름
             relation: 관계
             audio_samples: 음성 샘플 바이트 리스트
+            family_id: 가족 ID (None이면 기본 파티션)
+            decoded: 샘플별로 미리 디코딩한 (모노 float32 오디오, 샘플레이트) (없으면 샘플당 한 번 디코딩)
 
         Returns:
-            등록 결과
+            등록 결과 (failed_samples: 실패한 샘플 순번, enrollment_time: 소요 시간(초))
         """
         if len(audio_samples) < 1:
             return {"success": False, "error": "최소 1개 이상의 음성 샘플이 필요합니다"}
 
-        embeddings = []
+        start = time.perf_counter()
+        gallery = self._gallery(family_id)
+        # 전송 인코딩과 품질 가중치가 같은 디코딩 결과를 사용
+        if decoded is None:
+            decoded = [get_processor().decode(sample) for sample in audio_samples]
+
+        # 샘플별 임베딩을 동시에 추출 (동시 호출 수는 embedding_concurrency로 제한)
+        semaphore = asyncio.Semaphore(self.embedding_concurrency)
+
+        async def embed(sample: bytes, sample_decoded) -> Optional[np.ndarray]:
+            async with semaphore:
+                if self._prototype_mode:
+                    embedding = self.extract_embedding(np.frombuffer(sample, dtype=np.uint8))
+                else:
+                    outbound = await get_outbound_encoder().encode_async(sample, sample_decoded)
+                    embedding = await self.get_embedding_from_api(outbound.payload)
+            if embedding is None or len(embedding) == 0:
+                return None
+            try:
+                return gallery.normalize(embedding)
+            except ValueError as e:
+                print(f"[SpeakerVerifier] {e}")
+                return None
 
-        # API 모드: 각 샘플에서 임베딩 추출
-        if not self._prototype_mode:
-            for sample in audio_samples:
-                embedding = await self.get_embedding_from_api(sample)
-                if embedding:
-                    embeddings.append(np.array(embedding))
+        results = await asyncio.gather(*(embed(*item) for item in zip(audio_samples, decoded)))
 
-            if not embeddings:
-                # API 실패 시 목업 임베딩 사용
-                embeddings = [np.random.randn(192) for _ in audio_samples]
-        else:
-            # 목업 모드: 랜덤 임베딩 생성
-            embeddings = [np.random.randn(192) for _ in audio_samples]
+        # 실패한 샘플은 제외하고 성공한 임베딩만으로 등록
+        embedded = [i for i, vector in enumerate(results) if vector is not None]
+        failed = [i for i, vector in enumerate(results) if vector is None]
+        elapsed = round(time.perf_counter() - start, 3)
+
+        if not embedded:
+            result = {
+                "success": False,
+                "error": "음성 임베딩을 추출하지 못했습니다",
+                "failed_samples": failed,
+                "enrollment_time": elapsed
+            }
+            if self.endpoint_loading:
+                result["status"] = "loading"
+                result["estimated_time"] = round(self._loading_until - time.time(), 1)
+            return result
+
+        # 품질 가중 평균 (각 샘플은 정규화 후 합산, 최종 정규화는 갤러리에서 수행)
+        vectors = np.stack([results[i] for i in embedded])
+        weights = np.array([self._sample_weight(audio_samples[i], decoded[i]) for i in embedded])
+        centroid = weights @ vectors / weights.sum()
+
+        now = datetime.now().isoformat()
+        await self.partitions.put_async(family_id, member_id, centroid, {
+            "id": member_id,
+            "name": name,
+            "relation": relation,
+            "registered_at": now,
+            "updated_at": now,
+            "sample_count": len(embedded),
+            "weight": float(weights.sum())
+        })
+
+        if failed:
+            print(f"[SpeakerVerifier] 등록 샘플 {len(failed)}/{len(audio_samples)}개 임베딩 실패 - 나머지로 등록")
 
-        # 임베딩 평균
-        avg_embedding = np.mean(embeddings, axis=0)
+        return {
+            "success": True,
+            "member_id": member_id,
+            "name": name,
+            "sample_count": len(embedded),
+            "failed_samples": failed,
+            "enrollment_time": elapsed,
+            "mode": "api" if not self._prototype_mode else "mock"
+        }
 
-        # 정규화
-        avg_embedding = avg_embedding / np.linalg.norm(avg_embedding)
+    async def create_member(
+        self,
+        member_id: str,
+        name: str,
+        relation: str,
+        family_id: Optional[str] = None
+    ) -> Dict:
+        """
+        샘플 없이 멤버 생성 (이후 add_sample로 한 개씩 등록)
 
-        self.voiceprints[member_id] = {
+        샘플이 추가되기 전까지는 영벡터로 저장되어 검색 점수가 0입니다.
+        """
+        now = datetime.now().isoformat()
+        meta = {
             "id": member_id,
             "name": name,
             "relation": relation,
-            "embedding": avg_embedding.tolist(),
-            "registered_at": datetime.now().isoformat(),
-            "sample_count": len(audio_samples)
+            "registered_at": now,
+            "updated_at": now,
+            "sample_count": 0,
+            "weight": 0.0
         }
+        await self.partitions.put_async(family_id, member_id, np.zeros(self.EMBEDDING_DIM, dtype=np.float32), meta)
+        return dict(meta)
+
+    async def add_sample(
+        self,
+        member_id: str,
+        audio_bytes: bytes,
+        family_id: Optional[str] = None,
+        audio_digest: Optional[str] = None,
+        quality_weighting: bool = True,
+        decoded: Optional[Tuple[np.ndarray, int]] = None
+    ) -> Dict:
+        """
+        음성 샘플 하나로 성문 갱신 (증분 등록)
+
+        기존 샘플을 다시 임베딩하지 않고, 누적 가중 평균만 갱신합니다.
+        샘플당 임베딩 호출 1회 + O(d) 갱신:
+
+            W' = W + w,   c' = c + (w / W') * (x - c)
+
+        Args:
+            member_id: 멤버 ID
+            audio_bytes: 음성 샘플 바이트
+            family_id: 가족 ID (None이면 기본 파티션)
+            audio_digest: 오디오 SHA-256 해시 (임베딩 캐시 키)
+            quality_weighting: 길이/음량 기반 샘플 가중치 사용 여부 (False면 모든 샘플 가중치 1)
+            decoded: 업로드 수신 중 디코딩한 (모노 float32 오디오, 샘플레이트) (없으면 한 번 디코딩)
+
+        Returns:
+            갱신 결과
+        """
+        gallery = self.partitions.get(family_id)
+        if gallery is None or member_id not in gallery:
+            return {"success": False, "error": "등록되지 않은 멤버입니다"}
+
+        if decoded is None:
+            decoded = get_processor().decode(audio_bytes)
+
+        if self._prototype_mode:
+            embedding = self.extract_embedding(np.frombuffer(audio_bytes, dtype=np.uint8))
+        else:
+            # 업로드 해시로 캐시를 먼저 확인하고, 없을 때만 인코딩 후 임베딩 호출
+            embedding = self._cached_embedding(audio_digest)
+            if embedding is None:
+                outbound = await get_outbound_encoder().encode_async(audio_bytes, decoded)
+                embedding = await self.get_embedding_from_api(outbound.payload, audio_digest=audio_digest)
+            if embedding is None:
+                result = {"success": False, "error": "음성 임베딩을 추출하지 못했습니다"}
+                if self.endpoint_loading:
+                    result["status"] = "loading"
+                    result["estimated_time"] = round(self._loading_until - time.time(), 1)
+                return result
+
+        try:
+            vector = gallery.normalize(embedding)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        weight = self._sample_weight(audio_bytes, decoded) if quality_weighting else 1.0
+
+        async with self._enroll_lock:
+            if member_id not in gallery:
+                return {"success": False, "error": "등록되지 않은 멤버입니다"}
+            meta = dict(gallery[member_id])
+            total = meta.get("weight", float(meta["sample_count"])) + weight
+            centroid = gallery.centroid(member_id)
+            centroid += (weight / total) * (vector - centroid)
+
+            meta.update(
+                sample_count=meta["sample_count"] + 1,
+                weight=total,
+                updated_at=datetime.now().isoformat()
+            )
+            await self.partitions.put_async(family_id, member_id, centroid, meta)
 
         return {
             "success": True,
             "member_id": member_id,
-            "name": name,
-            "sample_count": len(audio_samples),
+            "sample_count": meta["sample_count"],
+            "sample_weight": round(weight, 3),
             "mode": "api" if not self._prototype_mode else "mock"
         }
 
+    def _sample_weight(self, audio_bytes: bytes, decoded: Optional[Tuple[np.ndarray, int]] = None) -> float:
+        """
+        샘플 품질 가중치 (길이와 음량 기반)
+
+        10초까지는 길이에 비례하고, RMS가 0.01 미만인 작은 음량은 낮춥니다.
+        decoded가 없으면 audio_bytes를 디코딩하며, 디코딩할 수 없는 형식은 1.0을 사용합니다.
+        """
+        if decoded is None:
+            decoded = get_processor().decode(audio_bytes)
+        if decoded is None:
+            return 1.0
+        audio, sample_rate = decoded
+        if len(audio) == 0:
+            return 0.1
+        duration = len(audio) / sample_rate
+        rms = float(np.sqrt(np.mean(np.square(audio, dtype=np.float64))))
+        return float(np.clip(duration / 10.0, 0.1, 1.0) * np.clip(rms / 0.01, 0.1, 1.0))
+
+    async def embed_clip(
+        self,
+        audio_bytes: bytes,
+        audio_digest: Optional[str] = None,
+        decoded: Optional[Tuple[np.ndarray, int]] = None,
+        use_cache: bool = True
+    ) -> Tuple[Optional[np.ndarray], int]:
+        """
+        클립 임베딩 추출 (긴 클립은 음성 구간 윈도우별로 동시에 임베딩 후 집계)
+
+        윈도우 수는 지연 예산 안에 끝낼 수 있는 만큼으로 제한하므로
+        (동시 호출 수 × 예산 안의 호출 차수) 긴 클립도 짧은 클립과 비슷한 시간이 걸립니다.
+        디코딩할 수 없거나 짧은 클립, 음성 윈도우가 1개 이하인 클립은 전체를 한 번에 보냅니다.
+
+        Args:
+            audio_bytes: 오디오 바이너리 데이터
+            audio_digest: 오디오 SHA-256 해시 (클립 임베딩 캐시 키 - 구간별로 집계한 임베딩도 이 키로 캐시)
+            decoded: audio_bytes를 디코딩한 (모노 float32 오디오, 샘플레이트) (없으면 분할할 때만 디코딩)
+            use_cache: False면 클립/구간 임베딩을 캐시에 저장하지 않음
+
+        Returns:
+            (임베딩 또는 None, 사용한 윈도우 수 - 전체 임베딩이면 1)
+        """
+        if decoded is None and self.segmenter is not None:
+            decoded = get_processor().decode(audio_bytes)
+        if decoded is not None and self.segmenter is not None:
+            audio, sample_rate = decoded
+            if len(audio) / sample_rate >= self.segment_min_clip:
+                segments = self.segmenter.segment(audio, sample_rate, max_segments=self._segment_budget())
+                if len(segments) > 1:
+                    embedding, count = await self._embed_segments(segments, sample_rate, use_cache)
+                    if embedding is not None and audio_digest is not None and self.cache is not None and use_cache:
+                        self.cache.set(audio_digest, to_base64(embedding))
+                    return embedding, count
+
+        embedding = await self.get_embedding_from_api(audio_bytes, audio_digest=audio_digest, use_cache=use_cache)
+        if embedding is None:
+            return None, 0
+        return embedding, 1
+
+    def _segment_budget(self) -> int:
+        """지연 예산 안에 처리할 수 있는 최대 윈도우 수"""
+        waves = max(1, int(self.segment_latency_budget / max(self._embedding_latency, 1e-3)))
+        return self.embedding_concurrency * waves
+
+    async def _embed_segments(
+        self,
+        segments: List[Dict],
+        sample_rate: int,
+        use_cache: bool = True
+    ) -> Tuple[Optional[np.ndarray], int]:
+        """윈도우별 임베딩을 동시에 추출하고 설정된 방식으로 집계"""
+        semaphore = asyncio.Semaphore(self.embedding_concurrency)
+
+        async def embed(segment: Dict) -> Optional[np.ndarray]:
+            async with semaphore:
+                return await self.get_embedding_from_api(
+                    self.segmenter.encode(segment, sample_rate), use_cache=use_cache
+                )
+
+        results = await asyncio.gather(*(embed(segment) for segment in segments))
+        embedded = [
+            (embedding, segment["quality"])
+            for embedding, segment in zip(results, segments)
+            if embedding is not None and len(embedding) == self.EMBEDDING_DIM
+        ]
+        if not embedded:
+            return None, 0
+
+        if self.segment_aggregation == "best_k":
+            embedded = sorted(embedded, key=lambda item: item[1], reverse=True)[:self.segment_top_k]
+        vectors = np.stack([vector / (np.linalg.norm(vector) + 1e-12) for vector, _ in embedded])
+        if self.segment_aggregation == "quality":
+            weights = np.array([quality for _, quality in embedded]) + 1e-3
+        else:
+            weights = np.ones(len(embedded))
+        return weights @ vectors / weights.sum(), len(embedded)
+
     async def verify(
         self,
         audio_bytes: bytes = None,
         audio_data: np.ndarray = None,
         member_id: Optional[str] = None,
-        threshold: float = 0.6
+        threshold: float = 0.6,
+        audio_digest: Optional[str] = None,
+        top_k: int = 10,
+        family_id: Optional[str] = None,
+        sample_rate: int = 16000,
+        outbound: Optional[PendingOutbound] = None,
+        use_cache: bool = True
     ) -> Dict:
         """
         화자 검증 수행
 
         Args:
             audio_bytes: 검증할 음성 바이트
-            audio_data: 검증할 음성 numpy 배열
+            audio_data: 검증할 음성 numpy 배열 (audio_bytes를 디코딩한 샘플이면 다시 디코딩하지 않음)
             member_id: 특정 멤버와 비교 (None이면 전체 검색)
             threshold: 일치 판정 임계값
+            audio_digest: 오디오 SHA-256 해시 (임베딩 캐시 키)
+            top_k: 전체 검색 시 all_scores에 포함할 상위 멤버 수
+            family_id: 가족 ID (해당 가족의 성문만 비교, None이면 기본 파티션)
+            sample_rate: audio_data의 샘플레이트
+            outbound: 다른 단계와 공유하는 전송 페이로드 (없으면 audio_bytes로 생성)
+            use_cache: False면 임베딩 캐시를 조회/저장하지 않음 (실시간 스트림 윈도우)
 
         Returns:
-            검증 결과
+            검증 결과 (업로드 해시로 캐시된 임베딩을 쓰면 cached=True, segments=0)
         """
+        gallery = self._gallery(family_id)
+
         # 입력 음성 임베딩 추출
         input_embedding = None
+        segments = 0
+        cached = False
 
         if not self._prototype_mode and audio_bytes:
-            # API 모드
-            embedding_list = await self.get_embedding_from_api(audio_bytes)
-            if embedding_list:
-                input_embedding = np.array(embedding_list)
-                input_embedding = input_embedding / np.linalg.norm(input_embedding)
+            # API 모드 - 업로드 해시로 캐시를 먼저 확인하고, 없을 때만 전송용 16kHz 모노 WAV로
+            # 인코딩 (긴 클립은 구간별 임베딩 후 집계)
+            embedding = self._cached_embedding(audio_digest) if use_cache else None
+            cached = embedding is not None
+            if embedding is None:
+                if outbound is None:
+                    decoded = (audio_data, sample_rate) if audio_data is not None else None
+                    outbound = PendingOutbound(audio_bytes, decoded)
+                encoded = await outbound.get()
+                embedding, segments = await self.embed_clip(
+                    encoded.payload, audio_digest=audio_digest, decoded=encoded.decoded, use_cache=use_cache
+                )
+            if embedding is not None:
+                try:
+                    input_embedding = gallery.normalize(embedding)
+                except ValueError as e:
+                    print(f"[SpeakerVerifier] {e}")
 
         if input_embedding is None:
             # 목업 모드 또는 API 실패
             if self._prototype_mode:
-                return self._mock_verify(member_id)
+                return self._mock_verify(gallery, member_id)
             else:
                 # API 실패 시에도 목업 결과 반환
-                return self._mock_verify(member_id)
+                result = self._mock_verify(gallery, member_id)
+                if self.endpoint_loading:
+                    result["status"] = "loading"
+                    result["estimated_time"] = round(self._loading_until - time.time(), 1)
+                return result
 
         # 실제 검증 수행
         if member_id:
             # 특정 멤버와 비교
-            if member_id not in self.voiceprints:
+            if member_id not in gallery:
                 return {"success": False, "error": "등록되지 않은 멤버입니다"}
 
-            registered = self.voiceprints[member_id]
-            registered_embedding = np.array(registered["embedding"])
-            similarity = self._cosine_similarity(input_embedding, registered_embedding)
+            registered = gallery[member_id]
+            similarity = gallery.score(member_id, input_embedding)
+            normalized = self._normalized_score(gallery, member_id, similarity, self._test_stats(input_embedding))
+            verified = self._is_match(similarity, normalized, threshold)
 
-            return {
+            result = {
                 "success": True,
-                "verified": similarity >= threshold,
+                "verified": verified,
                 "similarity": round(float(similarity) * 100, 2),
-                "matched_member": registered["name"] if similarity >= threshold else None,
+                "matched_member": registered["name"] if verified else None,
                 "threshold": threshold * 100,
                 "mode": "api"
             }
+            self._annotate_normalization(result, normalized)
         else:
             # 전체 성문 검색
-            return self._search_all(input_embedding, threshold)
+            result = self._search_all(gallery, input_embedding, threshold, top_k)
 
-    def _mock_verify(self, member_id: Optional[str] = None) -> Dict:
+        result["segments"] = segments
+        if cached:
+            result["cached"] = True
+        return result
+
+    def _mock_verify(self, gallery: VoiceprintGallery, member_id: Optional[str] = None) -> Dict:
         """목업 검증 결과 생성"""
         is_match = random.random() > 0.5
 
-        if member_id and member_id in self.voiceprints:
-            member = self.voiceprints[member_id]
+        if member_id and member_id in gallery:
+            member = gallery[member_id]
             similarity = random.uniform(75, 95) if is_match else random.uniform(10, 35)
 
             return {
@@ -310,15 +717,15 @@ class SpeakerVerifier:
             }
         else:
             # 전체 검색 목업
-            if is_match and self.voiceprints:
-                matched = random.choice(list(self.voiceprints.values()))
+            if is_match and gallery:
+                matched = random.choice(gallery.values())
                 similarity = random.uniform(75, 95)
                 return {
                     "success": True,
                     "verified": True,
                     "similarity": round(similarity, 2),
                     "matched_member": matched["name"],
-                    "all_scores": self._generate_mock_scores(matched["id"]),
+                    "all_scores": self._generate_mock_scores(gallery, matched["id"]),
                     "threshold": 60.0,
                     "mode": "mock"
                 }
@@ -328,15 +735,15 @@ class SpeakerVerifier:
                     "verified": False,
                     "similarity": round(random.uniform(10, 35), 2),
                     "matched_member": None,
-                    "all_scores": self._generate_mock_scores(None),
+                    "all_scores": self._generate_mock_scores(gallery, None),
                     "threshold": 60.0,
                     "mode": "mock"
                 }
 
-    def _generate_mock_scores(self, matched_id: Optional[str]) -> List[Dict]:
+    def _generate_mock_scores(self, gallery: VoiceprintGallery, matched_id: Optional[str]) -> List[Dict]:
         """전체 멤버에 대한 목업 점수 생성"""
         scores = []
-        for vid, vp in self.voiceprints.items():
+        for vid, vp in gallery.items():
             if vid == matched_id:
                 score = random.uniform(75, 95)
             else:
@@ -348,9 +755,59 @@ class SpeakerVerifier:
             })
         return sorted(scores, key=lambda x: x["similarity"], reverse=True)
 
-    def _search_all(self, input_embedding: np.ndarray, threshold: float) -> Dict:
-        """전체 성문 검색"""
-        if not self.voiceprints:
+    @property
+    def normalizer(self) -> Optional[CohortScoreNormalizer]:
+        """코호트 점수 정규화기 (없으면 원시 코사인 점수로 판정)"""
+        return self.partitions.normalizer
+
+    def _test_stats(self, input_embedding: np.ndarray) -> Optional[CohortStats]:
+        """질의 임베딩의 코호트 통계 (질의당 코호트 행렬-벡터 곱 한 번)"""
+        return self.normalizer.stats(input_embedding) if self.normalizer is not None else None
+
+    @staticmethod
+    def _normalized_score(
+        gallery: VoiceprintGallery,
+        member_id: str,
+        similarity: float,
+        test_stats: Optional[CohortStats]
+    ) -> Optional[float]:
+        """미리 계산된 등록 성문 통계와 질의 통계로 정규화한 점수 (통계가 없으면 None)"""
+        enroll_stats = gallery.cohort_stats(member_id)
+        if test_stats is None or enroll_stats is None:
+            return None
+        return CohortScoreNormalizer.normalize(similarity, enroll_stats, test_stats)
+
+    def _is_match(self, similarity: float, normalized: Optional[float], threshold: float) -> bool:
+        """일치 판정 (정규화 점수가 있으면 정규화 임계값, 없으면 코사인 임계값)"""
+        if normalized is not None:
+            return normalized >= self.normalized_threshold
+        return similarity >= threshold
+
+    def _annotate_normalization(self, result: Dict, normalized: Optional[float]):
+        if normalized is not None:
+            result["normalized_score"] = round(normalized, 3)
+            result["normalized_threshold"] = self.normalized_threshold
+            result["score_normalization"] = self.normalizer.mode
+
+    def _search_all(
+        self,
+        gallery: VoiceprintGallery,
+        input_embedding: np.ndarray,
+        threshold: float,
+        top_k: int = 10
+    ) -> Dict:
+        """가족 파티션 전체 성문 검색 (행렬-벡터 곱 한 번으로 전체 점수 계산)"""
+        # 샘플이 아직 없는 멤버(영벡터)는 후보에서 제외
+        test_stats = self._test_stats(input_embedding)
+        top = [
+            (member_id, similarity, self._normalized_score(gallery, member_id, similarity, test_stats))
+            for member_id, similarity in gallery.search(input_embedding, k=top_k)
+            if gallery[member_id]["sample_count"] > 0
+        ]
+        if test_stats is not None:
+            # 정규화 점수 기준으로 후보 재정렬 (통계가 없는 후보는 뒤로)
+            top.sort(key=lambda item: item[2] if item[2] is not None else -np.inf, reverse=True)
+        if not top:
             return {
                 "success": True,
                 "verified": False,
@@ -359,57 +816,52 @@ class SpeakerVerifier:
                 "error": "등록된 성문이 없습니다",
                 "mode": "api"
             }
-
-        best_match = None
-        best_similarity = 0.0
         all_scores = []
-
-        for member_id, voiceprint in self.voiceprints.items():
-            registered_embedding = np.array(voiceprint["embedding"])
-            similarity = self._cosine_similarity(input_embedding, registered_embedding)
-            all_scores.append({
+        for member_id, similarity, normalized in top:
+            score = {
                 "member_id": member_id,
-                "name": voiceprint["name"],
-                "similarity": round(float(similarity) * 100, 2)
-            })
-
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_match = voiceprint
+                "name": gallery[member_id]["name"],
+                "similarity": round(similarity * 100, 2)
+            }
+            if normalized is not None:
+                score["normalized_score"] = round(normalized, 3)
+            all_scores.append(score)
 
-        all_scores = sorted(all_scores, key=lambda x: x["similarity"], reverse=True)
+        best_id, best_similarity, best_normalized = top[0]
+        best_match = gallery[best_id] if best_similarity > 0 else None
+        best_similarity = max(best_similarity, 0.0)
+        verified = best_match is not None and self._is_match(best_similarity, best_normalized, threshold)
 
-        return {
+        result = {
             "success": True,
-            "verified": best_similarity >= threshold,
+            "verified": verified,
             "similarity": round(float(best_similarity) * 100, 2),
-            "matched_member": best_match["name"] if best_similarity >= threshold else None,
+            "matched_member": best_match["name"] if verified else None,
             "all_scores": all_scores,
             "threshold": threshold * 100,
             "mode": "api"
         }
+        self._annotate_normalization(result, best_normalized)
+        return result
 
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """코사인 유사도 계산"""
-        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
-
-    def get_registered_members(self) -> List[Dict]:
-        """등록된 성문 목록 반환"""
+    def get_registered_members(self, family_id: Optional[str] = None) -> List[Dict]:
+        """가족 파티션에 등록된 성문 목록 반환"""
         return [
             {
                 "id": vp["id"],
                 "name": vp["name"],
                 "relation": vp["relation"],
                 "registered_at": vp["registered_at"],
+                "updated_at": vp.get("updated_at", vp["registered_at"]),
                 "sample_count": vp["sample_count"]
             }
-            for vp in self.voiceprints.values()
+            for vp in self._gallery(family_id).values()
         ]
 
-    def delete_voiceprint(self, member_id: str) -> Dict:
+    async def delete_voiceprint(self, member_id: str, family_id: Optional[str] = None) -> Dict:
         """성문 삭제"""
-        if member_id in self.voiceprints:
-            deleted = self.voiceprints.pop(member_id)
+        deleted = await self.partitions.remove_async(family_id, member_id)
+        if deleted is not None:
             return {"success": True, "deleted": deleted["name"]}
         return {"success": False, "error": "등록되지 않은 멤버입니다"}
 
@@ -424,6 +876,27 @@ def get_verifier() -> SpeakerVerifier:
         # 환경변수에서 토큰 로드
         from config import settings
         api_token = settings.HUGGINGFACE_API_TOKEN
-        _verifier_instance = SpeakerVerifier(api_token=api_token)
+        dim = SpeakerVerifier.EMBEDDING_DIM
+        _verifier_instance = SpeakerVerifier(
+            api_token=api_token,
+            cache=create_result_cache("speaker_embedding"),
+            partitions=VoiceprintPartitions(
+                dim=dim,
+                index_factory=lambda: create_voiceprint_index(dim),
+                store=EmbeddingStore(
+                    settings.VOICEPRINTS_DIR / "store", dim=dim, sync=settings.VOICEPRINT_STORE_FSYNC
+                ),
+                max_resident=settings.VOICEPRINT_MAX_RESIDENT_FAMILIES,
+                rescore=settings.VOICEPRINT_RESCORE,
+                normalizer=create_score_normalizer(dim)
+            ),
+            embedding_concurrency=settings.SPEAKER_EMBEDDING_CONCURRENCY,
+            segmenter=get_speech_segmenter(),
+            segment_min_clip=settings.SPEAKER_SEGMENT_MIN_CLIP,
+            segment_aggregation=settings.SPEAKER_SEGMENT_AGGREGATION,
+            segment_top_k=settings.SPEAKER_SEGMENT_TOP_K,
+            segment_latency_budget=settings.SPEAKER_SEGMENT_LATENCY_BUDGET,
+            normalized_threshold=settings.SCORE_NORM_THRESHOLD
+        )
         _verifier_instance.load_model()
     return _verifier_instance
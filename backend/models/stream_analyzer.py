@@ -0,0 +1,236 @@
+"""
+실시간 통화 음성 분석 모듈
+16kHz PCM 프레임을 겹치는 슬라이딩 윈도우로 나누어 점진적으로 분석
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+from utils.audio_processor import get_processor
+
+from .analysis_pipeline import AnalysisPipeline, AnalysisTimeoutError, assess_risk, get_pipeline
+
+
+class StreamingAnalyzer:
+    """
+    연결별 슬라이딩 윈도우 분석기
+
+    - 수신 버퍼는 윈도우 길이만큼의 링 버퍼로 고정 (메모리 상한)
+    - 분석 대기 윈도우 수를 제한하고, 분석이 밀리면 가장 오래된 윈도우를 버림
+    - 윈도우별 결과를 지수 이동 평균으로 누적하여 롤링 위험도 산출
+    """
+
+    SAMPLE_RATE = 16000
+
+    def __init__(
+        self,
+        pipeline: Optional[AnalysisPipeline] = None,
+        window_seconds: float = 3.0,
+        hop_seconds: float = 1.5,
+        max_pending: int = 2,
+        smoothing: float = 0.5,
+        family_id: Optional[str] = None
+    ):
+        """
+        분석기 초기화
+
+        Args:
+            pipeline: 분석 파이프라인 (없으면 싱글톤 사용)
+            window_seconds: 분석 윈도우 길이 (초)
+            hop_seconds: 윈도우 간격 (초, 윈도우 길이보다 작으면 겹침)
+            max_pending: 분석 대기 가능한 최대 윈도우 수
+            smoothing: 롤링 점수 지수 이동 평균 계수 (0~1, 클수록 최신 윈도우 비중 큼)
+            family_id: 가족 ID (해당 가족의 성문과만 대조)
+        """
+        self.pipeline = pipeline or get_pipeline()
+        self.window_size = int(window_seconds * self.SAMPLE_RATE)
+        self.hop_size = int(hop_seconds * self.SAMPLE_RATE)
+        self.smoothing = smoothing
+        self.family_id = family_id
+
+        self._buffer = np.zeros(self.window_size, dtype=np.int16)
+        self._buffered = 0  # 버퍼에 채워진 샘플 수 (최대 window_size)
+        self._total_samples = 0  # 수신한 전체 샘플 수
+        self._since_last_window = 0
+        self._remainder = b""  # 프레임 경계에서 잘린 홀수 바이트
+
+        self._pending: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.windows_emitted = 0
+        self.windows_analyzed = 0
+        self.windows_dropped = 0
+        self.windows_failed = 0
+
+        self._rolling_deepfake: Optional[float] = None
+        self._rolling_voiceprint: Optional[float] = None
+
+    def feed(self, frame: bytes):
+        """
+        PCM 프레임 수신 (little-endian int16 모노)
+
+        윈도우가 준비되면 분석 대기열에 추가합니다.
+        """
+        data = self._remainder + frame
+        usable = len(data) - (len(data) % 2)
+        self._remainder = data[usable:]
+        if not usable:
+            return
+
+        samples = np.frombuffer(data[:usable], dtype='<i2')
+
+        # 한 번에 윈도우보다 긴 프레임이 오면 hop 단위로 나누어 처리
+        step = max(1, self.hop_size)
+        for start in range(0, len(samples), step):
+            self._append(samples[start:start + step])
+            self._maybe_emit()
+
+    def flush(self, min_seconds: float = 1.0):
+        """스트림 종료 시 아직 분석되지 않은 마지막 구간 분석 요청"""
+        if self._since_last_window == 0 and self.windows_emitted > 0:
+            return
+        if self._buffered >= int(min_seconds * self.SAMPLE_RATE):
+            self._emit()
+
+    async def close(self):
+        """분석 종료 신호 (대기 중인 윈도우는 모두 분석한 뒤 종료)"""
+        await self._pending.put(None)
+
+    async def run(self, send: Callable[[Dict], Awaitable[None]]):
+        """
+        대기 윈도우를 순서대로 분석하여 결과 전송
+
+        윈도우 분석이 실패하면 (마감 초과, 원격 호출 오류 등) 해당 윈도우만
+        type=error로 알리고 다음 윈도우를 계속 분석합니다.
+
+        Args:
+            send: 업데이트 전송 코루틴 함수
+        """
+        while True:
+            item = await self._pending.get()
+            if item is None:
+                return
+
+            window_index, start_sample, window = item
+            started = time.perf_counter()
+            try:
+                wav_bytes = get_processor().encode_wav(window, self.SAMPLE_RATE)
+                # 윈도우 샘플을 그대로 넘겨 파이프라인이 WAV를 다시 디코딩하지 않음
+                decoded = (window.astype(np.float32) / 32768.0, self.SAMPLE_RATE)
+                # 윈도우는 다시 올 일이 없으므로 업로드 결과 캐시를 밀어내지 않도록 캐시를 쓰지 않음
+                result = await self.pipeline.run(
+                    wav_bytes, family_id=self.family_id, decoded=decoded, use_cache=False
+                )
+            except AnalysisTimeoutError as e:
+                self.windows_failed += 1
+                await send({"type": "error", "window": window_index, "error": str(e)})
+                continue
+            except Exception as e:
+                print(f"[StreamingAnalyzer] 윈도우 {window_index} 분석 실패: {e}")
+                self.windows_failed += 1
+                await send({"type": "error", "window": window_index, "error": "분석 중 오류가 발생했습니다"})
+                continue
+
+            self.windows_analyzed += 1
+            await send(self._update(window_index, start_sample, len(window), result, started))
+
+    def _append(self, samples: np.ndarray):
+        """링 버퍼에 샘플 추가 (윈도우 길이를 넘는 오래된 샘플은 밀려남)"""
+        n = len(samples)
+        if n >= self.window_size:
+            self._buffer[:] = samples[-self.window_size:]
+        else:
+            self._buffer[:-n] = self._buffer[n:]
+            self._buffer[-n:] = samples
+        self._buffered = min(self.window_size, self._buffered + n)
+        self._total_samples += n
+        self._since_last_window += n
+
+    def _maybe_emit(self):
+        if self._buffered < self.window_size:
+            return
+        if self.windows_emitted > 0 and self._since_last_window < self.hop_size:
+            return
+        self._emit()
+
+    def _emit(self):
+        window = self._buffer[-self._buffered:].copy()
+        start_sample = self._total_samples - self._buffered
+        self._put((self.windows_emitted, start_sample, window))
+        self.windows_emitted += 1
+        self._since_last_window = 0
+
+    def _put(self, item):
+        """대기열 추가 (가득 차면 가장 오래된 윈도우를 버림)"""
+        while True:
+            try:
+                self._pending.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                dropped = self._pending.get_nowait()
+                if dropped is not None:
+                    self.windows_dropped += 1
+
+    def _update(self, window_index: int, start_sample: int, length: int, result: Dict, started: float) -> Dict:
+        """윈도우 결과를 롤링 점수에 반영하여 업데이트 메시지 생성"""
+        deepfake_prob = float(result["deepfake_probability"])
+        voiceprint_match = float(result["voiceprint_match"])
+
+        self._rolling_deepfake = self._smooth(self._rolling_deepfake, deepfake_prob)
+        self._rolling_voiceprint = self._smooth(self._rolling_voiceprint, voiceprint_match)
+        risk_level, recommendations = assess_risk(self._rolling_deepfake, self._rolling_voiceprint)
+
+        return {
+            "type": "update",
+            "window": window_index,
+            "start": round(start_sample / self.SAMPLE_RATE, 2),
+            "end": round((start_sample + length) / self.SAMPLE_RATE, 2),
+            "deepfake_probability": round(deepfake_prob, 1),
+            "voiceprint_match": round(voiceprint_match, 1),
+            "matched_person": result["matched_person"],
+            "rolling_deepfake_probability": round(self._rolling_deepfake, 1),
+            "rolling_voiceprint_match": round(self._rolling_voiceprint, 1),
+            "risk_level": risk_level,
+            "recommendations": recommendations,
+            "analysis_mode": result["analysis_mode"],
+            "latency": round(time.perf_counter() - started, 3),
+            "windows_dropped": self.windows_dropped
+        }
+
+    def _smooth(self, previous: Optional[float], value: float) -> float:
+        if previous is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * previous
+
+    def summary(self) -> Dict:
+        """스트림 종료 요약"""
+        risk_level = None
+        if self._rolling_deepfake is not None:
+            risk_level, _ = assess_risk(self._rolling_deepfake, self._rolling_voiceprint)
+        return {
+            "type": "summary",
+            "duration": round(self._total_samples / self.SAMPLE_RATE, 2),
+            "windows_analyzed": self.windows_analyzed,
+            "windows_dropped": self.windows_dropped,
+            "windows_failed": self.windows_failed,
+            "rolling_deepfake_probability": (
+                round(self._rolling_deepfake, 1) if self._rolling_deepfake is not None else None
+            ),
+            "rolling_voiceprint_match": (
+                round(self._rolling_voiceprint, 1) if self._rolling_voiceprint is not None else None
+            ),
+            "risk_level": risk_level
+        }
+
+
+def create_stream_analyzer(family_id: Optional[str] = None) -> StreamingAnalyzer:
+    """설정값으로 실시간 분석기 생성"""
+    from config import settings
+    return StreamingAnalyzer(
+        window_seconds=settings.STREAM_WINDOW_SECONDS,
+        hop_seconds=settings.STREAM_HOP_SECONDS,
+        max_pending=settings.STREAM_MAX_PENDING_WINDOWS,
+        smoothing=settings.STREAM_SMOOTHING,
+        family_id=family_id
+    )
@@ -0,0 +1,174 @@
+"""
+성문 갤러리 모듈
+등록된 화자의 메타데이터와 정규화 임베딩 검색 인덱스를 함께 관리
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .score_normalizer import CohortScoreNormalizer, CohortStats
+from .voiceprint_index import ExactIndex, VoiceprintIndex
+
+
+class VoiceprintGallery:
+    """
+    성문 갤러리
+
+    - 임베딩은 L2 정규화된 float32로 검색 인덱스에 저장 (코사인 유사도 = 내적)
+    - 인덱스는 교체 가능: 전수 검색(ExactIndex) 또는 근사 검색(IVFIndex)
+    - 메타데이터는 ID별 딕셔너리로 보관 (기존 dict 방식 조회와 호환)
+    - 정규화 전 벡터의 크기를 함께 보관하여 누적 평균(중심) 벡터를 복원 가능
+    - 인덱스가 양자화 형식(float16/int8)이면 exact_source(원본 float32 조회)로
+      상위 후보를 다시 채점하고 누적 평균도 원본 기준으로 갱신
+    - 점수 정규화기가 있으면 등록/갱신 시 성문별 코호트 통계를 미리 계산해 보관
+    """
+
+    def __init__(
+        self,
+        dim: int = 192,
+        index: Optional[VoiceprintIndex] = None,
+        exact_source: Optional[Callable[[str], Optional[np.ndarray]]] = None,
+        rescore: int = 0,
+        normalizer: Optional[CohortScoreNormalizer] = None
+    ):
+        """
+        Args:
+            dim: 임베딩 차원 (ECAPA-TDNN 192차원)
+            index: 검색 인덱스 (없으면 전수 검색)
+            exact_source: 멤버 ID로 정규화 전 float32 임베딩을 돌려주는 함수 (예: 영속 저장소 조회)
+            rescore: 양자화 인덱스 검색 시 float32로 다시 채점할 상위 후보 수 (0이면 안 함)
+            normalizer: 코호트 점수 정규화기 (없으면 코호트 통계를 계산하지 않음)
+        """
+        self.dim = dim
+        self.index = index if index is not None else ExactIndex(dim)
+        self.exact_source = exact_source
+        self.rescore = rescore
+        self.normalizer = normalizer
+        self._meta: Dict[str, Dict] = {}
+        self._norms: Dict[str, float] = {}
+        self._cohort_stats: Dict[str, CohortStats] = {}
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def __contains__(self, member_id: str) -> bool:
+        return member_id in self._meta
+
+    def __getitem__(self, member_id: str) -> Dict:
+        return self._meta[member_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._meta))
+
+    def get(self, member_id: str, default=None) -> Optional[Dict]:
+        """메타데이터 조회"""
+        return self._meta.get(member_id, default)
+
+    def keys(self) -> List[str]:
+        return list(self._meta.keys())
+
+    def values(self) -> List[Dict]:
+        return list(self._meta.values())
+
+    def items(self) -> List[Tuple[str, Dict]]:
+        return list(self._meta.items())
+
+    def embedding(self, member_id: str) -> np.ndarray:
+        """정규화된 임베딩 (복사본)"""
+        return np.array(self.index.vector(member_id), dtype=np.float32)
+
+    def centroid(self, member_id: str) -> np.ndarray:
+        """정규화 전 등록 벡터 (누적 평균 임베딩)"""
+        exact = self._exact(member_id)
+        if exact is not None:
+            return np.array(exact, dtype=np.float32)
+        return self.embedding(member_id) * self._norms[member_id]
+
+    def _exact(self, member_id: str) -> Optional[np.ndarray]:
+        """원본 float32 벡터 (인덱스가 float32이거나 조회 수단이 없으면 None)"""
+        if self.exact_source is None or self.index.storage == "float32":
+            return None
+        return self.exact_source(member_id)
+
+    def add(self, member_id: str, embedding, meta: Dict):
+        """
+        성문 추가 (같은 ID가 있으면 덮어씀)
+
+        Args:
+            member_id: 멤버 ID
+            embedding: 임베딩 벡터 (정규화 전이어도 됨)
+            meta: 이름/관계 등 메타데이터
+        """
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        normalized = self.normalize(vector)
+        self.index.add(member_id, normalized)
+        self._meta[member_id] = meta
+        self._norms[member_id] = float(np.linalg.norm(vector))
+        if self.normalizer is not None:
+            self._cohort_stats[member_id] = self.normalizer.stats(normalized)
+
+    def remove(self, member_id: str) -> Optional[Dict]:
+        """
+        성문 삭제
+
+        Returns:
+            삭제된 메타데이터 (없으면 None)
+        """
+        meta = self._meta.pop(member_id, None)
+        if meta is not None:
+            self.index.remove(member_id)
+            del self._norms[member_id]
+            self._cohort_stats.pop(member_id, None)
+        return meta
+
+    def pop(self, member_id: str) -> Dict:
+        """dict.pop 호환 삭제 (없으면 KeyError)"""
+        meta = self.remove(member_id)
+        if meta is None:
+            raise KeyError(member_id)
+        return meta
+
+    def cohort_stats(self, member_id: str) -> Optional[CohortStats]:
+        """등록 성문의 코호트 점수 통계 (정규화기가 없으면 None)"""
+        return self._cohort_stats.get(member_id)
+
+    def score(self, member_id: str, query: np.ndarray) -> float:
+        """특정 성문과의 코사인 유사도 (양자화 인덱스는 가능하면 원본 기준)"""
+        query = self.normalize(query)
+        exact = self._exact(member_id)
+        if exact is not None:
+            return float(self.normalize(exact) @ query)
+        return float(self.index.vector(member_id) @ query)
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        상위 k개 성문 검색
+
+        Args:
+            query: 질의 임베딩
+            k: 반환할 최대 개수
+
+        Returns:
+            (멤버 ID, 코사인 유사도) 리스트 (유사도 내림차순)
+        """
+        query = self.normalize(query)
+        if not self.rescore or self.exact_source is None or self.index.storage == "float32":
+            return self.index.search(query, k)
+
+        # 양자화 점수로 후보를 넉넉히 고른 뒤 원본 float32 벡터로 다시 채점
+        candidates = self.index.search(query, max(k, self.rescore))
+        rescored = []
+        for member_id, approximate in candidates:
+            exact = self.exact_source(member_id)
+            rescored.append((member_id, float(self.normalize(exact) @ query) if exact is not None else approximate))
+        rescored.sort(key=lambda item: item[1], reverse=True)
+        return rescored[:k]
+
+    def normalize(self, embedding) -> np.ndarray:
+        """float32 L2 정규화"""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"임베딩 차원이 맞지 않습니다 ({vector.shape[0]} != {self.dim})")
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
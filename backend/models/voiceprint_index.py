@@ -0,0 +1,527 @@
+"""
+성문 검색 인덱스 모듈
+정규화된 임베딩에 대한 내적(코사인) 상위 k 검색 - 전수 검색(exact)과 근사 검색(IVF)
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+STORAGE_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+# 양자화 행을 float32로 풀어 점수를 계산할 때 한 번에 처리할 행 수 (임시 버퍼 상한)
+_SCORE_CHUNK_ROWS = 4096
+
+# float16 비트 확장: 부호 비트와 지수/가수 15비트를 float32 위치로 옮긴 뒤 2^112를 곱하면 같은 값
+# (ndarray.astype보다 빠르고 비정규수/0도 정확, inf/nan은 정규화 임베딩에 없으므로 무시)
+_HALF_MASK = np.int32(0x8FFFE000 - (1 << 32))
+_HALF_SCALE = np.float32(2.0 ** 112)
+
+# IVF 학습을 시작할 최소 벡터 수 - 이보다 작은 파티션(가족 단위)은 전수 검색이 더 빠르고 정확함
+IVF_TRAIN_SIZE = 2048
+
+
+def _half_scores(rows: np.ndarray, query: np.ndarray, buffer: np.ndarray) -> np.ndarray:
+    """float16 행과 float32 질의의 내적 (buffer: 행 수 이상의 int32 작업 버퍼)"""
+    bits = buffer[:len(rows)]
+    np.copyto(bits, rows.view(np.int16))  # 부호 확장
+    np.left_shift(bits, 13, out=bits)
+    np.bitwise_and(bits, _HALF_MASK, out=bits)
+    return bits.view(np.float32) @ (query * _HALF_SCALE)
+
+
+class _RowBlock:
+    """
+    ID와 짝지어진 연속 행 블록
+
+    용량이 부족하면 두 배로 늘리고, 삭제 시 마지막 행을 빈 자리로 옮겨 연속성을 유지합니다.
+
+    저장 형식:
+    - float32: 원본 그대로 (행당 dim * 4바이트)
+    - float16: 반정밀도 (행당 dim * 2바이트)
+    - int8: 행별 배율(max|x| / 127)로 대칭 양자화 (행당 dim + 4바이트)
+    """
+
+    def __init__(self, dim: int, initial_capacity: int = 16, storage: str = "float32"):
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"지원하지 않는 저장 형식입니다: {storage}")
+        self.dim = dim
+        self.storage = storage
+        capacity = max(1, initial_capacity)
+        self.matrix = np.zeros((capacity, dim), dtype=STORAGE_DTYPES[storage])
+        self.scales = np.ones(capacity, dtype=np.float32) if storage == "int8" else None
+        self.ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def rows(self) -> np.ndarray:
+        """float32 행 (양자화 형식이면 복원한 복사본)"""
+        return self._dequantize(0, len(self.ids))
+
+    @property
+    def nbytes(self) -> int:
+        """사용 중인 행의 저장 바이트 수"""
+        per_row = self.matrix.itemsize * self.dim + (4 if self.scales is not None else 0)
+        return per_row * len(self.ids)
+
+    def append(self, item_id: str, vector: np.ndarray) -> int:
+        row = len(self.ids)
+        if row == len(self.matrix):
+            grown = np.zeros((len(self.matrix) * 2, self.dim), dtype=self.matrix.dtype)
+            grown[:row] = self.matrix
+            self.matrix = grown
+            if self.scales is not None:
+                self.scales = np.concatenate([self.scales, np.ones(row, dtype=np.float32)])
+        self.ids.append(item_id)
+        self.set(row, vector)
+        return row
+
+    def set(self, row: int, vector: np.ndarray):
+        """행 덮어쓰기 (저장 형식으로 변환)"""
+        if self.scales is None:
+            self.matrix[row] = vector
+            return
+        peak = float(np.max(np.abs(vector)))
+        scale = peak / 127.0 if peak > 0 else 1.0
+        self.matrix[row] = np.clip(np.rint(vector / scale), -127, 127)
+        self.scales[row] = scale
+
+    def vector(self, row: int) -> np.ndarray:
+        """float32 행 (float32 형식이면 뷰, 그 외에는 복원한 복사본)"""
+        if self.storage == "float32":
+            return self.matrix[row]
+        return self._dequantize(row, row + 1)[0]
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """전체 행과 질의의 내적 (양자화 형식은 청크 단위로 풀어서 계산)"""
+        count = len(self.ids)
+        if self.storage == "float32":
+            return self.matrix[:count] @ query
+        scores = np.empty(count, dtype=np.float32)
+        buffer = np.empty((min(count, _SCORE_CHUNK_ROWS), self.dim), dtype=np.int32) if self.storage == "float16" else None
+        for start in range(0, count, _SCORE_CHUNK_ROWS):
+            stop = min(start + _SCORE_CHUNK_ROWS, count)
+            if self.storage == "float16":
+                scores[start:stop] = _half_scores(self.matrix[start:stop], query, buffer)
+            else:
+                scores[start:stop] = self.matrix[start:stop].astype(np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales[:count]
+        return scores
+
+    def _dequantize(self, start: int, stop: int) -> np.ndarray:
+        rows = self.matrix[start:stop]
+        if self.storage == "float32":
+            return rows
+        rows = rows.astype(np.float32)
+        if self.scales is not None:
+            rows *= self.scales[start:stop, None]
+        return rows
+
+    def swap_remove(self, row: int) -> Optional[str]:
+        """행 삭제 후 그 자리로 옮겨진 ID 반환 (마지막 행이었으면 None)"""
+        last = len(self.ids) - 1
+        moved = None
+        if row != last:
+            self.matrix[row] = self.matrix[last]
+            if self.scales is not None:
+                self.scales[row] = self.scales[last]
+            self.ids[row] = self.ids[last]
+            moved = self.ids[row]
+        self.ids.pop()
+        return moved
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 상위 k개 위치 (내림차순)"""
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class VoiceprintIndex:
+    """
+    성문 검색 인덱스 인터페이스
+
+    모든 벡터는 호출자가 L2 정규화하여 전달하며, 점수는 내적(= 코사인 유사도)입니다.
+    저장 형식이 양자화(float16/int8)이면 점수도 양자화된 벡터 기준의 근삿값입니다.
+    """
+
+    storage = "float32"
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, item_id: str) -> bool:
+        raise NotImplementedError
+
+    def add(self, item_id: str, vector: np.ndarray):
+        """벡터 추가 (같은 ID가 있으면 교체)"""
+        raise NotImplementedError
+
+    def remove(self, item_id: str) -> bool:
+        """벡터 삭제 (없으면 False)"""
+        raise NotImplementedError
+
+    def vector(self, item_id: str) -> np.ndarray:
+        """저장된 벡터 (float32, 읽기 전용으로 취급)"""
+        raise NotImplementedError
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """상위 k개 (ID, 점수) - 점수 내림차순"""
+        raise NotImplementedError
+
+    @property
+    def nbytes(self) -> int:
+        """벡터 저장 바이트 수"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        return {"type": type(self).__name__, "size": len(self), "storage": self.storage, "bytes": self.nbytes}
+
+
+class ExactIndex(VoiceprintIndex):
+    """
+    전수 검색 인덱스
+
+    하나의 연속 행렬에 대한 행렬-벡터 곱 한 번과 argpartition으로 정확한 상위 k를 구합니다.
+    """
+
+    def __init__(self, dim: int = 192, storage: str = "float32"):
+        """
+        Args:
+            dim: 임베딩 차원
+            storage: 벡터 저장 형식 ("float32", "float16", "int8")
+        """
+        self.dim = dim
+        self.storage = storage
+        self._block = _RowBlock(dim, storage=storage)
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._block)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def add(self, item_id: str, vector: np.ndarray):
+        row = self._rows.get(item_id)
+        if row is None:
+            self._rows[item_id] = self._block.append(item_id, vector)
+        else:
+            self._block.set(row, vector)
+
+    def remove(self, item_id: str) -> bool:
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+        moved = self._block.swap_remove(row)
+        if moved is not None:
+            self._rows[moved] = row
+        return True
+
+    def vector(self, item_id: str) -> np.ndarray:
+        return self._block.vector(self._rows[item_id])
+
+    @property
+    def nbytes(self) -> int:
+        return self._block.nbytes
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        if not len(self._block) or k <= 0:
+            return []
+        scores = self._block.scores(query)
+        return [(self._block.ids[i], float(scores[i])) for i in _top_k(scores, k)]
+
+
+class IVFIndex(VoiceprintIndex):
+    """
+    역파일(IVF) 근사 검색 인덱스
+
+    구면 k-means로 만든 중심점마다 벡터 목록(연속 행 블록)을 두고,
+    질의와 가장 가까운 nprobe개 목록만 검색합니다. nprobe를 늘리면 재현율이,
+    줄이면 속도가 올라갑니다.
+
+    - 중심점 수는 학습 시점 벡터 수 N에 맞춰 약 √N개 (nlist는 상한)
+    - 학습 전(벡터 수 < train_size)에는 전수 검색으로 동작
+    - 학습 후 추가되는 벡터는 가장 가까운 중심점 목록에 바로 삽입
+    - 학습 시점보다 retrain_factor배 이상 커지면 중심점을 다시 학습
+    - 학습은 요청 경로를 막지 않도록 백그라운드 스레드에서 스냅샷으로 수행하고,
+      그동안의 추가/삭제는 기록해 두었다가 새 목록을 적용할 때 다시 반영
+    """
+
+    def __init__(
+        self,
+        dim: int = 192,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        train_size: Optional[int] = None,
+        retrain_factor: float = 4.0,
+        kmeans_iterations: int = 10,
+        seed: int = 0,
+        storage: str = "float32",
+        background: bool = True
+    ):
+        """
+        Args:
+            dim: 임베딩 차원
+            nlist: 최대 중심점(목록) 수 (실제 수는 min(nlist, √N))
+            nprobe: 질의당 검색할 목록 수 (재현율/지연 시간 조절)
+            train_size: 중심점 학습을 시작할 최소 벡터 수 (기본 IVF_TRAIN_SIZE)
+            retrain_factor: 재학습 기준 배율 (0이면 재학습 안 함)
+            kmeans_iterations: k-means 반복 횟수
+            seed: 학습 표본 추출 시드
+            storage: 목록 벡터 저장 형식 ("float32", "float16", "int8", 중심점은 항상 float32)
+            background: True면 add()가 학습을 백그라운드 스레드로 넘기고 바로 반환
+        """
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size or IVF_TRAIN_SIZE
+        self.retrain_factor = retrain_factor
+        self.kmeans_iterations = kmeans_iterations
+        self._rng = np.random.default_rng(seed)
+        self.storage = storage
+        self.background = background
+
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[_RowBlock] = [_RowBlock(dim, storage=storage)]  # 학습 전에는 단일 목록
+        self._where: Dict[str, Tuple[int, int]] = {}  # ID -> (목록, 행)
+        self._trained_size = 0
+
+        # 백그라운드 학습 상태 (_lock으로 보호)
+        self._lock = threading.RLock()
+        self._trainer: Optional[threading.Thread] = None
+        self._journal: Optional[List[Tuple[str, Optional[np.ndarray]]]] = None  # 학습 중 변경 기록
+        self._built = None  # 학습 완료된 (중심점, 목록, 위치, 학습 크기)
+        self._built_ready = False
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def is_training(self) -> bool:
+        return self._trainer is not None
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._where
+
+    def add(self, item_id: str, vector: np.ndarray):
+        with self._lock:
+            self._install()
+            self._add(item_id, vector)
+            if self._journal is not None:
+                self._journal.append((item_id, np.array(vector, dtype=np.float32)))
+            self._maybe_train()
+
+    def remove(self, item_id: str) -> bool:
+        with self._lock:
+            self._install()
+            removed = self._remove(item_id)
+            if removed and self._journal is not None:
+                self._journal.append((item_id, None))
+            return removed
+
+    def _add(self, item_id: str, vector: np.ndarray):
+        if item_id in self._where:
+            self._remove(item_id)
+        list_no = int(np.argmax(self.centroids @ vector)) if self.is_trained else 0
+        row = self._lists[list_no].append(item_id, vector)
+        self._where[item_id] = (list_no, row)
+
+    def _remove(self, item_id: str) -> bool:
+        location = self._where.pop(item_id, None)
+        if location is None:
+            return False
+        list_no, row = location
+        moved = self._lists[list_no].swap_remove(row)
+        if moved is not None:
+            self._where[moved] = (list_no, row)
+        return True
+
+    def vector(self, item_id: str) -> np.ndarray:
+        list_no, row = self._where[item_id]
+        return self._lists[list_no].vector(row)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.nbytes for block in self._lists)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        with self._lock:
+            self._install()
+            if not len(self) or k <= 0:
+                return []
+
+            if self.is_trained:
+                probe = _top_k(self.centroids @ query, min(self.nprobe, len(self.centroids)))
+            else:
+                probe = [0]
+
+            ids: List[str] = []
+            parts = []
+            for list_no in probe:
+                block = self._lists[list_no]
+                if len(block):
+                    parts.append(block.scores(query))
+                    ids.extend(block.ids)
+        if not parts:
+            return []
+
+        scores = np.concatenate(parts)
+        return [(ids[i], float(scores[i])) for i in _top_k(scores, k)]
+
+    def train(self):
+        """현재 벡터로 중심점 학습 후 전체 재배치 (동기 실행)"""
+        with self._lock:
+            ids, vectors = self._snapshot()
+        if not ids:
+            return
+        built = self._build(ids, vectors)
+        with self._lock:
+            self._apply(built)
+            if self._journal is not None:
+                # 진행 중인 백그라운드 학습은 이 스냅샷 이후 변경만 다시 반영하도록 기록을 비움
+                self._journal = []
+
+    def wait_for_training(self, timeout: Optional[float] = None) -> bool:
+        """진행 중인 백그라운드 학습이 끝날 때까지 대기 후 적용 (학습 상태 반환)"""
+        trainer = self._trainer
+        if trainer is not None:
+            trainer.join(timeout)
+        with self._lock:
+            self._install()
+        return self.is_trained
+
+    def _needs_training(self) -> bool:
+        if not self.is_trained:
+            return len(self) >= self.train_size
+        return bool(self.retrain_factor) and len(self) >= self._trained_size * self.retrain_factor
+
+    def _maybe_train(self):
+        """학습 조건을 만족하면 학습 시작 (호출자가 _lock 보유)"""
+        if self._trainer is not None or not self._needs_training():
+            return
+        if not self.background:
+            self._apply(self._build(*self._snapshot()))
+            return
+        ids, vectors = self._snapshot()
+        self._journal = []
+        self._trainer = threading.Thread(
+            target=self._train_background, args=(ids, vectors), name="ivf-train", daemon=True
+        )
+        self._trainer.start()
+
+    def _train_background(self, ids: List[str], vectors: np.ndarray):
+        try:
+            built = self._build(ids, vectors)
+        except Exception as e:
+            print(f"[IVFIndex] 중심점 학습 실패: {e}")
+            built = None
+        with self._lock:
+            self._built = built
+            self._built_ready = True
+
+    def _install(self):
+        """백그라운드 학습 결과 적용 후 학습 중 변경 재반영 (호출자가 _lock 보유)"""
+        if not self._built_ready:
+            return
+        built, journal = self._built, self._journal or []
+        self._built, self._built_ready, self._journal, self._trainer = None, False, None, None
+        if built is None:
+            return
+        self._apply(built)
+        for item_id, vector in journal:
+            if vector is None:
+                self._remove(item_id)
+            else:
+                self._add(item_id, vector)
+
+    def _snapshot(self) -> Tuple[List[str], np.ndarray]:
+        """현재 ID와 float32 벡터 복사본"""
+        ids: List[str] = []
+        blocks = []
+        for block in self._lists:
+            if len(block):
+                ids.extend(block.ids)
+                blocks.append(block.rows)
+        # concatenate가 항상 새 배열을 만들므로 학습 스레드는 목록 행렬과 메모리를 공유하지 않음
+        vectors = np.concatenate(blocks) if blocks else np.zeros((0, self.dim), dtype=np.float32)
+        return ids, vectors
+
+    def _apply(self, built):
+        self.centroids, self._lists, self._where, self._trained_size = built
+        print(f"[IVFIndex] 중심점 {len(self.centroids)}개 학습 완료 (벡터 {self._trained_size}개)")
+
+    def _build(self, ids: List[str], vectors: np.ndarray):
+        """스냅샷으로 중심점 학습 및 목록 구성 (인덱스 상태는 바꾸지 않음)"""
+        nlist = min(self.nlist, max(1, int(round(np.sqrt(len(vectors))))))
+
+        # 학습 표본은 목록당 최대 64개로 제한 (학습 비용 상한)
+        sample_size = min(len(vectors), nlist * 64)
+        sample = vectors[self._rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[self._rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assign, kind="stable")
+            present, starts = np.unique(assign[order], return_index=True)
+            sums = np.zeros_like(centroids)
+            sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # 비어 있는 목록은 기존 중심점 유지
+            centroids = np.where(empty[:, None], centroids, sums / np.maximum(norms, 1e-12))
+
+        centroids = centroids.astype(np.float32)
+        lists = [_RowBlock(self.dim, storage=self.storage) for _ in range(nlist)]
+        where: Dict[str, Tuple[int, int]] = {}
+
+        # 배치 단위로 재배치 (메모리 상한)
+        for start in range(0, len(vectors), 65536):
+            chunk = vectors[start:start + 65536]
+            assign = np.argmax(chunk @ centroids.T, axis=1)
+            for offset, list_no in enumerate(assign):
+                item_id = ids[start + offset]
+                where[item_id] = (int(list_no), lists[list_no].append(item_id, chunk[offset]))
+
+        return centroids, lists, where, len(vectors)
+
+    def stats(self) -> Dict:
+        sizes = [len(block) for block in self._lists]
+        return {
+            "type": type(self).__name__,
+            "size": len(self),
+            "storage": self.storage,
+            "bytes": self.nbytes,
+            "trained": self.is_trained,
+            "training": self.is_training,
+            "nlist": len(self._lists),
+            "nprobe": self.nprobe,
+            "train_size": self.train_size,
+            "largest_list": max(sizes) if sizes else 0
+        }
+
+
+def create_voiceprint_index(dim: int = 192) -> VoiceprintIndex:
+    """설정값으로 성문 검색 인덱스 생성"""
+    from config import settings
+    if settings.VOICEPRINT_INDEX == "ivf":
+        return IVFIndex(
+            dim=dim,
+            nlist=settings.VOICEPRINT_IVF_NLIST,
+            nprobe=settings.VOICEPRINT_IVF_NPROBE,
+            train_size=settings.VOICEPRINT_IVF_TRAIN_SIZE,
+            storage=settings.VOICEPRINT_STORAGE
+        )
+    return ExactIndex(dim=dim, storage=settings.VOICEPRINT_STORAGE)
@@ -0,0 +1,181 @@
+"""
+가족(테넌트)별 성문 파티션 모듈
+가족마다 독립된 성문 갤러리를 두어 검색 비용이 가족 규모에만 비례하도록 관리
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .embedding_store import EmbeddingStore
+from .score_normalizer import CohortScoreNormalizer
+from .voiceprint_gallery import VoiceprintGallery
+from .voiceprint_index import ExactIndex, VoiceprintIndex
+
+DEFAULT_FAMILY_ID = "default"
+FAMILY_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+
+class VoiceprintPartitions:
+    """
+    가족별 성문 갤러리 관리자
+
+    - 가족 ID마다 자체 임베딩 블록(갤러리)을 보유하여 검색은 해당 가족의 벡터만 조회
+    - 파티션은 처음 조회될 때 저장소에서 적재하고, 상주 수가 상한을 넘으면 가장 오래 쓰이지 않은 파티션을 내림
+    - 변경은 put/remove로 저장소에 바로 기록하므로 내린 파티션은 언제든 다시 적재 가능
+      (비동기 경로는 put_async/remove_async - 저장소 기록과 fsync를 작업 스레드에서 실행)
+    - 기본 파티션(DEFAULT_FAMILY_ID)은 내리지 않음
+    """
+
+    def __init__(
+        self,
+        dim: int = 192,
+        index_factory: Optional[Callable[[], VoiceprintIndex]] = None,
+        store: Optional[EmbeddingStore] = None,
+        max_resident: int = 1000,
+        rescore: int = 0,
+        normalizer: Optional[CohortScoreNormalizer] = None
+    ):
+        """
+        Args:
+            dim: 임베딩 차원
+            index_factory: 파티션별 검색 인덱스 생성 함수 (없으면 전수 검색)
+            store: 영속 저장소 (없으면 메모리에만 보관하며 내리지 않음)
+            max_resident: 메모리에 상주시킬 최대 파티션 수
+            rescore: 양자화 인덱스 검색 시 저장소의 float32 원본으로 다시 채점할 상위 후보 수
+            normalizer: 코호트 점수 정규화기 (파티션 적재 시 성문별 코호트 통계 계산)
+        """
+        self.dim = dim
+        self.index_factory = index_factory or (lambda: ExactIndex(dim))
+        self.store = store
+        self.max_resident = max_resident
+        self.rescore = rescore
+        self.normalizer = normalizer
+        self._resident: "OrderedDict[str, VoiceprintGallery]" = OrderedDict()
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, family_id: Optional[str] = None, create: bool = False) -> Optional[VoiceprintGallery]:
+        """
+        가족 파티션 조회 (상주하지 않으면 저장소에서 적재)
+
+        Args:
+            family_id: 가족 ID (None이면 기본 파티션)
+            create: 없을 때 빈 파티션 생성 여부
+
+        Returns:
+            성문 갤러리 (없고 create=False면 None)
+        """
+        family_id = family_id or DEFAULT_FAMILY_ID
+        gallery = self._resident.get(family_id)
+        if gallery is not None:
+            self._resident.move_to_end(family_id)
+            return gallery
+
+        gallery = self._new_gallery(family_id)
+        entries = self.store.load_family(family_id) if self.store is not None else []
+        for member_id, embedding, meta in entries:
+            gallery.add(member_id, embedding, meta)
+        if entries:
+            self.loads += 1
+        elif not create:
+            return None
+
+        self._resident[family_id] = gallery
+        self._evict_overflow()
+        return gallery
+
+    def put(self, family_id: Optional[str], member_id: str, embedding: np.ndarray, meta: Dict):
+        """
+        성문 등록/갱신 (저장소에 먼저 기록한 뒤 파티션 반영)
+
+        Raises:
+            ValueError: 저장소가 받을 수 없는 ID (파티션도 변경하지 않음)
+        """
+        family_id = family_id or DEFAULT_FAMILY_ID
+        if self.store is not None:
+            self.store.put(family_id, member_id, embedding, meta)
+        self.get(family_id, create=True).add(member_id, embedding, meta)
+
+    async def put_async(self, family_id: Optional[str], member_id: str, embedding: np.ndarray, meta: Dict):
+        """
+        put의 비동기 버전 (저장소 기록은 작업 스레드에서, 파티션 반영은 이벤트 루프에서)
+
+        Raises:
+            ValueError: 저장소가 받을 수 없는 ID (파티션도 변경하지 않음)
+        """
+        family_id = family_id or DEFAULT_FAMILY_ID
+        if self.store is not None:
+            await asyncio.to_thread(self.store.put, family_id, member_id, embedding, meta)
+        self.get(family_id, create=True).add(member_id, embedding, meta)
+
+    def remove(self, family_id: Optional[str], member_id: str) -> Optional[Dict]:
+        """
+        성문 삭제
+
+        Returns:
+            삭제된 메타데이터 (없으면 None)
+        """
+        family_id = family_id or DEFAULT_FAMILY_ID
+        gallery = self.get(family_id)
+        meta = gallery.remove(member_id) if gallery is not None else None
+        if meta is not None and self.store is not None:
+            self.store.delete(family_id, member_id)
+        return meta
+
+    async def remove_async(self, family_id: Optional[str], member_id: str) -> Optional[Dict]:
+        """remove의 비동기 버전 (저장소 기록은 작업 스레드에서 실행)"""
+        family_id = family_id or DEFAULT_FAMILY_ID
+        gallery = self.get(family_id)
+        meta = gallery.remove(member_id) if gallery is not None else None
+        if meta is not None and self.store is not None:
+            await asyncio.to_thread(self.store.delete, family_id, member_id)
+        return meta
+
+    def evict(self, family_id: str) -> bool:
+        """파티션을 메모리에서 내림 (저장소가 없으면 데이터 보존을 위해 거부)"""
+        if self.store is None or family_id not in self._resident:
+            return False
+        del self._resident[family_id]
+        self.evictions += 1
+        return True
+
+    def _evict_overflow(self):
+        if self.store is None:
+            return
+        for family_id in list(self._resident):
+            if len(self._resident) <= self.max_resident:
+                return
+            if family_id != DEFAULT_FAMILY_ID:
+                self.evict(family_id)
+
+    def _new_gallery(self, family_id: str) -> VoiceprintGallery:
+        exact_source = None
+        if self.store is not None:
+            exact_source = lambda member_id: self.store.get(family_id, member_id)
+        return VoiceprintGallery(
+            dim=self.dim,
+            index=self.index_factory(),
+            exact_source=exact_source,
+            rescore=self.rescore,
+            normalizer=self.normalizer
+        )
+
+    def resident_family_ids(self) -> List[str]:
+        return list(self._resident)
+
+    def stats(self) -> Dict:
+        """파티션 통계"""
+        sizes = [len(gallery) for gallery in self._resident.values()]
+        return {
+            "resident": len(sizes),
+            "max_resident": self.max_resident,
+            "resident_members": sum(sizes),
+            "largest_partition": max(sizes) if sizes else 0,
+            "vector_bytes": sum(gallery.index.nbytes for gallery in self._resident.values()),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "store": self.store.stats() if self.store is not None else None
+        }
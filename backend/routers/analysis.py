@@ -4,16 +4,31 @@
 HuggingFace Inference API 연동
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+import asyncio
+import json
 import time
 
+from config import settings
 from models.deepfake_detector import get_detector
 from models.speaker_verifier import get_verifier
+from models.analysis_pipeline import AnalysisTimeoutError, StageTimer, get_pipeline
+from models.job_queue import JobQueueFullError, get_job_queue
+from models.stream_analyzer import create_stream_analyzer
+from models.voiceprint_partitions import FAMILY_ID_PATTERN
+from utils.outbound_audio import get_outbound_encoder
+from utils.upload_ingest import (
+    IngestedAudio, UnsupportedAudioError, UploadRejectedError, ingest_upload
+)
 
 router = APIRouter()
 
+# 가족(테넌트) ID - 성문 대조 범위 (없으면 기본 파티션)
+FamilyId = Query(None, pattern=FAMILY_ID_PATTERN, description="가족 ID")
+
 
 class AnalysisResult(BaseModel):
     deepfake_probability: float
@@ -24,16 +39,69 @@ class AnalysisResult(BaseModel):
     audio_duration: float
     analysis_time: float
     analysis_mode: str  # 'api' 또는 'mock'
+    timings: Dict[str, float] = {}  # 단계별 소요 시간 (초): upload_read, encode, detect, verify, scoring
+    outbound: Optional[Dict] = None  # 원격 전송 페이로드 (encoded, original_bytes, payload_bytes, saved_bytes)
+    settled_by: Optional[str] = None  # 딥페이크 판정 주체: 'local' (사전 판정으로 확정), 'remote' (원격 모델)
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str  # 'queued', 'running', 'retrying', 'completed', 'failed'
+    filename: Optional[str] = None
+    attempts: int
+    created_at: str
+    finished_at: Optional[str] = None
+    result: Optional[AnalysisResult] = None
+    error: Optional[str] = None
 
 
 class QuickAnalysisResult(BaseModel):
     deepfake_probability: float
     is_suspicious: bool
     analysis_mode: str
+    settled_by: Optional[str] = None  # 'local' 또는 'remote' (목업 모드에서는 None)
+
+
+ALLOWED_CONTENT_TYPES = [
+    'audio/mpeg', 'audio/wav', 'audio/x-wav',
+    'audio/mp4', 'audio/ogg', 'audio/webm',
+    'audio/x-m4a', 'audio/flac'
+]
+VALID_EXTENSIONS = ['.mp3', '.wav', '.m4a', '.ogg', '.webm', '.flac']
+
+
+def _is_allowed_audio(file: UploadFile) -> bool:
+    """content_type 또는 확장자로 지원 형식 여부 판단 (content_type이 None이면 허용)"""
+    if not file.content_type or file.content_type in ALLOWED_CONTENT_TYPES:
+        return True
+    filename = (file.filename or "").lower()
+    return any(filename.endswith(ext) for ext in VALID_EXTENSIONS)
+
+
+def _audio_duration(duration: Optional[float], file_size: int) -> float:
+    """헤더상의 재생 길이 (헤더로 알 수 없는 형식은 16kHz 16bit 기준 추정값)"""
+    return round(duration if duration is not None else file_size / 32000, 2)
+
+
+def _build_result(result: Dict, audio_duration: float, analysis_time: float) -> AnalysisResult:
+    """파이프라인 결과를 응답 모델로 변환"""
+    return AnalysisResult(
+        deepfake_probability=round(result["deepfake_probability"], 1),
+        voiceprint_match=round(result["voiceprint_match"], 1),
+        matched_person=result["matched_person"],
+        risk_level=result["risk_level"],
+        recommendations=result["recommendations"],
+        audio_duration=audio_duration,
+        analysis_time=round(analysis_time, 2),
+        analysis_mode=result["analysis_mode"],
+        timings=result["timings"],
+        outbound=result.get("outbound"),
+        settled_by=result.get("settled_by")
+    )
 
 
 @router.post("/", response_model=AnalysisResult)
-async def analyze_audio(file: UploadFile = File(...)):
+async def analyze_audio(file: UploadFile = File(...), family_id: Optional[str] = FamilyId):
     """
     음성 파일 분석 - 딥페이크 탐지 + 성문 대조
 
@@ -41,81 +109,236 @@ async def analyze_audio(file: UploadFile = File(...)):
     API 토큰이 없는 경우 목업 모드로 동작합니다.
     """
     # 파일 형식 검증
-    allowed_types = [
-        'audio/mpeg', 'audio/wav', 'audio/x-wav',
-        'audio/mp4', 'audio/ogg', 'audio/webm',
-        'audio/x-m4a', 'audio/flac'
-    ]
-
-    # content_type이 None인 경우도 허용 (파일 확장자로 판단)
-    if file.content_type and file.content_type not in allowed_types:
-        # 확장자 체크
-        filename = file.filename or ""
-        valid_extensions = ['.mp3', '.wav', '.m4a', '.ogg', '.webm', '.flac']
-        if not any(filename.lower().endswith(ext) for ext in valid_extensions):
-            raise HTTPException(status_code=400, detail="지원하지 않는 오디오 형식입니다")
-
-    # 파일 읽기
-    start_time = time.time()
-    content = await file.read()
-    file_size = len(content)
+    if not _is_allowed_audio(file):
+        raise HTTPException(status_code=400, detail="지원하지 않는 오디오 형식입니다")
 
-    # AI 모델 인스턴스 가져오기
-    detector = get_detector()
-    verifier = get_verifier()
+    # 파일 수신 (청크 단위, 크기 제한 및 해시 계산)
+    start_time = time.time()
+    read_start = time.perf_counter()
+    upload = await ingest_upload(file, decode=True)
+    content = upload.read()
+    audio_duration = _audio_duration(upload.duration, upload.size)
+    upload.close()
+    timer = StageTimer({"upload_read": round(time.perf_counter() - read_start, 4)})
 
-    # 딥페이크 탐지 (HuggingFace API 또는 목업)
-    deepfake_result = await detector.detect(audio_bytes=content)
-
-    # 화자 검증 (HuggingFace API 또는 목업)
-    voiceprint_result = await verifier.verify(audio_bytes=content)
-
-    # 결과 추출
-    deepfake_prob = deepfake_result.get("probability", 50.0)
-    voiceprint_match = voiceprint_result.get("similarity", 0.0)
-    matched_person = voiceprint_result.get("matched_member")
-
-    # 분석 모드 확인
-    deepfake_mode = deepfake_result.get("status", "mock")
-    voiceprint_mode = voiceprint_result.get("mode", "mock")
-    analysis_mode = "api" if deepfake_mode == "success" or voiceprint_mode == "api" else "mock"
-
-    # 위험도 판정
-    if deepfake_prob > 70 or voiceprint_match < 30:
-        risk_level = "high"
-        recommendations = [
-            "⚠️ 본인에게 영상통화로 직접 확인하세요",
-            "🚨 경찰청 112에 신고하세요",
-            "💰 절대 송금하지 마세요"
-        ]
-    elif deepfake_prob > 40 or voiceprint_match < 60:
-        risk_level = "medium"
-        recommendations = [
-            "📞 추가 확인이 필요합니다",
-            "👤 본인에게 직접 연락하여 확인하세요"
-        ]
-    else:
-        risk_level = "low"
-        recommendations = [
-            "✅ 정상적인 음성으로 판단됩니다",
-            "💡 그래도 의심되면 직접 확인하세요"
-        ]
+    # 딥페이크 탐지 + 화자 검증 동시 실행 (HuggingFace API 또는 목업)
+    pipeline = get_pipeline()
+    try:
+        result = await pipeline.run(
+            content, timer=timer, digest=upload.digest, family_id=family_id, decoded=upload.decoded
+        )
+    except AnalysisTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
 
     # 분석 시간 계산
     analysis_time = time.time() - start_time
 
-    return AnalysisResult(
-        deepfake_probability=round(deepfake_prob, 1),
-        voiceprint_match=round(voiceprint_match, 1),
-        matched_person=matched_person,
-        risk_level=risk_level,
-        recommendations=recommendations,
-        audio_duration=round(file_size / 32000, 2),  # 추정값 (16kHz, 16bit)
-        analysis_time=round(analysis_time, 2),
-        analysis_mode=analysis_mode
+    return _build_result(result, audio_duration, analysis_time)
+
+
+@router.post("/batch")
+async def analyze_batch(files: List[UploadFile] = File(...), family_id: Optional[str] = FamilyId):
+    """
+    일괄 분석 - 여러 음성 파일을 동시 처리
+
+    동시 실행 수를 BATCH_CONCURRENCY로 제한하여 원격 엔드포인트 과부하를 막고,
+    파일별 결과를 완료되는 순서대로 NDJSON(한 줄에 하나의 JSON)으로 스트리밍합니다.
+    각 줄에는 업로드 순서(index)가 포함되며, 마지막 줄은 요약(type=summary)입니다.
+    """
+    if len(files) > settings.BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 최대 {settings.BATCH_MAX_FILES}개 파일까지 분석할 수 있습니다"
+        )
+
+    # 요청이 끝나면 업로드 파일이 닫히므로 스트리밍 전에 모두 수신
+    uploads = []
+    for file in files:
+        if not _is_allowed_audio(file):
+            uploads.append(UnsupportedAudioError("지원하지 않는 오디오 형식입니다"))
+            continue
+        try:
+            uploads.append(await ingest_upload(file, decode=True))
+        except UploadRejectedError as e:
+            uploads.append(e)
+
+    pipeline = get_pipeline()
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def analyze_one(index: int, file: UploadFile, upload) -> Dict:
+        item = {"type": "result", "index": index, "filename": file.filename}
+
+        if isinstance(upload, UploadRejectedError):
+            item.update(status="error", status_code=upload.status_code, error=upload.message)
+            return item
+
+        async with semaphore:
+            start_time = time.time()
+            try:
+                content = upload.read()
+                result = await pipeline.run(
+                    content, digest=upload.digest, family_id=family_id, decoded=upload.decoded
+                )
+            except AnalysisTimeoutError as e:
+                item.update(status="error", status_code=504, error=str(e))
+                return item
+            except Exception as e:
+                print(f"[Batch] 분석 실패 ({file.filename}): {e}")
+                item.update(status="error", status_code=500, error="분석 중 오류가 발생했습니다")
+                return item
+            finally:
+                upload.close()
+
+        audio_duration = _audio_duration(upload.duration, upload.size)
+        analysis = _build_result(result, audio_duration, time.time() - start_time)
+        item.update(status="ok", result=analysis.model_dump())
+        return item
+
+    async def stream():
+        batch_start = time.time()
+        tasks = [
+            asyncio.ensure_future(analyze_one(i, file, upload))
+            for i, (file, upload) in enumerate(zip(files, uploads))
+        ]
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                succeeded += item["status"] == "ok"
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+
+            yield json.dumps({
+                "type": "summary",
+                "total": len(tasks),
+                "succeeded": succeeded,
+                "failed": len(tasks) - succeeded,
+                "elapsed": round(time.time() - batch_start, 2)
+            }, ensure_ascii=False) + "\n"
+        finally:
+            # 클라이언트 연결 종료 시 남은 분석 취소
+            for task in tasks:
+                task.cancel()
+            for upload in uploads:
+                if isinstance(upload, IngestedAudio):
+                    upload.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _job_status(job: Dict) -> JobStatus:
+    """작업 정보를 응답 모델로 변환"""
+    result = None
+    if job["result"] is not None:
+        audio_duration = _audio_duration(job["audio_duration"], job["file_size"])
+        result = _build_result(job["result"], audio_duration, job["analysis_time"])
+
+    return JobStatus(
+        job_id=job["id"],
+        status=job["status"],
+        filename=job["filename"],
+        attempts=job["attempts"],
+        created_at=job["created_at"],
+        finished_at=job["finished_at"],
+        result=result,
+        error=job["error"]
     )
 
 
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_analysis_job(file: UploadFile = File(...), family_id: Optional[str] = FamilyId):
+    """
+    비동기 분석 작업 제출
+
+    업로드를 대기열에 넣고 즉시 작업 ID를 반환합니다.
+    결과는 GET /api/analyze/jobs/{job_id}로 조회합니다.
+    """
+    if not _is_allowed_audio(file):
+        raise HTTPException(status_code=400, detail="지원하지 않는 오디오 형식입니다")
+
+    upload = await ingest_upload(file, decode=True)
+    content = upload.read()
+    upload.close()
+
+    try:
+        job = get_job_queue().submit(
+            content, digest=upload.digest, filename=file.filename, family_id=family_id,
+            audio_duration=upload.duration, decoded=upload.decoded
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(int(settings.JOB_RETRY_DELAY))}
+        )
+
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_analysis_job(job_id: str):
+    """분석 작업 상태 및 결과 조회"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없거나 만료되었습니다")
+    return _job_status(job)
+
+
+def _is_end_message(text: Optional[str]) -> bool:
+    """스트림 종료 제어 메시지({"type": "end"}) 여부 (JSON이 아니면 무시)"""
+    if not text:
+        return False
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(message, dict) and message.get("type") == "end"
+
+
+@router.websocket("/stream")
+async def analyze_stream(websocket: WebSocket, family_id: Optional[str] = FamilyId):
+    """
+    실시간 통화 음성 분석 (WebSocket)
+
+    클라이언트는 16kHz 모노 16bit little-endian PCM을 바이너리 프레임으로 전송합니다.
+    겹치는 윈도우 단위로 딥페이크 탐지 + 성문 대조를 수행하고,
+    윈도우마다 롤링 위험도를 담은 JSON 업데이트(type=update)를 보냅니다.
+    텍스트 메시지 {"type": "end"}를 보내면 남은 구간을 분석한 뒤 요약(type=summary)을 보내고 종료합니다.
+    """
+    await websocket.accept()
+    analyzer = create_stream_analyzer(family_id)
+    worker = asyncio.create_task(analyzer.run(websocket.send_json))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            frame = message.get("bytes")
+            if frame is not None:
+                if len(frame) > settings.STREAM_MAX_FRAME_BYTES:
+                    await websocket.close(code=1009, reason="frame too large")
+                    return
+                analyzer.feed(frame)
+                continue
+
+            if _is_end_message(message.get("text")):
+                break
+
+        analyzer.flush()
+        await analyzer.close()
+        await worker
+        await websocket.send_json(analyzer.summary())
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if not worker.done():
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+
+
 @router.post("/quick", response_model=QuickAnalysisResult)
 async def quick_analysis(file: UploadFile = File(...)):
     """
@@ -123,13 +346,21 @@ async def quick_analysis(file: UploadFile = File(...)):
 
     성문 대조 없이 딥페이크 여부만 빠르게 확인합니다.
     """
-    content = await file.read()
+    if not _is_allowed_audio(file):
+        raise HTTPException(status_code=400, detail="지원하지 않는 오디오 형식입니다")
+
+    upload = await ingest_upload(file, decode=True)
+    content = upload.read()
+    upload.close()
 
     # AI 모델 인스턴스 가져오기
     detector = get_detector()
 
-    # 딥페이크 탐지
-    result = await detector.detect(audio_bytes=content)
+    # 딥페이크 탐지 (수신 중 디코딩한 샘플 재사용)
+    audio_data, sample_rate = upload.decoded or (None, settings.SAMPLE_RATE)
+    result = await detector.detect(
+        audio_data=audio_data, audio_bytes=content, sample_rate=sample_rate, audio_digest=upload.digest
+    )
 
     deepfake_prob = result.get("probability", 50.0)
     analysis_mode = result.get("status", "mock")
@@ -137,7 +368,8 @@ async def quick_analysis(file: UploadFile = File(...)):
     return QuickAnalysisResult(
         deepfake_probability=round(deepfake_prob, 1),
         is_suspicious=deepfake_prob > 50,
-        analysis_mode="api" if analysis_mode == "success" else "mock"
+        analysis_mode="api" if analysis_mode == "success" else "mock",
+        settled_by=result.get("settled_by")
     )
 
 
@@ -161,6 +393,20 @@ async def get_analysis_status():
             "mode": "api" if not verifier._prototype_mode else "mock",
             "model": verifier.SPEAKER_MODEL,
             "is_loaded": verifier.is_loaded,
-            "registered_members": len(verifier.voiceprints)
+            "registered_members": len(verifier.voiceprints),
+            "index": verifier.voiceprints.index.stats(),
+            "partitions": verifier.partitions.stats(),
+            "score_normalization": verifier.normalizer.mode if verifier.normalizer is not None else None
+        },
+        "cascade": detector.cascade_stats(),
+        "outbound": get_outbound_encoder().stats(),
+        "jobs": get_job_queue().stats(),
+        "cache": {
+            "deepfake": detector.cache.stats() if detector.cache else None,
+            "speaker_embedding": verifier.cache.stats() if verifier.cache else None
+        },
+        "single_flight": {
+            "deepfake": detector.inflight.stats(),
+            "speaker_embedding": verifier.inflight.stats()
         }
     }
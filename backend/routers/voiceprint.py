@@ -2,33 +2,20 @@
 성문(Voiceprint) 등록 및 관리 API 라우터
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
 import uuid
 
+from config import settings
+from models.speaker_verifier import get_verifier
+from models.voiceprint_partitions import FAMILY_ID_PATTERN
+from utils.upload_ingest import ingest_upload
+
 router = APIRouter()
 
-# 인메모리 저장소 (실제로는 DB 사용)
-voiceprints_db = {
-    "1": {
-        "id": "1",
-        "name": "아들 (민준)",
-        "relationship": "아들",
-        "sample_count": 3,
-        "created_at": "2025-01-10T10:00:00",
-        "updated_at": "2025-01-15T14:30:00"
-    },
-    "2": {
-        "id": "2",
-        "name": "딸 (수진)",
-        "relationship": "딸",
-        "sample_count": 2,
-        "created_at": "2025-01-12T11:00:00",
-        "updated_at": "2025-01-12T11:00:00"
-    }
-}
+# 가족(테넌트) ID - 성문 관리 범위 (없으면 기본 파티션)
+FamilyId = Query(None, pattern=FAMILY_ID_PATTERN, description="가족 ID")
 
 
 class VoiceprintCreate(BaseModel):
@@ -45,74 +32,160 @@ class VoiceprintResponse(BaseModel):
     updated_at: str
 
 
+class VoiceprintEnrollResponse(VoiceprintResponse):
+    failed_samples: List[int] = []  # 임베딩 추출에 실패해 제외된 샘플 순번 (업로드 순서, 0부터)
+    enrollment_time: float  # 샘플 임베딩 추출 소요 시간 (초)
+
+
+def _to_response(member: Dict) -> VoiceprintResponse:
+    """화자 검증기 멤버 정보를 응답 모델로 변환"""
+    return VoiceprintResponse(
+        id=member["id"],
+        name=member["name"],
+        relationship=member["relation"],
+        sample_count=member["sample_count"],
+        created_at=member["registered_at"],
+        updated_at=member.get("updated_at", member["registered_at"])
+    )
+
+
 @router.get("/list", response_model=List[VoiceprintResponse])
-async def list_voiceprints():
+async def list_voiceprints(family_id: Optional[str] = FamilyId):
     """등록된 성문 목록 조회"""
-    return list(voiceprints_db.values())
+    return [_to_response(member) for member in get_verifier().get_registered_members(family_id)]
 
 
 @router.post("/register", response_model=VoiceprintResponse)
-async def register_voiceprint(data: VoiceprintCreate):
-    """새 성문 등록"""
+async def register_voiceprint(data: VoiceprintCreate, family_id: Optional[str] = FamilyId):
+    """새 성문 등록 (음성 샘플은 /{voiceprint_id}/sample로 한 개씩 추가하거나 /enroll로 한 번에 등록)"""
     new_id = str(uuid.uuid4())[:8]
-    now = datetime.now().isoformat()
-
-    voiceprint = {
-        "id": new_id,
-        "name": data.name,
-        "relationship": data.relationship,
-        "sample_count": 0,
-        "created_at": now,
-        "updated_at": now
-    }
-
-    voiceprints_db[new_id] = voiceprint
-    return voiceprint
+    member = await get_verifier().create_member(new_id, data.name, data.relationship, family_id=family_id)
+    return _to_response(member)
+
+
+@router.post("/enroll", response_model=VoiceprintEnrollResponse)
+async def enroll_voiceprint(
+    name: str = Form(...),
+    relationship: str = Form(...),
+    files: List[UploadFile] = File(...),
+    family_id: Optional[str] = FamilyId
+):
+    """
+    여러 음성 샘플로 새 성문 등록
+
+    샘플 임베딩은 동시에 추출하며, 일부 샘플이 실패하면 성공한 샘플만으로 등록하고
+    실패한 샘플 순번을 failed_samples로 알려줍니다. 모든 샘플이 실패하면 등록하지 않습니다.
+    """
+    if len(files) > settings.VOICEPRINT_ENROLL_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 최대 {settings.VOICEPRINT_ENROLL_MAX_FILES}개 샘플까지 등록할 수 있습니다"
+        )
+
+    samples, decoded = [], []
+    for file in files:
+        upload = await ingest_upload(file, decode=True)
+        samples.append(upload.read())
+        decoded.append(upload.decoded)
+        upload.close()
+
+    verifier = get_verifier()
+    new_id = str(uuid.uuid4())[:8]
+    result = await verifier.register_voiceprint(
+        new_id, name, relationship, samples, family_id=family_id, decoded=decoded
+    )
+    if not result["success"]:
+        if result.get("status") == "loading":
+            raise HTTPException(
+                status_code=503,
+                detail=result["error"],
+                headers={"Retry-After": str(max(1, int(result["estimated_time"])))}
+            )
+        raise HTTPException(status_code=422, detail=result["error"])
+
+    member = verifier.partitions.get(family_id)[new_id]
+    return VoiceprintEnrollResponse(
+        **_to_response(member).model_dump(),
+        failed_samples=result["failed_samples"],
+        enrollment_time=result["enrollment_time"]
+    )
 
 
 @router.post("/{voiceprint_id}/sample")
-async def add_voice_sample(voiceprint_id: str, file: UploadFile = File(...)):
-    """성문에 음성 샘플 추가"""
-    if voiceprint_id not in voiceprints_db:
+async def add_voice_sample(
+    voiceprint_id: str,
+    file: UploadFile = File(...),
+    family_id: Optional[str] = FamilyId
+):
+    """성문에 음성 샘플 추가 (임베딩 1회 추출 후 누적 평균 갱신)"""
+    verifier = get_verifier()
+    gallery = verifier.partitions.get(family_id)
+    if gallery is None or voiceprint_id not in gallery:
         raise HTTPException(status_code=404, detail="성문을 찾을 수 없습니다")
 
-    # 파일 처리 (실제로는 특징 벡터 추출)
-    content = await file.read()
-
-    voiceprints_db[voiceprint_id]["sample_count"] += 1
-    voiceprints_db[voiceprint_id]["updated_at"] = datetime.now().isoformat()
+    upload = await ingest_upload(file, decode=True)
+    content = upload.read()
+    upload.close()
+
+    result = await verifier.add_sample(
+        voiceprint_id, content, family_id=family_id, audio_digest=upload.digest, decoded=upload.decoded
+    )
+    if not result["success"]:
+        if result.get("status") == "loading":
+            raise HTTPException(
+                status_code=503,
+                detail=result["error"],
+                headers={"Retry-After": str(max(1, int(result["estimated_time"])))}
+            )
+        raise HTTPException(status_code=422, detail=result["error"])
 
     return {
         "message": "음성 샘플이 추가되었습니다",
-        "sample_count": voiceprints_db[voiceprint_id]["sample_count"]
+        "sample_count": result["sample_count"],
+        "sample_weight": result["sample_weight"]
     }
 
 
 @router.delete("/{voiceprint_id}")
-async def delete_voiceprint(voiceprint_id: str):
+async def delete_voiceprint(voiceprint_id: str, family_id: Optional[str] = FamilyId):
     """성문 삭제"""
-    if voiceprint_id not in voiceprints_db:
+    result = await get_verifier().delete_voiceprint(voiceprint_id, family_id=family_id)
+    if not result["success"]:
         raise HTTPException(status_code=404, detail="성문을 찾을 수 없습니다")
-
-    del voiceprints_db[voiceprint_id]
     return {"message": "성문이 삭제되었습니다"}
 
 
 @router.post("/verify")
-async def verify_voiceprint(voiceprint_id: str, file: UploadFile = File(...)):
+async def verify_voiceprint(
+    voiceprint_id: str,
+    file: UploadFile = File(...),
+    family_id: Optional[str] = FamilyId
+):
     """음성과 등록된 성문 대조"""
-    if voiceprint_id not in voiceprints_db:
+    verifier = get_verifier()
+    gallery = verifier.partitions.get(family_id)
+    if gallery is None or voiceprint_id not in gallery:
         raise HTTPException(status_code=404, detail="성문을 찾을 수 없습니다")
 
-    content = await file.read()
-
-    # 목업 결과 (실제로는 AI 모델로 유사도 계산)
-    import random
-    similarity = random.uniform(10, 95)
+    upload = await ingest_upload(file, decode=True)
+    content = upload.read()
+    upload.close()
+
+    audio_data, sample_rate = upload.decoded or (None, settings.SAMPLE_RATE)
+    result = await verifier.verify(
+        audio_bytes=content,
+        audio_data=audio_data,
+        sample_rate=sample_rate,
+        member_id=voiceprint_id,
+        audio_digest=upload.digest,
+        family_id=family_id
+    )
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail="성문을 찾을 수 없습니다")
 
     return {
         "voiceprint_id": voiceprint_id,
-        "name": voiceprints_db[voiceprint_id]["name"],
-        "similarity": round(similarity, 1),
-        "is_match": similarity > 70
+        "name": gallery[voiceprint_id]["name"],
+        "similarity": round(result["similarity"], 1),
+        "is_match": result["verified"]
     }
@@ -0,0 +1,9 @@
+"""
+테스트 공통 설정
+backend 디렉토리를 import 경로에 추가 (벤치마크와 같은 방식)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
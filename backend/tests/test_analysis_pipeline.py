@@ -0,0 +1,128 @@
+"""분석 파이프라인 테스트 (동시 실행, 실패 시 취소, 마감 시간, 단계별 시간)"""
+
+import asyncio
+import io
+import time
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models.analysis_pipeline import AnalysisPipeline, AnalysisTimeoutError
+from utils.audio_processor import AudioProcessor
+from utils.outbound_audio import OutboundEncoder
+
+
+class FakeDetector:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.started = None
+        self.cancelled = False
+
+    async def detect(self, **kwargs):
+        self.started = time.perf_counter()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return {"probability": 20.0, "status": "success", "settled_by": "remote"}
+
+
+class FakeVerifier:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.started = None
+        self.cancelled = False
+
+    async def verify(self, **kwargs):
+        self.started = time.perf_counter()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return {"similarity": 85.0, "matched_member": "엄마", "mode": "api"}
+
+
+def _wav(seconds=2.0, sr=16000):
+    t = np.arange(int(seconds * sr)) / sr
+    return AudioProcessor().encode_wav(0.5 * np.sin(2 * np.pi * 220 * t), sr)
+
+
+def _pipeline(detector, verifier, deadline=5.0):
+    return AnalysisPipeline(detector, verifier, deadline=deadline, encoder=OutboundEncoder())
+
+
+def test_stages_run_concurrently():
+    detector, verifier = FakeDetector(delay=0.2), FakeVerifier(delay=0.2)
+    start = time.perf_counter()
+    result = asyncio.run(_pipeline(detector, verifier).run(_wav()))
+    elapsed = time.perf_counter() - start
+
+    # 순차 실행이면 0.4초 이상
+    assert elapsed < 0.35
+    assert abs(detector.started - verifier.started) < 0.05
+    assert result["deepfake_probability"] == 20.0
+    assert result["matched_person"] == "엄마"
+    assert result["risk_level"] == "low"
+
+
+def test_first_failure_cancels_other_stage():
+    detector, verifier = FakeDetector(delay=0.01, error=RuntimeError("endpoint down")), FakeVerifier(delay=5.0)
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="endpoint down"):
+        asyncio.run(_pipeline(detector, verifier).run(_wav()))
+    assert time.perf_counter() - start < 1.0
+    assert verifier.cancelled
+
+
+def test_deadline_overrun_raises_timeout():
+    detector, verifier = FakeDetector(delay=5.0), FakeVerifier(delay=0.0)
+    with pytest.raises(AnalysisTimeoutError):
+        asyncio.run(_pipeline(detector, verifier, deadline=0.1).run(_wav()))
+    assert detector.cancelled
+    assert not verifier.cancelled
+
+
+def test_run_concurrently_preserves_order():
+    async def value(v, delay):
+        await asyncio.sleep(delay)
+        return v
+
+    pipeline = _pipeline(FakeDetector(), FakeVerifier())
+    result = asyncio.run(pipeline._run_concurrently([value("a", 0.05), value("b", 0.0)], 1.0))
+    assert result == ["a", "b"]
+
+
+def test_timings_cover_every_stage():
+    detector, verifier = FakeDetector(delay=0.05), FakeVerifier(delay=0.1)
+    result = asyncio.run(_pipeline(detector, verifier).run(_wav()))
+
+    timings = result["timings"]
+    assert set(timings) == {"detect", "verify", "scoring"}  # 가짜 단계는 페이로드를 요청하지 않음
+    assert timings["detect"] >= 0.05
+    assert timings["verify"] >= 0.1
+    assert result["outbound"] is None
+
+
+def test_analyze_route_maps_timeout_to_504(monkeypatch):
+    from routers import analysis
+
+    pipeline = _pipeline(FakeDetector(delay=5.0), FakeVerifier(), deadline=0.1)
+    monkeypatch.setattr(analysis, "get_pipeline", lambda: pipeline)
+    app = FastAPI()
+    app.include_router(analysis.router, prefix="/api/analyze")
+
+    response = TestClient(app).post(
+        "/api/analyze/", files={"file": ("call.wav", io.BytesIO(_wav()), "audio/wav")}
+    )
+    assert response.status_code == 504
+    assert "초과" in response.json()["detail"]
@@ -0,0 +1,68 @@
+"""오디오 헤더 프로브 테스트"""
+
+import io
+import struct
+
+import numpy as np
+import pytest
+
+from utils.audio_probe import probe_audio
+from utils.audio_processor import AudioProcessor
+
+# MPEG1 Layer III, 128kbps, 44.1kHz, 패딩 없음 → 프레임 417바이트
+MP3_HEADER = struct.pack(">I", 0xFFFB9064)
+MP3_FRAME = MP3_HEADER + bytes(413)
+
+
+def test_wav_duration():
+    wav = AudioProcessor().encode_wav(np.zeros(24000, dtype=np.float32), 16000)
+    probe = probe_audio(wav)
+    assert (probe.container, probe.sample_rate, probe.channels) == ("wav", 16000, 1)
+    assert probe.duration == pytest.approx(1.5)
+
+
+def test_file_object_source():
+    wav = AudioProcessor().encode_wav(np.zeros(8000, dtype=np.float32), 8000)
+    assert probe_audio(io.BytesIO(wav)).duration == pytest.approx(1.0)
+
+
+def test_flac_streaminfo():
+    total = 44100 * 3
+    # 샘플레이트(20비트) | 채널-1(3비트) | 비트-1(5비트) | 전체 샘플 수(36비트)
+    packed = (44100 << 44) | (1 << 41) | (15 << 36) | total
+    streaminfo = bytes(10) + packed.to_bytes(8, "big") + bytes(16)
+    flac = b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo
+    probe = probe_audio(flac)
+    assert (probe.container, probe.sample_rate, probe.channels) == ("flac", 44100, 2)
+    assert probe.duration == pytest.approx(3.0)
+
+
+def test_cbr_mp3_duration():
+    probe = probe_audio(MP3_FRAME * 100)
+    assert (probe.container, probe.sample_rate, probe.channels) == ("mp3", 44100, 2)
+    assert probe.duration == pytest.approx(100 * 417 * 8 / 128000)
+
+
+def test_mp3_after_id3_tag():
+    tag = b"ID3\x03\x00\x00\x00\x00\x00\x10" + bytes(16)
+    assert probe_audio(tag + MP3_FRAME * 10).container == "mp3"
+
+
+def test_single_mp3_frame_is_not_enough():
+    # 다음 프레임 헤더가 이어지지 않으면 MP3로 인정하지 않음
+    assert probe_audio(MP3_FRAME + bytes(600)) is None
+
+
+def test_webm_is_not_read_as_mp3():
+    # WebM(EBML) 본문에 우연히 들어 있는 프레임 동기로 MP3 길이를 추정하면 정상 업로드가 422로 거부됨
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        body = rng.integers(0, 256, int(rng.integers(1000, 50000)), dtype=np.uint8).tobytes()
+        assert probe_audio(b"\x1a\x45\xdf\xa3" + body) is None
+    assert probe_audio(b"\x1a\x45\xdf\xa3" + bytes(100) + MP3_FRAME * 3) is None
+
+
+def test_unknown_and_corrupt_input():
+    assert probe_audio(b"") is None
+    assert probe_audio(b"not audio at all") is None
+    assert probe_audio(b"RIFF\x00\x00\x00\x00WAVEfmt ") is None
@@ -0,0 +1,68 @@
+"""딥페이크 탐지기 아티팩트 지표 테스트 (분석할 수 없으면 지어내지 않음)"""
+
+import asyncio
+
+import numpy as np
+
+from models.deepfake_detector import DeepfakeDetector
+from utils.audio_processor import AudioProcessor
+from utils.outbound_audio import OutboundEncoder, PendingOutbound
+
+ARTIFACT_KEYS = {"high_freq_anomaly", "phase_discontinuity", "mel_spectrogram_score", "vocoder_artifacts"}
+
+
+def _detector():
+    detector = DeepfakeDetector(api_token="test")
+
+    async def analyze_with_api(audio_bytes):
+        return {"is_deepfake": True, "probability": 87.0, "confidence": 0.9, "status": "success"}
+
+    detector.analyze_with_api = analyze_with_api
+    return detector
+
+
+def _detect(detector, audio_bytes):
+    outbound = PendingOutbound(audio_bytes, encoder=OutboundEncoder())
+    return asyncio.run(detector.detect(audio_bytes=audio_bytes, outbound=outbound))
+
+
+def test_undecodable_upload_reports_no_artifacts():
+    result = _detect(_detector(), b"OggS" + bytes(4000))
+    assert result["probability"] == 87.0
+    assert result["artifacts"] is None
+    assert result["artifacts_available"] is False
+
+
+def test_decodable_upload_reports_waveform_artifacts():
+    rng = np.random.default_rng(0)
+    audio = 0.1 * rng.standard_normal(32000)
+    result = _detect(_detector(), AudioProcessor().encode_wav(audio, 16000))
+    assert result["artifacts_available"] is True
+    assert set(result["artifacts"]) == ARTIFACT_KEYS
+    # 원격 확률을 그대로 복사한 값이 아님
+    assert len(set(result["artifacts"].values())) > 1
+
+
+def test_mock_result_does_not_invent_artifacts():
+    result = asyncio.run(DeepfakeDetector(api_token="").detect(audio_bytes=b"OggS" + bytes(100)))
+    assert result["artifacts"] is None
+    assert result["artifacts_available"] is False
+
+
+def test_prescreen_runs_off_event_loop_thread():
+    import threading
+
+    detector = DeepfakeDetector(api_token="test", cascade=True)
+    detector.analyze_with_api = _detector().analyze_with_api
+    prescreen, threads = detector._prescreen, []
+
+    def recording_prescreen(*args):
+        threads.append(threading.get_ident())
+        return prescreen(*args)
+
+    detector._prescreen = recording_prescreen
+    audio = 0.1 * np.random.default_rng(1).standard_normal(32000)
+    result = _detect(detector, AudioProcessor().encode_wav(audio, 16000))
+
+    assert threads and threads[0] != threading.get_ident()
+    assert set(result["artifacts"]) == ARTIFACT_KEYS
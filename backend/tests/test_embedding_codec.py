@@ -0,0 +1,44 @@
+"""임베딩 코덱 테스트"""
+
+import io
+
+import numpy as np
+import pytest
+
+from utils.embedding_codec import decode_binary_embedding, from_base64, from_npy, loads_json, to_base64
+
+VECTOR = np.linspace(-1, 1, 192, dtype=np.float32)
+
+
+def test_base64_round_trip():
+    decoded = from_base64(to_base64(VECTOR))
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, VECTOR)
+
+
+def test_npy_decoding():
+    buffer = io.BytesIO()
+    np.save(buffer, VECTOR.astype(np.float64).reshape(1, -1))
+    decoded = from_npy(buffer.getvalue())
+    assert decoded.shape == (192,) and decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, VECTOR)
+
+
+@pytest.mark.parametrize("content_type,body", [
+    ("application/octet-stream", VECTOR.astype("<f4").tobytes()),
+    ("application/x-float32-base64", to_base64(VECTOR).encode() + b"\n"),
+])
+def test_decode_binary_embedding(content_type, body):
+    np.testing.assert_array_equal(decode_binary_embedding(body, content_type), VECTOR)
+
+
+def test_json_is_left_to_caller():
+    assert decode_binary_embedding(b'{"embedding": []}', "application/json") is None
+    assert loads_json(b'{"embedding": [1.0, 2.0]}') == {"embedding": [1.0, 2.0]}
+
+
+def test_corrupt_binary_body():
+    with pytest.raises(ValueError):
+        decode_binary_embedding(b"\x00" * 7, "application/octet-stream")
+    with pytest.raises(ValueError):
+        from_npy(b"not npy")
@@ -0,0 +1,151 @@
+"""성문 임베딩 저장소 테스트"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from models.embedding_store import ID_BYTES, EmbeddingStore
+from models.voiceprint_partitions import VoiceprintPartitions
+
+DIM = 8
+
+
+def vector(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+
+
+def meta(name: str, count: int = 1) -> dict:
+    return {"name": name, "relation": "가족", "registered_at": "2024-01-01T00:00:00",
+            "sample_count": count, "weight": 0.5}
+
+
+def open_store(path, **kwargs) -> EmbeddingStore:
+    kwargs.setdefault("sync", False)
+    kwargs.setdefault("background_compaction", False)
+    return EmbeddingStore(path, dim=DIM, **kwargs)
+
+
+def test_round_trip_and_reopen(tmp_path):
+    store = open_store(tmp_path)
+    store.put("f1", "m1", vector(1), meta("홍길동", 3))
+    store.put("f1", "m2", vector(2), meta("김철수"))
+    store.put("f2", "m1", vector(3), meta("다른 가족"))
+    store.delete("f1", "m2")
+    store.close()
+
+    reopened = open_store(tmp_path)
+    members = {member: (embedding, info) for member, embedding, info in reopened.load_family("f1")}
+    assert list(members) == ["m1"]
+    np.testing.assert_array_equal(members["m1"][0], vector(1))
+    assert members["m1"][1]["name"] == "홍길동" and members["m1"][1]["sample_count"] == 3
+    np.testing.assert_array_equal(reopened.get("f2", "m1"), vector(3))
+    assert reopened.get("f1", "m2") is None
+
+
+def test_compaction_preserves_contents(tmp_path):
+    store = open_store(tmp_path, compact_min_records=10**9)
+    for i in range(50):
+        store.put("f", f"m{i}", vector(i), meta(f"n{i}"))
+    for i in range(0, 50, 5):
+        store.delete("f", f"m{i}")
+    store.put("f", "m1", vector(100), meta("갱신"))
+    before = {member: embedding for member, embedding, _ in store.load_family("f")}
+
+    store.compact()
+    assert store.stats()["tail_records"] == 0 and store.stats()["generation"] == 1
+    store.put("f", "m2", vector(200), meta("압축 후"))
+    store.close()
+
+    reopened = open_store(tmp_path)
+    after = {member: embedding for member, embedding, _ in reopened.load_family("f")}
+    before["m2"] = vector(200)
+    assert sorted(after) == sorted(before)
+    for member, embedding in before.items():
+        np.testing.assert_array_equal(after[member], embedding)
+    # 이전 세대 파일은 정리됨
+    assert not (tmp_path / "records-0.rec").exists()
+
+
+def test_background_compaction(tmp_path):
+    store = open_store(tmp_path, compact_min_records=20, background_compaction=True)
+    for i in range(100):
+        store.put("f", f"m{i % 30}", vector(i), meta(f"n{i}"))
+    store.wait_for_compaction()
+    assert store.stats()["compactions"] >= 1
+    members = {member: embedding for member, embedding, _ in store.load_family("f")}
+    assert len(members) == 30
+    np.testing.assert_array_equal(members["m9"], vector(99))
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    store = open_store(tmp_path)
+    store.put("f", "m1", vector(1), meta("a"))
+    store.close()
+    # 레코드 없이 임베딩만 기록된 상태 (비정상 종료)
+    with open(tmp_path / "embeddings-0.f32", "ab") as f:
+        f.write(vector(2).tobytes()[:10])
+
+    reopened = open_store(tmp_path)
+    assert [member for member, _, _ in reopened.load_family("f")] == ["m1"]
+    reopened.put("f", "m2", vector(2), meta("b"))
+    np.testing.assert_array_equal(reopened.get("f", "m2"), vector(2))
+
+
+def test_rejects_over_length_ids(tmp_path):
+    store = open_store(tmp_path)
+    with pytest.raises(ValueError):
+        store.put("f", "x" * (ID_BYTES + 1), vector(1), meta("a"))
+    with pytest.raises(ValueError):
+        store.delete("가" * 22, "m1")  # UTF-8 66바이트
+    store.put("f", "x" * ID_BYTES, vector(1), meta("a"))
+    assert store.get("f", "x" * ID_BYTES) is not None
+
+
+class SlowStore(EmbeddingStore):
+    """fsync가 느린 디스크를 흉내 내는 저장소"""
+
+    def put(self, *args, **kwargs):
+        time.sleep(0.2)
+        super().put(*args, **kwargs)
+
+
+def test_async_writes_do_not_block_event_loop(tmp_path):
+    partitions = VoiceprintPartitions(dim=DIM, store=SlowStore(tmp_path, dim=DIM, sync=False, background_compaction=False))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def session():
+        task = asyncio.ensure_future(ticker())
+        await partitions.put_async("f1", "m1", vector(1), meta("홍길동"))
+        task.cancel()
+
+    asyncio.run(session())
+    assert ticks >= 10  # 기록(0.2초) 동안 이벤트 루프가 계속 돌았음
+    assert "m1" in partitions.get("f1")
+    assert partitions.store.get("f1", "m1") is not None
+
+
+def test_concurrent_samples_are_not_lost(tmp_path):
+    from models.speaker_verifier import SpeakerVerifier
+
+    partitions = VoiceprintPartitions(dim=192, store=SlowStore(tmp_path, dim=192, sync=False, background_compaction=False))
+    verifier = SpeakerVerifier(api_token="", partitions=partitions)
+
+    async def session():
+        await verifier.create_member("m1", "홍길동", "father", family_id="f1")
+        return await asyncio.gather(*(
+            verifier.add_sample("m1", bytes([i]) * 32000, family_id="f1", quality_weighting=False)
+            for i in range(3)
+        ))
+
+    results = asyncio.run(session())
+    assert sorted(result["sample_count"] for result in results) == [1, 2, 3]
+    assert partitions.get("f1")["m1"]["sample_count"] == 3
+    assert partitions.store.load_family("f1")[0][2]["sample_count"] == 3
@@ -0,0 +1,75 @@
+"""폴리페이즈 리샘플러 테스트"""
+
+import numpy as np
+import pytest
+
+from utils.resampler import MAX_RATIO_TERM, PolyphaseResampler, get_resampler, rational_ratio, resample
+
+
+def tone(freq: float, rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+@pytest.mark.parametrize("src,dst", [(44100, 16000), (48000, 16000), (8000, 16000), (22050, 16000)])
+def test_length_and_tone_preserved(src, dst):
+    output = resample(tone(440, src), src, dst)
+    assert output.dtype == np.float32
+    assert len(output) == -(-src * dst // src)
+    # 가장자리 과도 구간을 제외하면 같은 주파수의 사인파
+    expected = tone(440, dst)[:len(output)]
+    core = slice(dst // 10, -dst // 10)
+    np.testing.assert_allclose(output[core], expected[core], atol=2e-3)
+
+
+def test_anti_aliasing():
+    # 16kHz 출력의 나이퀴스트(8kHz)를 넘는 성분은 감쇠되어야 함
+    output = resample(tone(12000, 48000), 48000, 16000)
+    assert np.sqrt(np.mean(output[1600:-1600] ** 2)) < 1e-3
+
+
+def test_same_rate_and_empty():
+    audio = np.arange(10, dtype=np.float64)
+    same = resample(audio, 16000, 16000)
+    assert same.dtype == np.float32 and np.array_equal(same, audio)
+    assert len(resample(np.zeros(0, dtype=np.float32), 44100, 16000)) == 0
+
+
+def test_block_processing_matches_single_block(monkeypatch):
+    audio = np.random.default_rng(0).standard_normal(44100).astype(np.float32)
+    expected = PolyphaseResampler(44100, 16000)(audio)
+    monkeypatch.setattr("utils.resampler.BLOCK_ELEMENTS", 4096)
+    np.testing.assert_allclose(PolyphaseResampler(44100, 16000)(audio), expected, atol=1e-6)
+
+
+def test_filter_cache_and_invalid_rates():
+    assert get_resampler(44100, 16000) is get_resampler(44100, 16000)
+    with pytest.raises(ValueError):
+        PolyphaseResampler(0, 16000)
+
+
+@pytest.mark.parametrize("src,dst", [(22051, 16000), (16001, 16000), (8001, 16000), (191999, 16000)])
+def test_coprime_rates_stay_bounded(src, dst):
+    resampler = PolyphaseResampler(src, dst)
+    assert max(resampler.up, resampler.down) <= MAX_RATIO_TERM
+    assert resampler.filter.nbytes < 8 * 1024 * 1024
+    effective = src * resampler.up / resampler.down
+    assert abs(effective - dst) / dst < 1 / MAX_RATIO_TERM
+
+    # 근사한 비율(effective)로 정확히 리샘플링한 사인파
+    output = resampler(tone(440, src))
+    assert len(output) == resampler.output_length(src)
+    expected = np.sin(2 * np.pi * 440 * np.arange(len(output)) / effective)
+    core = slice(dst // 10, -dst // 10)
+    np.testing.assert_allclose(output[core], expected[core], atol=2e-3)
+
+
+def test_common_rates_are_exact():
+    for src in (8000, 11025, 22050, 32000, 44100, 48000, 88200, 96000, 176400, 192000):
+        resampler = get_resampler(src, 16000)
+        assert resampler.up * src == resampler.down * 16000
+
+
+def test_extreme_ratio_rejected():
+    with pytest.raises(ValueError):
+        rational_ratio(1, 16000)
@@ -0,0 +1,71 @@
+"""결과 캐시 테스트"""
+
+import json
+
+import pytest
+
+from utils.result_cache import ResultCache, audio_digest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("utils.result_cache.time.time", clock)
+    return clock
+
+
+def test_get_set_and_stats(clock):
+    cache = ResultCache("test")
+    assert cache.get("a") is None
+    cache.set("a", {"probability": 12.5})
+    assert cache.get("a") == {"probability": 12.5}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_ttl_expiry(clock):
+    cache = ResultCache("test", ttl=10)
+    cache.set("a", [1])
+    clock.now += 9.9
+    assert cache.get("a") == [1]
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_by_bytes(clock):
+    entry = len(json.dumps({"v": "x" * 10}).encode())
+    cache = ResultCache("test", max_bytes=entry * 2)
+    cache.set("a", {"v": "a" * 10})
+    cache.set("b", {"v": "b" * 10})
+    cache.get("a")  # a를 최근 사용으로
+    cache.set("c", {"v": "c" * 10})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_oversized_value_not_stored(clock):
+    cache = ResultCache("test", max_bytes=8)
+    cache.set("a", {"value": "too large"})
+    assert cache.get("a") is None
+
+
+def test_disk_tier_survives_restart(clock, tmp_path):
+    ResultCache("test", disk_dir=tmp_path).set("key", {"ok": True})
+    restarted = ResultCache("test", disk_dir=tmp_path)
+    assert restarted.get("key") == {"ok": True}
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_audio_digest():
+    assert audio_digest(b"abc") == audio_digest(b"abc") != audio_digest(b"abd")
+    assert len(audio_digest(b"")) == 64
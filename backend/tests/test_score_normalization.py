@@ -0,0 +1,113 @@
+"""코호트 점수 정규화 테스트 (정규화 점수가 원시 코사인과 다른 판정을 내리는 경우)"""
+
+import asyncio
+
+import numpy as np
+
+from models.analysis_pipeline import AnalysisPipeline
+from models.score_normalizer import CohortScoreNormalizer
+from models.speaker_verifier import SpeakerVerifier
+from models.voiceprint_partitions import VoiceprintPartitions
+from utils.audio_processor import AudioProcessor
+from utils.outbound_audio import OutboundEncoder
+
+DIM = 192
+rng = np.random.default_rng(7)
+
+
+def unit(vector):
+    return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+
+def at_cosine(anchor, cosine):
+    """anchor와 코사인 유사도가 cosine인 단위 벡터"""
+    other = rng.standard_normal(DIM)
+    other -= (other @ anchor) * anchor
+    return unit(cosine * anchor + np.sqrt(1 - cosine ** 2) * unit(other))
+
+
+ENROLLED = unit(rng.standard_normal(DIM))
+# 원시 코사인은 임계값(0.6) 미만이지만 무관한 코호트보다 훨씬 가까움
+CLOSE_BUT_LOW = at_cosine(ENROLLED, 0.5)
+# 원시 코사인은 임계값 이상이지만 사칭자 코호트도 그만큼 가까움 (비슷한 목소리가 많은 경우)
+HIGH_BUT_COMMON = at_cosine(ENROLLED, 0.7)
+
+
+def _verifier(cohort, query):
+    partitions = VoiceprintPartitions(dim=DIM, normalizer=CohortScoreNormalizer(cohort, mode="snorm"))
+    partitions.put("f1", "m1", ENROLLED, {
+        "id": "m1", "name": "엄마", "relation": "mother",
+        "registered_at": "2024-01-01T00:00:00", "sample_count": 3, "weight": 3.0
+    })
+    verifier = SpeakerVerifier(api_token="test", partitions=partitions, normalized_threshold=3.0)
+
+    async def request_embedding(audio_bytes):
+        return query
+
+    verifier._request_embedding = request_embedding
+    return verifier
+
+
+def _random_cohort(n=300):
+    return rng.standard_normal((n, DIM)).astype(np.float32)
+
+
+def _crowded_cohort(n=300):
+    """등록 성문과 질의 모두에 가까운 사칭자 코호트"""
+    center = unit(ENROLLED + HIGH_BUT_COMMON)
+    return np.stack([at_cosine(center, 0.9) for _ in range(n)])
+
+
+def _wav():
+    t = np.arange(32000) / 16000
+    return AudioProcessor().encode_wav(0.5 * np.sin(2 * np.pi * 220 * t), 16000)
+
+
+def _verify(verifier, **kwargs):
+    return asyncio.run(verifier.verify(audio_bytes=_wav(), family_id="f1", threshold=0.6, **kwargs))
+
+
+def test_normalization_accepts_low_raw_score():
+    result = _verify(_verifier(_random_cohort(), CLOSE_BUT_LOW), member_id="m1")
+    assert result["similarity"] < 60  # 원시 코사인만으로는 불일치
+    assert result["normalized_score"] >= 3.0
+    assert result["verified"] is True
+
+
+def test_normalization_rejects_high_raw_score():
+    result = _verify(_verifier(_crowded_cohort(), HIGH_BUT_COMMON))
+    assert result["similarity"] >= 60  # 원시 코사인만으로는 일치
+    assert result["normalized_score"] < 3.0
+    assert result["verified"] is False
+    assert result["matched_member"] is None
+
+
+class LowRiskDetector:
+    async def detect(self, **kwargs):
+        return {"probability": 10.0, "status": "success"}
+
+
+def _risk(verifier):
+    pipeline = AnalysisPipeline(LowRiskDetector(), verifier, deadline=5.0, encoder=OutboundEncoder())
+    return asyncio.run(pipeline.run(_wav(), family_id="f1"))
+
+
+def test_risk_follows_normalized_decision():
+    accepted = _risk(_verifier(_random_cohort(), CLOSE_BUT_LOW))
+    assert accepted["voiceprint_match"] < 60
+    assert accepted["matched_person"] == "엄마"
+    assert accepted["risk_level"] == "low"
+
+    rejected = _risk(_verifier(_crowded_cohort(), HIGH_BUT_COMMON))
+    assert rejected["voiceprint_match"] >= 60
+    assert rejected["matched_person"] is None
+    assert rejected["risk_level"] == "medium"
+
+
+def test_cohort_path_follows_voiceprints_dir(tmp_path, monkeypatch):
+    from config import Settings
+
+    monkeypatch.setenv("VOICEPRINTS_DIR", str(tmp_path))
+    assert Settings().SCORE_NORM_COHORT_PATH == tmp_path / "cohort.npy"
+    monkeypatch.setenv("SCORE_NORM_COHORT_PATH", str(tmp_path / "other.npy"))
+    assert Settings().SCORE_NORM_COHORT_PATH == tmp_path / "other.npy"
@@ -0,0 +1,69 @@
+"""실시간 스트림 분석 테스트 (윈도우 분석이 업로드 결과 캐시를 쓰지 않는지)"""
+
+import asyncio
+
+import numpy as np
+
+from models.analysis_pipeline import AnalysisPipeline
+from models.deepfake_detector import DeepfakeDetector
+from models.speaker_verifier import SpeakerVerifier
+from models.stream_analyzer import StreamingAnalyzer
+from utils.outbound_audio import OutboundEncoder
+from utils.result_cache import ResultCache
+
+
+def _pipeline():
+    detector = DeepfakeDetector(api_token="test", cache=ResultCache("deepfake"), cascade=False)
+    verifier = SpeakerVerifier(api_token="test", cache=ResultCache("speaker_embedding"))
+    calls = {"detect": 0, "embed": 0}
+
+    async def analyze_with_api(audio_bytes):
+        calls["detect"] += 1
+        return {"is_deepfake": False, "probability": 10.0, "confidence": 0.9, "status": "success"}
+
+    async def request_embedding(audio_bytes):
+        calls["embed"] += 1
+        return np.random.default_rng(len(audio_bytes)).standard_normal(192).astype(np.float32)
+
+    detector.analyze_with_api = analyze_with_api
+    verifier._request_embedding = request_embedding
+    return AnalysisPipeline(detector, verifier, deadline=5.0, encoder=OutboundEncoder()), calls
+
+
+def _pcm(seconds, sr=16000):
+    t = np.arange(int(seconds * sr)) / sr
+    return (8000 * np.sin(2 * np.pi * 220 * t)).astype('<i2').tobytes()
+
+
+def test_stream_windows_bypass_result_caches():
+    pipeline, calls = _pipeline()
+    updates = []
+
+    async def session():
+        analyzer = StreamingAnalyzer(pipeline, window_seconds=1.5, hop_seconds=1.5, max_pending=4)
+        analyzer.feed(_pcm(3.0))
+        await analyzer.close()
+
+        async def send(update):
+            updates.append(update)
+
+        await analyzer.run(send)
+
+    asyncio.run(session())
+
+    assert [update["type"] for update in updates] == ["update", "update"]
+    assert calls == {"detect": 2, "embed": 2}
+    assert pipeline.detector.cache.stats()["entries"] == 0
+    assert pipeline.verifier.cache.stats()["entries"] == 0
+
+
+def test_uploads_still_use_result_caches():
+    pipeline, calls = _pipeline()
+    wav = pipeline.encoder.processor.encode_wav(np.frombuffer(_pcm(2.0), dtype='<i2'), 16000)
+
+    asyncio.run(pipeline.run(wav))
+    asyncio.run(pipeline.run(wav))
+
+    assert calls == {"detect": 1, "embed": 1}
+    assert pipeline.detector.cache.stats()["entries"] == 1
+    assert pipeline.verifier.cache.stats()["entries"] == 1
@@ -0,0 +1,149 @@
+"""업로드 수신 제한 테스트 (본문 수신 중 413/415, CORS 헤더)"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from utils.audio_processor import AudioProcessor
+from utils.upload_ingest import UploadLimitMiddleware, _MultipartAudioSniffer
+
+BOUNDARY = b"----deeptruth"
+ORIGIN = b"http://localhost:3000"
+
+
+def _wav(seconds=1.5, sr=16000):
+    t = np.arange(int(seconds * sr)) / sr
+    return AudioProcessor().encode_wav(0.5 * np.sin(2 * np.pi * 220 * t), sr)
+
+
+def _multipart(parts):
+    body = b""
+    for name, filename, data in parts:
+        disposition = b'form-data; name="' + name + b'"'
+        if filename is not None:
+            disposition += b'; filename="' + filename + b'"'
+        body += b"--" + BOUNDARY + b"\r\nContent-Disposition: " + disposition + b"\r\n\r\n" + data + b"\r\n"
+    return body + b"--" + BOUNDARY + b"--\r\n"
+
+
+def _feed(body, chunk_size):
+    sniffer = _MultipartAudioSniffer(BOUNDARY)
+    return all([sniffer.feed(body[i:i + chunk_size]) for i in range(0, len(body), chunk_size)])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_sniffer_accepts_audio_parts(chunk_size):
+    body = _multipart([(b"name", None, b"not audio"), (b"file", b"a.wav", _wav()), (b"file", b"b.wav", _wav())])
+    assert _feed(body, chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_sniffer_rejects_non_audio_file_part(chunk_size):
+    body = _multipart([(b"file", b"a.wav", _wav()), (b"file", b"notes.wav", b"hello world, not a wav file")])
+    assert not _feed(body, chunk_size)
+
+
+def test_sniffer_leaves_short_parts_to_handler():
+    assert _feed(_multipart([(b"file", b"empty.wav", b"")]), 3)
+
+
+def test_boundary_parsing():
+    assert _MultipartAudioSniffer.boundary_of(b'multipart/form-data; boundary="abc"') == b"abc"
+    assert _MultipartAudioSniffer.boundary_of(b"application/json") is None
+
+
+def _call(app, path, chunks, content_length=None):
+    """ASGI 앱 직접 호출 - (응답 상태, 응답 헤더, 소비한 청크 수)"""
+    headers = [
+        (b"content-type", b"multipart/form-data; boundary=" + BOUNDARY),
+        (b"origin", ORIGIN),
+    ]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+    scope = {
+        "type": "http", "method": "POST", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "headers": headers, "http_version": "1.1", "scheme": "http",
+        "server": ("test", 80), "client": ("test", 1234), "root_path": "",
+    }
+    consumed = 0
+    response = {}
+
+    async def receive():
+        nonlocal consumed
+        if consumed >= len(chunks):
+            return {"type": "http.disconnect"}
+        consumed += 1
+        return {"type": "http.request", "body": chunks[consumed - 1], "more_body": consumed < len(chunks)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = dict(message["headers"])
+
+    asyncio.run(app(scope, receive, send))
+    return response["status"], response["headers"], consumed
+
+
+def test_non_audio_rejected_before_body_is_received():
+    from main import app
+
+    body = _multipart([(b"file", b"notes.wav", b"plain text " * 20000)])
+    chunks = [body[i:i + 4096] for i in range(0, len(body), 4096)]
+    status, headers, consumed = _call(app, "/api/analyze/quick", chunks)
+
+    assert status == 415
+    assert consumed == 1
+    assert headers[b"access-control-allow-origin"] == ORIGIN
+
+
+def test_oversize_rejection_carries_cors_headers():
+    from main import app
+
+    status, headers, consumed = _call(app, "/api/analyze/", [b""], content_length=1 << 40)
+    assert status == 413
+    assert consumed == 0
+    assert headers[b"access-control-allow-origin"] == ORIGIN
+
+
+def test_middleware_ignores_other_paths():
+    async def app(scope, receive, send):
+        while (await receive())["more_body"]:
+            pass
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    middleware = UploadLimitMiddleware(app, [("/api/analyze", 1024)])
+    body = _multipart([(b"file", b"notes.txt", b"plain text")])
+    status, _, consumed = _call(middleware, "/api/family/upload", [body])
+    assert status == 200 and consumed == 1
+
+
+def test_quick_analysis_checks_declared_type():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    response = TestClient(app).post(
+        "/api/analyze/quick", files={"file": ("notes.txt", _wav(), "text/plain")}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("rate,status", [(22051, 200), (4000, 415), (384000, 415)])
+def test_sample_rate_bounds(monkeypatch, rate, status):
+    from fastapi.testclient import TestClient
+    from main import app
+    from routers import analysis
+
+    async def detect(**kwargs):
+        return {"probability": 10.0, "status": "success", "settled_by": "remote"}
+
+    class Detector:
+        pass
+
+    detector = Detector()
+    detector.detect = detect
+    monkeypatch.setattr(analysis, "get_detector", lambda: detector)
+    response = TestClient(app).post(
+        "/api/analyze/quick", files={"file": ("call.wav", _wav(sr=rate), "audio/wav")}
+    )
+    assert response.status_code == status
@@ -0,0 +1,98 @@
+"""성문 일괄 등록 테스트 (동시 임베딩, 일부 샘플 실패)"""
+
+import asyncio
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models.speaker_verifier import SpeakerVerifier
+from utils.audio_processor import AudioProcessor
+from utils.outbound_audio import get_outbound_encoder
+
+
+def _wav(freq, seconds=2.0, sr=16000):
+    t = np.arange(int(seconds * sr)) / sr
+    return AudioProcessor().encode_wav(0.5 * np.sin(2 * np.pi * freq * t), sr)
+
+
+def _verifier(failing):
+    """failing에 든 샘플은 임베딩 호출이 실패하는 API 모드 검증기"""
+    verifier = SpeakerVerifier(api_token="test")
+    failing_payloads = {get_outbound_encoder().encode(sample).payload for sample in failing}
+    calls = []
+
+    async def request_embedding(audio_bytes):
+        calls.append(len(audio_bytes))
+        await asyncio.sleep(0.05)
+        if audio_bytes in failing_payloads:
+            return None
+        return np.random.default_rng(len(calls)).standard_normal(192).astype(np.float32)
+
+    verifier._request_embedding = request_embedding
+    return verifier, calls
+
+
+def test_register_keeps_successful_samples():
+    samples = [_wav(200), _wav(300), _wav(400)]
+    verifier, calls = _verifier(failing=[samples[1]])
+
+    result = asyncio.run(verifier.register_voiceprint("m1", "엄마", "mother", samples, family_id="f1"))
+
+    assert result["success"]
+    assert result["sample_count"] == 2
+    assert result["failed_samples"] == [1]
+    assert len(calls) == 3
+    # 샘플 임베딩을 동시에 추출 (순차면 0.15초 이상)
+    assert result["enrollment_time"] < 0.15
+    assert verifier.partitions.get("f1")["m1"]["sample_count"] == 2
+
+
+def test_register_fails_without_any_embedding():
+    samples = [_wav(200), _wav(300)]
+    verifier, _ = _verifier(failing=samples)
+
+    result = asyncio.run(verifier.register_voiceprint("m1", "엄마", "mother", samples, family_id="f1"))
+
+    assert not result["success"]
+    assert result["failed_samples"] == [0, 1]
+    assert verifier.partitions.get("f1") is None
+
+
+def _client(monkeypatch, verifier):
+    from routers import voiceprint
+
+    monkeypatch.setattr(voiceprint, "get_verifier", lambda: verifier)
+    app = FastAPI()
+    app.include_router(voiceprint.router, prefix="/api/voiceprint")
+    return TestClient(app)
+
+
+def test_enroll_route_reports_partial_failure(monkeypatch):
+    samples = [_wav(200), _wav(300), _wav(400)]
+    verifier, _ = _verifier(failing=[samples[2]])
+
+    response = _client(monkeypatch, verifier).post(
+        "/api/voiceprint/enroll?family_id=f1",
+        data={"name": "엄마", "relationship": "mother"},
+        files=[("files", (f"s{i}.wav", sample, "audio/wav")) for i, sample in enumerate(samples)]
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["name"] == "엄마" and body["relationship"] == "mother"
+    assert body["sample_count"] == 2
+    assert body["failed_samples"] == [2]
+    assert body["id"] in verifier.partitions.get("f1")
+
+
+def test_enroll_route_rejects_total_failure(monkeypatch):
+    samples = [_wav(200), _wav(300)]
+    verifier, _ = _verifier(failing=samples)
+
+    response = _client(monkeypatch, verifier).post(
+        "/api/voiceprint/enroll",
+        data={"name": "엄마", "relationship": "mother"},
+        files=[("files", (f"s{i}.wav", sample, "audio/wav")) for i, sample in enumerate(samples)]
+    )
+    assert response.status_code == 422
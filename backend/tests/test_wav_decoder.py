@@ -0,0 +1,105 @@
+"""WAV 디코더 테스트"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from utils.wav_decoder import (
+    WAVE_FORMAT_EXTENSIBLE, WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_PCM,
+    StreamingWavDecoder, WavFormatError, decode_wav, parse_wav_header
+)
+
+
+def make_wav(data: bytes, channels: int, sample_rate: int, bits: int, audio_format: int = WAVE_FORMAT_PCM,
+             extra_chunk: bytes = b"", data_size=None) -> bytes:
+    block_align = channels * bits // 8
+    if audio_format == WAVE_FORMAT_EXTENSIBLE:
+        fmt = struct.pack("<HHIIHH", WAVE_FORMAT_EXTENSIBLE, channels, sample_rate,
+                          sample_rate * block_align, block_align, bits)
+        # cbSize, validBits, channelMask, SubFormat GUID (앞 2바이트가 형식 코드)
+        fmt += struct.pack("<HHI", 22, bits, 0) + struct.pack("<H", WAVE_FORMAT_PCM) + bytes(14)
+    else:
+        fmt = struct.pack("<HHIIHH", audio_format, channels, sample_rate,
+                          sample_rate * block_align, block_align, bits)
+    size = len(data) if data_size is None else data_size
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + extra_chunk
+    body += b"data" + struct.pack("<I", size) + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+SIGNAL = np.sin(np.linspace(0, 20 * np.pi, 1600)).astype(np.float32) * 0.5
+
+
+@pytest.mark.parametrize("bits,dtype,scale", [(16, "<i2", 32767), (32, "<i4", 2 ** 31 - 1)])
+def test_integer_pcm(bits, dtype, scale):
+    data = (SIGNAL * scale).astype(dtype).tobytes()
+    audio, sample_rate = decode_wav(make_wav(data, 1, 16000, bits))
+    assert sample_rate == 16000
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, SIGNAL, atol=1e-4)
+
+
+def test_8bit_unsigned():
+    data = np.round(SIGNAL * 127 + 128).astype(np.uint8).tobytes()
+    audio, _ = decode_wav(make_wav(data, 1, 8000, 8))
+    np.testing.assert_allclose(audio, SIGNAL, atol=1 / 64)
+
+
+def test_24bit_sign_extension():
+    ints = np.array([0, 1, -1, 2 ** 23 - 1, -2 ** 23], dtype=np.int32)
+    data = b"".join(int(v).to_bytes(3, "little", signed=True) for v in ints)
+    audio, _ = decode_wav(make_wav(data, 1, 16000, 24))
+    np.testing.assert_allclose(audio, ints / 2 ** 23, atol=1e-7)
+
+
+def test_float_and_stereo_downmix():
+    stereo = np.stack([SIGNAL, -SIGNAL * 0.5], axis=1).astype("<f4")
+    audio, _ = decode_wav(make_wav(stereo.tobytes(), 2, 48000, 32, WAVE_FORMAT_IEEE_FLOAT))
+    np.testing.assert_allclose(audio, SIGNAL * 0.25, atol=1e-6)
+
+
+def test_extensible_format_and_extra_chunks():
+    data = (SIGNAL * 32767).astype("<i2").tobytes()
+    wav = make_wav(data, 1, 16000, 16, WAVE_FORMAT_EXTENSIBLE, extra_chunk=b"LIST" + struct.pack("<I", 3) + b"abc\x00")
+    audio, _ = decode_wav(wav)
+    np.testing.assert_allclose(audio, SIGNAL, atol=1e-4)
+
+
+def test_unknown_data_size_reads_to_end():
+    data = (SIGNAL * 32767).astype("<i2").tobytes()
+    audio, _ = decode_wav(make_wav(data, 1, 16000, 16, data_size=0xFFFFFFFF))
+    assert len(audio) == len(SIGNAL)
+
+
+def test_rejects_unsupported_and_truncated():
+    with pytest.raises(WavFormatError):
+        decode_wav(make_wav(bytes(64), 1, 16000, 4, audio_format=0x0002))  # ADPCM
+    with pytest.raises(WavFormatError):
+        decode_wav(b"OggS" + bytes(40))
+    with pytest.raises(WavFormatError):
+        decode_wav(make_wav(bytes(64), 1, 16000, 16)[:20])
+    assert parse_wav_header(b"RIFF") is None  # 헤더 수신 중
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 45, 1000])
+def test_streaming_matches_full_decode(chunk_size):
+    stereo = np.stack([SIGNAL, SIGNAL * 0.1], axis=1)
+    data = (stereo * 32767).astype("<i2").tobytes()
+    wav = make_wav(data, 2, 22050, 16) + b"trailing-chunk"
+    expected, _ = decode_wav(wav)
+
+    decoder = StreamingWavDecoder()
+    blocks = [decoder.feed(wav[i:i + chunk_size]) for i in range(0, len(wav), chunk_size)]
+    decoder.finish()
+
+    np.testing.assert_array_equal(np.concatenate(blocks), expected)
+    assert decoder.done
+    assert decoder.expected_duration == pytest.approx(len(SIGNAL) / 22050)
+
+
+def test_streaming_finish_without_header():
+    decoder = StreamingWavDecoder()
+    decoder.feed(b"RIFF\x00\x00")
+    with pytest.raises(WavFormatError):
+        decoder.finish()
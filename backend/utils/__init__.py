@@ -3,7 +3,29 @@ Deep Truth Utilities
 유틸리티 모듈
 """
 
-from .audio_processor import AudioProcessor
+from .audio_processor import AudioDecodeError, AudioProcessor
 from .helpers import generate_id, format_timestamp, calculate_risk_level
+from .http_client import HTTPClient, get_http_client
+from .upload_ingest import IngestedAudio, UploadRejectedError, ingest_upload
+from .single_flight import SingleFlight
+from .spectral_analyzer import SpectralArtifactAnalyzer, get_spectral_analyzer
+from .speech_segmenter import SpeechSegmenter, get_speech_segmenter
+from .embedding_codec import decode_binary_embedding
+from .wav_decoder import StreamingWavDecoder, WavFormatError, decode_wav
+from .audio_probe import AudioProbe, probe_audio
+from .resampler import PolyphaseResampler, resample
+from .spectral_features import SpectralFeatures, compute_features, compute_features_batch, mel_filterbank
 
-__all__ = ['AudioProcessor', 'generate_id', 'format_timestamp', 'calculate_risk_level']
+__all__ = [
+    'AudioProcessor', 'AudioDecodeError', 'generate_id', 'format_timestamp', 'calculate_risk_level',
+    'HTTPClient', 'get_http_client',
+    'IngestedAudio', 'UploadRejectedError', 'ingest_upload',
+    'SingleFlight',
+    'SpectralArtifactAnalyzer', 'get_spectral_analyzer',
+    'SpeechSegmenter', 'get_speech_segmenter',
+    'decode_binary_embedding',
+    'StreamingWavDecoder', 'WavFormatError', 'decode_wav',
+    'AudioProbe', 'probe_audio',
+    'PolyphaseResampler', 'resample',
+    'SpectralFeatures', 'compute_features', 'compute_features_batch', 'mel_filterbank'
+]
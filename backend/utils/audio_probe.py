@@ -0,0 +1,384 @@
+"""
+오디오 헤더 프로브
+샘플을 디코딩하지 않고 컨테이너 헤더만 읽어 코덱, 샘플레이트, 채널 수, 재생 길이 확인
+(WAV, FLAC, Ogg Vorbis/Opus/FLAC, MP3 프레임 헤더, MP4/M4A mvhd)
+"""
+
+import struct
+from typing import BinaryIO, Optional, Union
+
+from .wav_decoder import WAVE_FORMAT_IEEE_FLOAT, WavFormatError, parse_wav_header
+
+# 헤더를 찾기 위해 앞부분에서 읽는 최대 바이트 수
+HEAD_BYTES = 64 * 1024
+# Ogg 마지막 페이지(그래뉼 위치)를 찾기 위해 뒷부분에서 읽는 바이트 수
+OGG_TAIL_BYTES = 64 * 1024
+# 한 단계에서 순회하는 MP4 박스 최대 개수 (손상된 파일 방어)
+_MP4_MAX_BOXES = 4096
+
+# MPEG 오디오 비트레이트 (kbps) - (MPEG1 여부, 레이어) → 인덱스 1~14
+_MP3_BITRATES = {
+    (True, 1): (32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = (44100, 48000, 32000)
+
+_MP4_CODECS = {b"mp4a": "aac", b"alac": "alac", b"Opus": "opus", b"fLaC": "flac", b"ac-3": "ac3", b"ec-3": "eac3"}
+
+Source = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+class AudioProbe:
+    """
+    헤더 프로브 결과
+
+    duration은 헤더에 길이 정보가 없으면 None입니다 (전체 샘플 수가 기록되지 않은 FLAC,
+    mvhd 길이가 비어 있는 조각화 MP4 등). Xing/VBRI 헤더가 없는 MP3는 첫 프레임의
+    비트레이트로 계산한 값입니다.
+    """
+
+    def __init__(
+        self,
+        container: str,
+        codec: str,
+        sample_rate: int,
+        channels: int,
+        duration: Optional[float]
+    ):
+        self.container = container
+        self.codec = codec
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.duration = duration
+
+    def to_dict(self) -> dict:
+        return {
+            "container": self.container,
+            "codec": self.codec,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "duration": None if self.duration is None else round(self.duration, 3),
+        }
+
+
+class _Reader:
+    """바이트 버퍼 또는 파일 객체에서 지정 구간만 읽기"""
+
+    def __init__(self, source: Source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._view = memoryview(source)
+            self._file = None
+            self.size = len(self._view)
+        else:
+            self._view = None
+            self._file = source
+            self.size = source.seek(0, 2)
+
+    def read(self, offset: int, length: int) -> bytes:
+        if offset < 0 or offset >= self.size:
+            return b""
+        if self._view is not None:
+            return bytes(self._view[offset:offset + length])
+        self._file.seek(offset)
+        return self._file.read(length)
+
+
+def probe_audio(source: Source) -> Optional[AudioProbe]:
+    """
+    컨테이너 헤더만 읽어 오디오 정보 확인
+
+    Args:
+        source: 오디오 파일 전체 바이트 또는 탐색 가능한 바이너리 파일 객체
+            (파일 객체는 헤더/꼬리 구간만 읽으며 위치는 보존하지 않음)
+
+    Returns:
+        AudioProbe (지원하지 않는 형식이거나 헤더가 손상되었으면 None)
+    """
+    reader = _Reader(source)
+    head = reader.read(0, HEAD_BYTES)
+    start = _id3v2_size(head)
+    if start:
+        head = reader.read(start, HEAD_BYTES)
+
+    try:
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _probe_wav(reader, head)
+        if head[:4] == b"fLaC":
+            return _probe_flac(head)
+        if head[:4] == b"OggS":
+            return _probe_ogg(reader, head)
+        if head[4:8] == b"ftyp":
+            return _probe_mp4(reader)
+        if start or _is_mp3_sync(head):
+            # ID3 태그나 프레임 동기로 시작하는 경우에만 MP3로 해석 (WebM 등 다른 컨테이너 오인 방지)
+            return _probe_mp3(reader, head, start)
+        return None
+    except (struct.error, IndexError, ValueError, ZeroDivisionError):
+        # WavFormatError 포함 - 헤더가 손상되었거나 지원하지 않는 변형
+        return None
+
+
+def _id3v2_size(head: bytes) -> int:
+    """앞쪽 ID3v2 태그 길이 (없으면 0)"""
+    if len(head) < 10 or head[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in head[6:10]:  # synchsafe 정수 (바이트당 7비트)
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _probe_wav(reader: _Reader, head: bytes) -> Optional[AudioProbe]:
+    parsed = parse_wav_header(head)
+    if parsed is None:
+        raise WavFormatError("WAV 헤더가 프로브 범위를 넘습니다")
+    wav_format, offset, size = parsed
+    if size is None:
+        size = reader.size - offset  # 길이 미상 스트리밍 기록 - 파일 끝까지
+    size = min(size, reader.size - offset)
+    frames = size // wav_format.block_align
+    bits = wav_format.bits_per_sample
+    if wav_format.audio_format == WAVE_FORMAT_IEEE_FLOAT:
+        codec = f"pcm_f{bits}"
+    else:
+        codec = "pcm_u8" if bits == 8 else f"pcm_s{bits}"
+    return AudioProbe("wav", codec, wav_format.sample_rate, wav_format.channels, frames / wav_format.sample_rate)
+
+
+def _flac_streaminfo(block: bytes):
+    """STREAMINFO 본문 → (샘플레이트, 채널 수, 전체 샘플 수 또는 0)"""
+    packed = int.from_bytes(block[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total = packed & ((1 << 36) - 1)
+    if sample_rate == 0:
+        raise ValueError("FLAC 샘플레이트가 0입니다")
+    return sample_rate, channels, total
+
+
+def _probe_flac(head: bytes) -> Optional[AudioProbe]:
+    # 첫 메타데이터 블록은 항상 STREAMINFO (블록 헤더 4바이트 + 본문 34바이트)
+    if len(head) < 42 or head[4] & 0x7F != 0:
+        return None
+    sample_rate, channels, total = _flac_streaminfo(head[8:42])
+    return AudioProbe("flac", "flac", sample_rate, channels, total / sample_rate if total else None)
+
+
+def _probe_ogg(reader: _Reader, head: bytes) -> Optional[AudioProbe]:
+    segments = head[26]
+    payload = head[27 + segments:]
+    serial = head[14:18]
+
+    pre_skip = 0
+    if payload[:7] == b"\x01vorbis":
+        codec = "vorbis"
+        channels = payload[11]
+        sample_rate = struct.unpack_from("<I", payload, 12)[0]
+        rate = sample_rate
+    elif payload[:8] == b"OpusHead":
+        # Opus 그래뉼 위치는 항상 48kHz 기준
+        codec = "opus"
+        channels = payload[9]
+        pre_skip = struct.unpack_from("<H", payload, 10)[0]
+        sample_rate = rate = 48000
+    elif payload[:5] == b"\x7fFLAC" and payload[9:13] == b"fLaC":
+        codec = "flac"
+        sample_rate, channels, _ = _flac_streaminfo(payload[17:51])
+        rate = sample_rate
+    else:
+        return None
+
+    granule = _ogg_last_granule(reader, serial)
+    duration = None
+    if granule is not None and rate:
+        duration = max(0, granule - pre_skip) / rate
+    return AudioProbe("ogg", codec, sample_rate, channels, duration)
+
+
+def _ogg_last_granule(reader: _Reader, serial: bytes) -> Optional[int]:
+    """같은 논리 스트림의 마지막 페이지 그래뉼 위치 (끝부분만 읽음)"""
+    tail_start = max(0, reader.size - OGG_TAIL_BYTES)
+    tail = reader.read(tail_start, OGG_TAIL_BYTES)
+    pos = tail.rfind(b"OggS")
+    while pos >= 0:
+        if pos + 18 <= len(tail) and tail[pos + 4] == 0 and tail[pos + 14:pos + 18] == serial:
+            granule = struct.unpack_from("<q", tail, pos + 6)[0]
+            if granule >= 0:  # -1: 이 페이지에서 끝나는 패킷 없음
+                return granule
+        pos = tail.rfind(b"OggS", 0, pos)
+    return None
+
+
+def _mp3_header(word: int):
+    """
+    MPEG 오디오 프레임 헤더 해석
+
+    Returns:
+        (MPEG1 여부, 레이어, 비트레이트 bps, 샘플레이트, 채널 수, 프레임 샘플 수, 프레임 바이트 수)
+        또는 유효하지 않으면 None
+    """
+    if (word >> 21) & 0x7FF != 0x7FF:
+        return None
+    version = (word >> 19) & 0x3  # 0: MPEG2.5, 2: MPEG2, 3: MPEG1
+    layer = 4 - ((word >> 17) & 0x3)  # 1~3 (4는 예약)
+    bitrate_index = (word >> 12) & 0xF
+    rate_index = (word >> 10) & 0x3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index - 1] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[rate_index] >> (0 if mpeg1 else 1 if version == 2 else 2)
+    channels = 1 if (word >> 6) & 0x3 == 3 else 2
+    padding = (word >> 9) & 0x1
+
+    if layer == 1:
+        samples = 384
+        frame_bytes = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        frame_bytes = samples // 8 * bitrate // sample_rate + padding
+    return mpeg1, layer, bitrate, sample_rate, channels, samples, frame_bytes
+
+
+def _is_mp3_sync(head: bytes) -> bool:
+    """MPEG 오디오 프레임 동기 비트(11비트)로 시작하는지 여부"""
+    return len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0
+
+
+def _mp3_follows(reader: _Reader, offset: int, frame) -> bool:
+    """offset에 같은 버전/레이어/샘플레이트의 프레임 헤더가 이어지는지 여부 (파일 끝이면 False)"""
+    data = reader.read(offset, 4)
+    if len(data) < 4:
+        return False
+    following = _mp3_header(struct.unpack_from(">I", data)[0])
+    return following is not None and following[:2] == frame[:2] and following[3] == frame[3]
+
+
+def _probe_mp3(reader: _Reader, head: bytes, start: int) -> Optional[AudioProbe]:
+    # 첫 프레임 동기 찾기 - 바로 다음 프레임 헤더까지 연속으로 유효해야 인정 (우연한 0xFFE 방지)
+    pos = head.find(b"\xff")
+    frame = None
+    while 0 <= pos <= len(head) - 4:
+        frame = _mp3_header(struct.unpack_from(">I", head, pos)[0])
+        if frame is not None and _mp3_follows(reader, start + pos + frame[6], frame):
+            break
+        frame = None
+        pos = head.find(b"\xff", pos + 1)
+    if frame is None:
+        return None
+
+    mpeg1, layer, bitrate, sample_rate, channels, samples, _ = frame
+    codec = f"mp{layer}"
+
+    # Xing/Info (LAME) 또는 VBRI 헤더의 프레임 수 → 정확한 길이
+    side_info = (32 if channels == 2 else 17) if mpeg1 else (17 if channels == 2 else 9)
+    xing = pos + 4 + side_info
+    if head[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack_from(">I", head, xing + 4)[0]
+        if flags & 0x1:
+            frames = struct.unpack_from(">I", head, xing + 8)[0]
+            return AudioProbe("mp3", codec, sample_rate, channels, frames * samples / sample_rate)
+    vbri = pos + 4 + 32
+    if head[vbri:vbri + 4] == b"VBRI":
+        frames = struct.unpack_from(">I", head, vbri + 14)[0]
+        return AudioProbe("mp3", codec, sample_rate, channels, frames * samples / sample_rate)
+
+    # 고정 비트레이트: 오디오 바이트 수 / 바이트율 (끝의 ID3v1 태그 제외)
+    end = reader.size
+    if reader.read(end - 128, 3) == b"TAG":
+        end -= 128
+    audio_bytes = end - (start + pos)
+    return AudioProbe("mp3", codec, sample_rate, channels, audio_bytes * 8 / bitrate)
+
+
+def _mp4_boxes(reader: _Reader, offset: int, end: int):
+    """[offset, end) 범위의 박스 (종류, 본문 시작, 박스 끝) 순회"""
+    count = 0
+    while offset + 8 <= end and count < _MP4_MAX_BOXES:
+        header = reader.read(offset, 16)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack_from(">I4s", header)
+        body = offset + 8
+        if size == 1:  # 64비트 largesize
+            size = struct.unpack_from(">Q", header, 8)[0]
+            body = offset + 16
+        elif size == 0:  # 파일 끝까지
+            size = end - offset
+        if size < body - offset:
+            return
+        yield kind, body, min(offset + size, end)
+        offset += size
+        count += 1
+
+
+def _mp4_find(reader: _Reader, offset: int, end: int, kind: bytes):
+    for found, body, box_end in _mp4_boxes(reader, offset, end):
+        if found == kind:
+            return body, box_end
+    return None
+
+
+def _probe_mp4(reader: _Reader) -> Optional[AudioProbe]:
+    # mdat이 moov보다 앞에 있어도 박스 헤더만 읽고 건너뜀
+    moov = _mp4_find(reader, 0, reader.size, b"moov")
+    if moov is None:
+        return None
+    mvhd = _mp4_find(reader, moov[0], moov[1], b"mvhd")
+    if mvhd is None:
+        return None
+    box = reader.read(mvhd[0], 32)
+    if box[0] == 1:
+        timescale, duration = struct.unpack_from(">IQ", box, 20)
+    else:
+        timescale, duration = struct.unpack_from(">II", box, 12)
+    seconds = duration / timescale if timescale and duration not in (0, 0xFFFFFFFF) else None
+
+    codec, sample_rate, channels = "unknown", 0, 0
+    for kind, body, box_end in _mp4_boxes(reader, moov[0], moov[1]):
+        if kind != b"trak":
+            continue
+        entry = _mp4_audio_entry(reader, body, box_end)
+        if entry is not None:
+            codec, sample_rate, channels = entry
+            break
+    else:
+        return None  # 오디오 트랙 없음
+
+    return AudioProbe("mp4", codec, sample_rate, channels, seconds)
+
+
+def _mp4_audio_entry(reader: _Reader, offset: int, end: int):
+    """trak 안의 오디오 샘플 엔트리 → (코덱, 샘플레이트, 채널 수), 오디오 트랙이 아니면 None"""
+    mdia = _mp4_find(reader, offset, end, b"mdia")
+    if mdia is None:
+        return None
+    hdlr = _mp4_find(reader, mdia[0], mdia[1], b"hdlr")
+    if hdlr is None or reader.read(hdlr[0] + 8, 4) != b"soun":
+        return None
+
+    timescale = 0
+    mdhd = _mp4_find(reader, mdia[0], mdia[1], b"mdhd")
+    if mdhd is not None:
+        box = reader.read(mdhd[0], 24)
+        timescale = struct.unpack_from(">I", box, 20 if box[0] == 1 else 12)[0]
+
+    box = (mdia[0], mdia[1])
+    for kind in (b"minf", b"stbl", b"stsd"):
+        box = _mp4_find(reader, box[0], box[1], kind)
+        if box is None:
+            return None
+    # stsd: 버전/플래그(4) + 엔트리 수(4) 다음 첫 샘플 엔트리
+    entry = reader.read(box[0] + 8, 36)
+    kind = entry[4:8]
+    channels = struct.unpack_from(">H", entry, 24)[0]
+    sample_rate = struct.unpack_from(">I", entry, 32)[0] >> 16  # 16.16 고정소수점
+    codec = _MP4_CODECS.get(kind, kind.decode("latin-1").strip())
+    # 65535Hz를 넘는 샘플레이트는 엔트리에 담기지 않으므로 미디어 타임스케일 사용
+    return codec, sample_rate or timescale, channels
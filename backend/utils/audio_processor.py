@@ -6,111 +6,97 @@
 import io
 import struct
 import numpy as np
-from typing import Tuple, Optional, BinaryIO
-import random
+from typing import Tuple, Optional, BinaryIO, List, Sequence
+
+from .audio_probe import AudioProbe, probe_audio
+from .resampler import resample
+from .spectral_features import compute_features, compute_features_batch
+from .wav_decoder import WavFormatError, decode_wav
+
+
+class AudioDecodeError(ValueError):
+    """로컬에서 디코딩할 수 없는 오디오 (WAV가 아니거나 손상/미지원 WAV)"""
 
 
 class AudioProcessor:
     """
     오디오 처리 유틸리티
 
-    지원 포맷: WAV, MP3, M4A, OGG (프로토타입에서는 목업)
+    지원 포맷: WAV, MP3, M4A, OGG, FLAC, WebM (로컬 디코딩은 WAV만, 나머지는 원격 엔드포인트가 디코딩)
     """
 
     SUPPORTED_FORMATS = ['wav', 'mp3', 'm4a', 'ogg', 'flac', 'webm']
     TARGET_SAMPLE_RATE = 16000  # 모델 입력용 표준 샘플레이트
 
-    def __init__(self):
-        self._prototype_mode = True
-
     def load_audio(self, file_data: bytes, file_format: str = 'wav') -> Tuple[np.ndarray, int]:
         """
         오디오 파일 로드
 
+        로컬 디코더는 WAV만 지원합니다. 디코딩할 수 없는 입력을 임의 신호로
+        대체하지 않고 오류로 알립니다.
+
         Args:
             file_data: 오디오 파일 바이트 데이터
             file_format: 파일 포맷
 
         Returns:
-            (오디오 신호, 샘플레이트)
-        """
-        if self._prototype_mode:
-            # 목업: 파일 크기 기반으로 임의 오디오 생성
-            duration = len(file_data) / 32000  # 대략적인 duration 추정
-            duration = max(1.0, min(duration, 30.0))  # 1초 ~ 30초 제한
-            num_samples = int(duration * self.TARGET_SAMPLE_RATE)
-            audio = np.random.randn(num_samples) * 0.3  # 낮은 진폭의 노이즈
-            return audio.astype(np.float32), self.TARGET_SAMPLE_RATE
+            (모노 float32 오디오, 샘플레이트)
 
-        # 실제 구현:
-        # import librosa
-        # audio, sr = librosa.load(io.BytesIO(file_data), sr=self.TARGET_SAMPLE_RATE)
-        # return audio, sr
+        Raises:
+            AudioDecodeError: WAV가 아니거나 지원하지 않는/손상된 WAV
+        """
+        if file_data[:4] != b'RIFF':
+            raise AudioDecodeError(f"로컬에서 디코딩할 수 없는 형식입니다 ({file_format})")
+        try:
+            return decode_wav(file_data)
+        except WavFormatError as e:
+            raise AudioDecodeError(str(e)) from e
 
     def load_wav(self, file_data: bytes) -> Tuple[np.ndarray, int]:
         """
-        WAV 파일 간이 파서 (순수 Python)
+        WAV 파일 로드 (순수 NumPy)
+
+        8/16/24/32비트 정수, 32/64비트 float, WAVE_FORMAT_EXTENSIBLE, 다채널을
+        모노 float32로 디코딩합니다.
+
+        Raises:
+            AudioDecodeError: 디코딩할 수 없는 경우
+        """
+        return self.load_audio(file_data, 'wav')
+
+    def probe(self, file_data: bytes) -> Optional[AudioProbe]:
+        """
+        헤더만 읽어 코덱/샘플레이트/채널 수/재생 길이 확인 (샘플 디코딩 없음)
 
-        실제 구현에서는 librosa/scipy를 사용하지만,
-        프로토타입에서는 간단한 WAV 파싱을 수행합니다.
+        Args:
+            file_data: 오디오 파일 바이트 데이터 또는 바이너리 파일 객체
+
+        Returns:
+            AudioProbe 또는 지원하지 않는 형식이면 None
         """
+        return probe_audio(file_data)
+
+    def decode(self, file_data: bytes) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        실제 샘플 디코딩 (목업 신호로 대체하지 않음)
+
+        Args:
+            file_data: 오디오 파일 바이트 데이터
+
+        Returns:
+            (모노 float32 오디오, 샘플레이트) 또는 디코딩할 수 없으면 None
+        """
+        return self._parse_wav(file_data)
+
+    def _parse_wav(self, file_data: bytes) -> Optional[Tuple[np.ndarray, int]]:
+        """WAV 파싱 (WAV가 아니거나 지원하지 않는 형식이면 None)"""
+        if file_data[:4] != b'RIFF':
+            return None
         try:
-            # WAV 헤더 파싱
-            riff = file_data[:4]
-            if riff != b'RIFF':
-                return self.load_audio(file_data)
-
-            # 청크 사이즈 및 포맷 확인
-            wave = file_data[8:12]
-            if wave != b'WAVE':
-                return self.load_audio(file_data)
-
-            # fmt 청크 찾기
-            pos = 12
-            sample_rate = 16000
-            channels = 1
-            bits_per_sample = 16
-
-            while pos < len(file_data) - 8:
-                chunk_id = file_data[pos:pos+4]
-                chunk_size = struct.unpack('<I', file_data[pos+4:pos+8])[0]
-
-                if chunk_id == b'fmt ':
-                    fmt_data = file_data[pos+8:pos+8+chunk_size]
-                    audio_format = struct.unpack('<H', fmt_data[0:2])[0]
-                    channels = struct.unpack('<H', fmt_data[2:4])[0]
-                    sample_rate = struct.unpack('<I', fmt_data[4:8])[0]
-                    bits_per_sample = struct.unpack('<H', fmt_data[14:16])[0]
-
-                elif chunk_id == b'data':
-                    audio_data = file_data[pos+8:pos+8+chunk_size]
-
-                    # PCM 데이터를 numpy 배열로 변환
-                    if bits_per_sample == 16:
-                        samples = np.frombuffer(audio_data, dtype=np.int16)
-                        audio = samples.astype(np.float32) / 32768.0
-                    elif bits_per_sample == 8:
-                        samples = np.frombuffer(audio_data, dtype=np.uint8)
-                        audio = (samples.astype(np.float32) - 128) / 128.0
-                    else:
-                        audio = np.random.randn(len(audio_data) // 2) * 0.3
-
-                    # 스테레오를 모노로 변환
-                    if channels == 2:
-                        audio = audio.reshape(-1, 2).mean(axis=1)
-
-                    return audio.astype(np.float32), sample_rate
-
-                pos += 8 + chunk_size
-                if chunk_size % 2:  # 패딩
-                    pos += 1
-
-            # data 청크를 찾지 못한 경우
-            return self.load_audio(file_data)
-
-        except Exception as e:
+            return self.load_wav(file_data)
+        except AudioDecodeError as e:
             print(f"WAV 파싱 오류: {e}")
-            return self.load_audio(file_data)
+            return None
 
     def preprocess(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
         """
@@ -127,27 +113,52 @@ class AudioProcessor:
         Returns:
             전처리된 오디오
         """
-        if self._prototype_mode:
-            # 간단한 정규화만 수행
-            audio = audio / (np.max(np.abs(audio)) + 1e-8)
-            return audio.astype(np.float32)
+        audio = self.resample(audio, sample_rate)
+        # 피크 정규화
+        audio = audio / (np.max(np.abs(audio), initial=0.0) + 1e-8)
+        return audio.astype(np.float32, copy=False)
+
+    def resample(self, audio: np.ndarray, sample_rate: int, target_rate: Optional[int] = None) -> np.ndarray:
+        """
+        폴리페이즈 리샘플링 (샘플레이트 쌍별 필터 캐시, 블록 단위 처리)
 
-        # 실제 구현:
-        # import librosa
-        # # 리샘플링
-        # if sample_rate != self.TARGET_SAMPLE_RATE:
-        #     audio = librosa.resample(audio, orig_sr=sample_rate, target_sr=self.TARGET_SAMPLE_RATE)
-        # # 정규화
-        # audio = librosa.util.normalize(audio)
-        # return audio
+        Args:
+            audio: 모노 오디오 신호
+            sample_rate: 원본 샘플레이트
+            target_rate: 목표 샘플레이트 (기본: TARGET_SAMPLE_RATE)
+
+        Returns:
+            float32 오디오 (샘플레이트가 같으면 그대로)
+        """
+        return resample(audio, sample_rate, target_rate or self.TARGET_SAMPLE_RATE)
 
     def get_duration(self, audio: np.ndarray, sample_rate: int) -> float:
         """오디오 길이(초) 계산"""
         return len(audio) / sample_rate
 
+    def encode_wav(self, audio: np.ndarray, sample_rate: int = 16000) -> bytes:
+        """
+        모노 16bit PCM WAV 인코딩
+
+        Args:
+            audio: 오디오 신호 (int16 또는 -1.0 ~ 1.0 범위의 float)
+            sample_rate: 샘플레이트
+
+        Returns:
+            WAV 파일 바이트
+        """
+        if audio.dtype != np.int16:
+            audio = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        pcm = audio.astype('<i2', copy=False).tobytes()
+
+        header = b'RIFF' + struct.pack('<I', 36 + len(pcm)) + b'WAVE'
+        header += b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        header += b'data' + struct.pack('<I', len(pcm))
+        return header + pcm
+
     def extract_mel_spectrogram(self, audio: np.ndarray, sample_rate: int = 16000) -> np.ndarray:
         """
-        멜-스펙트로그램 추출
+        멜-스펙트로그램 추출 (n_fft=400, hop=160, 80 멜, 최댓값 기준 dB)
 
         Args:
             audio: 오디오 신호
@@ -156,21 +167,16 @@ class AudioProcessor:
         Returns:
             멜-스펙트로그램 (n_mels x time)
         """
-        if self._prototype_mode:
-            # 목업: 임의의 멜-스펙트로그램 생성
-            n_mels = 80
-            n_frames = len(audio) // 160  # hop_length=160 가정
-            mel_spec = np.random.randn(n_mels, max(1, n_frames)) * 0.5 + 2.0
-            return mel_spec.astype(np.float32)
-
-        # 실제 구현:
-        # import librosa
-        # mel_spec = librosa.feature.melspectrogram(
-        #     y=audio, sr=sample_rate,
-        #     n_fft=400, hop_length=160, n_mels=80
-        # )
-        # mel_spec_db = librosa.power_to_db(mel_spec, ref=np.max)
-        # return mel_spec_db
+        return compute_features(audio, sample_rate).log_mel()
+
+    def extract_mel_spectrograms(self, clips: Sequence[np.ndarray], sample_rate: int = 16000) -> List[np.ndarray]:
+        """
+        여러 클립의 멜-스펙트로그램 추출 (클립별 루프, 출력 배열은 한 번만 할당)
+
+        Returns:
+            클립 순서대로 (n_mels x time) 리스트
+        """
+        return [features.log_mel() for features in compute_features_batch(clips, sample_rate)]
 
     def validate_audio(self, audio: np.ndarray, sample_rate: int) -> dict:
         """
@@ -212,31 +218,51 @@ class AudioProcessor:
             "issues": issues
         }
 
-    def trim_silence(self, audio: np.ndarray, threshold: float = 0.01) -> np.ndarray:
+    def trim_silence(
+        self,
+        audio: np.ndarray,
+        threshold: float = 0.01,
+        sample_rate: int = 16000,
+        pad_seconds: float = 0.25,
+        min_seconds: float = 0.0
+    ) -> np.ndarray:
         """
         앞뒤 무음 구간 제거
 
+        20ms 프레임 RMS로 음성 프레임을 찾습니다. 녹음 음량이 작으면 임계값을
+        가장 큰 프레임 대비 -20dB까지 낮추어 조용한 음성이 잘리지 않게 합니다.
+
         Args:
-            audio: 오디오 신호
-            threshold: 무음 판정 임계값
+            audio: 모노 오디오 신호
+            threshold: 무음 판정 RMS 임계값
+            sample_rate: 샘플레이트
+            pad_seconds: 음성 앞뒤로 남길 여유 (초)
+            min_seconds: 트리밍 후 최소 길이 (초, 음성 구간을 중심으로 확장)
 
         Returns:
-            트리밍된 오디오
+            트리밍된 오디오 (원본의 뷰, 전체가 무음이면 원본 그대로)
         """
-        if self._prototype_mode:
-            return audio  # 프로토타입에서는 트리밍 생략
-
-        # 에너지 기반 음성 구간 탐지
-        energy = np.abs(audio)
-        mask = energy > threshold
-
-        # 첫 번째와 마지막 음성 구간 찾기
-        indices = np.where(mask)[0]
-        if len(indices) == 0:
+        frame = max(1, int(0.02 * sample_rate))
+        n_frames = len(audio) // frame
+        if n_frames == 0:
+            return audio
+
+        frames = np.asarray(audio[:n_frames * frame]).reshape(n_frames, frame)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+        voiced = np.flatnonzero(rms > min(threshold, 0.1 * rms.max()))
+        if len(voiced) == 0:
             return audio  # 전체가 무음이면 원본 반환
 
-        start = max(0, indices[0] - 1000)  # 약간의 여유
-        end = min(len(audio), indices[-1] + 1000)
+        pad = int(pad_seconds * sample_rate)
+        start = max(0, voiced[0] * frame - pad)
+        end = min(len(audio), (voiced[-1] + 1) * frame + pad)
+
+        # 최소 길이에 못 미치면 양쪽으로 넓힘
+        shortfall = int(min_seconds * sample_rate) - (end - start)
+        if shortfall > 0:
+            start = max(0, start - shortfall // 2)
+            end = min(len(audio), start + int(min_seconds * sample_rate))
+            start = max(0, end - int(min_seconds * sample_rate))
 
         return audio[start:end]
 
@@ -0,0 +1,101 @@
+"""
+임베딩 전송 형식 코덱
+엔드포인트 응답(바이너리 float32 / base64 / .npy / JSON)을 파이썬 float 객체를 거치지 않고 NumPy로 디코딩
+"""
+
+import base64
+import io
+import json
+import struct
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 - 없으면 표준 json 사용
+    orjson = None
+
+RAW_CONTENT_TYPES = {"application/octet-stream", "application/x-float32"}
+BASE64_CONTENT_TYPES = {"application/base64", "application/x-float32-base64", "text/plain"}
+NPY_CONTENT_TYPES = {"application/x-npy", "application/npy"}
+
+# 임베딩 요청 Accept 헤더 (바이너리 형식 우선, JSON은 하위 호환)
+EMBEDDING_ACCEPT = "application/x-npy, application/octet-stream;q=0.9, application/json;q=0.5"
+
+
+def loads_json(data: bytes) -> Any:
+    """JSON 디코딩 (orjson이 있으면 사용)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def from_raw(data: bytes) -> np.ndarray:
+    """리틀엔디언 float32 바이트 → 1차원 배열 (복사 없음, 읽기 전용)"""
+    if len(data) % 4:
+        raise ValueError(f"float32 임베딩 길이가 4의 배수가 아닙니다 ({len(data)}바이트)")
+    return np.frombuffer(data, dtype="<f4")
+
+
+def from_base64(text) -> np.ndarray:
+    """base64 인코딩된 리틀엔디언 float32 → 1차원 배열"""
+    return from_raw(base64.b64decode(text))
+
+
+def to_base64(vector: np.ndarray) -> str:
+    """1차원 배열 → base64 인코딩된 리틀엔디언 float32 (캐시/JSON 저장용)"""
+    return base64.b64encode(np.ascontiguousarray(vector, dtype="<f4").tobytes()).decode("ascii")
+
+
+def from_npy(data: bytes) -> np.ndarray:
+    """.npy 바이트 → 1차원 float32 배열 (헤더만 파싱하고 데이터는 버퍼 위에서 바로 해석)"""
+    if data[:6] != b"\x93NUMPY" or len(data) < 10:
+        raise ValueError(".npy 형식이 아닙니다")
+    if data[6] == 1:
+        header_end = 10 + struct.unpack("<H", data[8:10])[0]
+    else:
+        header_end = 12 + struct.unpack("<I", data[8:12])[0]
+    # 같은 모양의 응답은 헤더 바이트가 같으므로 파싱 결과를 재사용
+    count, dtype = _npy_header(bytes(data[:header_end]))
+    array = np.frombuffer(data, dtype=dtype, count=count, offset=header_end)
+    return array.astype(np.float32, copy=False).reshape(-1)
+
+
+@lru_cache(maxsize=32)
+def _npy_header(header: bytes) -> Tuple[int, np.dtype]:
+    """.npy 헤더 파싱 → (원소 수, dtype)"""
+    stream = io.BytesIO(header)
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, _, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, _, dtype = np.lib.format.read_array_header_2_0(stream)
+    if dtype.hasobject:
+        raise ValueError("객체 배열 .npy는 지원하지 않습니다")
+    return (int(np.prod(shape)) if shape else 1), dtype
+
+
+def decode_binary_embedding(body: bytes, content_type: str) -> Optional[np.ndarray]:
+    """
+    바이너리 임베딩 응답 디코딩
+
+    Args:
+        body: 응답 본문
+        content_type: 응답 Content-Type (파라미터 제외)
+
+    Returns:
+        1차원 float32 배열 (바이너리 형식이 아니면 None - 호출자가 JSON으로 처리)
+
+    Raises:
+        ValueError: 바이너리 형식이지만 본문이 손상된 경우
+    """
+    content_type = (content_type or "").lower()
+    if content_type in NPY_CONTENT_TYPES:
+        return from_npy(body)
+    if content_type in RAW_CONTENT_TYPES:
+        return from_raw(body)
+    if content_type in BASE64_CONTENT_TYPES:
+        return from_base64(body.strip())
+    return None
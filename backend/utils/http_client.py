@@ -0,0 +1,76 @@
+"""
+공유 HTTP 클라이언트
+HuggingFace Inference Endpoint 호출용 keep-alive 커넥션 풀 관리
+"""
+
+import aiohttp
+from typing import Optional
+
+
+class HTTPClient:
+    """
+    장기 실행 aiohttp 세션 래퍼
+
+    앱 수명 동안 하나의 커넥션 풀을 유지하여
+    요청마다 TCP/TLS 핸드셰이크가 반복되지 않도록 합니다.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def is_open(self) -> bool:
+        """세션 사용 가능 여부"""
+        return self._session is not None and not self._session.closed
+
+    async def start(self):
+        """커넥션 풀 생성 (앱 시작 시 호출)"""
+        if self.is_open:
+            return
+
+        from config import settings
+
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.HTTP_TOTAL_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        print(
+            f"[HTTPClient] 커넥션 풀 시작 "
+            f"(limit={settings.HTTP_POOL_LIMIT}, per_host={settings.HTTP_POOL_LIMIT_PER_HOST})"
+        )
+
+    async def close(self):
+        """커넥션 풀 종료 (앱 종료 시 호출)"""
+        if self.is_open:
+            await self._session.close()
+            print("[HTTPClient] 커넥션 풀 종료")
+        self._session = None
+
+    async def session(self) -> aiohttp.ClientSession:
+        """
+        공유 세션 반환
+
+        lifespan 밖(스크립트 등)에서 호출되면 지연 생성합니다.
+        """
+        if not self.is_open:
+            await self.start()
+        return self._session
+
+
+# 전역 인스턴스
+_client_instance = None
+
+def get_http_client() -> HTTPClient:
+    """공유 HTTP 클라이언트 싱글톤 인스턴스 반환"""
+    global _client_instance
+    if _client_instance is None:
+        _client_instance = HTTPClient()
+    return _client_instance
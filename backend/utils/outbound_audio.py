@@ -0,0 +1,273 @@
+"""
+원격 추론 전송 오디오 인코더
+업로드를 한 번 디코딩해 16kHz 모노로 맞추고 앞뒤 무음을 잘라 16bit PCM WAV로 다시 인코딩
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .audio_processor import AudioProcessor, get_processor
+from .upload_ingest import sniff_audio_format
+from .wav_decoder import WAVE_FORMAT_PCM, WavFormatError, parse_wav_header
+
+AUDIO_CONTENT_TYPES = {
+    'wav': 'audio/wav',
+    'flac': 'audio/flac',
+    'ogg': 'audio/ogg',
+    'mp3': 'audio/mpeg',
+    'm4a': 'audio/mp4',
+    'webm': 'audio/webm',
+}
+
+
+def audio_content_type(data: bytes) -> str:
+    """매직 바이트로 판별한 실제 Content-Type (알 수 없으면 application/octet-stream)"""
+    return AUDIO_CONTENT_TYPES.get(sniff_audio_format(data[:16]), 'application/octet-stream')
+
+
+class OutboundAudio:
+    """
+    원격 엔드포인트로 보낼 페이로드
+
+    encoded가 False이면 디코딩할 수 없는 형식이거나 이미 전송 형식(잘라낼 무음 없음)이라
+    원본을 그대로 보냅니다.
+    audio에는 페이로드와 같은 구간의 모노 float32 샘플(sample_rate)이 담기며,
+    로컬 분석(사전 판정, 샘플 가중치, 구간 분할)이 페이로드를 다시 디코딩하지 않고 사용합니다.
+    디코딩할 수 없는 형식이면 None입니다.
+    """
+
+    def __init__(
+        self,
+        payload: bytes,
+        content_type: str,
+        original_bytes: int,
+        encoded: bool,
+        audio: Optional[np.ndarray] = None,
+        sample_rate: Optional[int] = None
+    ):
+        self.payload = payload
+        self.content_type = content_type
+        self.original_bytes = original_bytes
+        self.encoded = encoded
+        self.audio = audio
+        self.sample_rate = sample_rate
+
+    @property
+    def decoded(self) -> Optional[Tuple[np.ndarray, int]]:
+        """(모노 float32 오디오, 샘플레이트) 또는 None"""
+        return None if self.audio is None else (self.audio, self.sample_rate)
+
+    @property
+    def saved_bytes(self) -> int:
+        """원본 대비 줄어든 바이트 수 (저샘플레이트 원본을 올리면 음수)"""
+        return self.original_bytes - len(self.payload)
+
+    def to_dict(self) -> Dict:
+        return {
+            "encoded": self.encoded,
+            "content_type": self.content_type,
+            "original_bytes": self.original_bytes,
+            "payload_bytes": len(self.payload),
+            "saved_bytes": self.saved_bytes
+        }
+
+
+class OutboundEncoder:
+    """
+    전송용 오디오 인코더
+
+    - 업로드를 한 번 디코딩 (다채널은 모노로 다운믹스)
+    - 폴리페이즈 리샘플러로 target_rate에 맞춤
+    - 앞뒤 무음 제거 (min_seconds 이상은 유지)
+    - 16bit 모노 PCM WAV로 재인코딩
+
+    이미 target_rate 16bit 모노 WAV인 입력도 무음 제거는 적용하며, 잘라낼 구간이 없으면
+    원본 바이트를 그대로 페이로드로 씁니다. 여러 단계가 같은 업로드를 보낼 때는
+    PendingOutbound로 한 번만 인코딩해 공유합니다.
+    FLAC 인코더는 NumPy만으로 구현하지 않으며 WAV만 생성합니다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        target_rate: int = AudioProcessor.TARGET_SAMPLE_RATE,
+        trim: bool = True,
+        trim_threshold: float = 0.01,
+        trim_pad: float = 0.25,
+        min_seconds: float = 1.0,
+        processor: Optional[AudioProcessor] = None
+    ):
+        """
+        Args:
+            enabled: False면 원본을 그대로 전송 (Content-Type만 실제 형식으로 지정)
+            target_rate: 전송 샘플레이트
+            trim: 앞뒤 무음 제거 여부
+            trim_threshold: 무음 판정 프레임 RMS
+            trim_pad: 음성 앞뒤로 남길 여유 (초)
+            min_seconds: 무음 제거 후 최소 길이 (초)
+            processor: 디코딩/리샘플링/인코딩에 사용할 오디오 프로세서
+        """
+        self.enabled = enabled
+        self.target_rate = target_rate
+        self.trim = trim
+        self.trim_threshold = trim_threshold
+        self.trim_pad = trim_pad
+        self.min_seconds = min_seconds
+        self.processor = processor or get_processor()
+        self._stats = {
+            "requests": 0,
+            "encoded": 0,
+            "passthrough": 0,
+            "original_bytes": 0,
+            "payload_bytes": 0
+        }
+
+    def encode(
+        self,
+        audio_bytes: bytes,
+        decoded: Optional[Tuple[np.ndarray, int]] = None
+    ) -> OutboundAudio:
+        """
+        전송용 페이로드 생성
+
+        Args:
+            audio_bytes: 업로드 원본 바이트
+            decoded: 업로드 수신 중 디코딩한 (모노 float32 오디오, 샘플레이트) - 있으면 다시 디코딩하지 않음
+
+        Returns:
+            OutboundAudio (디코딩할 수 없는 형식은 원본과 실제 Content-Type)
+        """
+        if decoded is None and self.enabled:
+            decoded = self.processor.decode(audio_bytes)
+        if decoded is None or not self.enabled:
+            audio, sample_rate = decoded if decoded is not None else (None, None)
+            outbound = OutboundAudio(
+                audio_bytes, audio_content_type(audio_bytes), len(audio_bytes), False, audio, sample_rate
+            )
+        else:
+            audio, sample_rate = decoded
+            resampled = self.processor.resample(audio, sample_rate, self.target_rate)
+            audio = resampled
+            if self.trim:
+                audio = self.processor.trim_silence(
+                    audio, self.trim_threshold, self.target_rate, self.trim_pad, self.min_seconds
+                )
+            if len(audio) == len(resampled) and self._is_outbound_format(audio_bytes):
+                # 이미 전송 형식이고 잘라낼 무음도 없음 - 다시 인코딩하지 않고 원본 전송
+                outbound = OutboundAudio(audio_bytes, 'audio/wav', len(audio_bytes), False, audio, self.target_rate)
+            else:
+                payload = self.processor.encode_wav(audio, self.target_rate)
+                outbound = OutboundAudio(payload, 'audio/wav', len(audio_bytes), True, audio, self.target_rate)
+
+        self._stats["requests"] += 1
+        self._stats["encoded" if outbound.encoded else "passthrough"] += 1
+        self._stats["original_bytes"] += outbound.original_bytes
+        self._stats["payload_bytes"] += len(outbound.payload)
+        return outbound
+
+    async def encode_async(
+        self,
+        audio_bytes: bytes,
+        decoded: Optional[Tuple[np.ndarray, int]] = None
+    ) -> OutboundAudio:
+        """encode를 작업 스레드에서 실행 (리샘플링/인코딩 동안 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.encode, audio_bytes, decoded)
+
+    def _is_outbound_format(self, audio_bytes: bytes) -> bool:
+        """target_rate 16bit 모노 PCM WAV인지 여부 (헤더만 확인)"""
+        if audio_bytes[:4] != b'RIFF':
+            return False
+        try:
+            parsed = parse_wav_header(audio_bytes[:4096])
+        except WavFormatError:
+            return False
+        if parsed is None:
+            return False
+        wav_format = parsed[0]
+        return (
+            wav_format.audio_format == WAVE_FORMAT_PCM
+            and wav_format.bits_per_sample == 16
+            and wav_format.channels == 1
+            and wav_format.sample_rate == self.target_rate
+        )
+
+    def stats(self) -> Dict:
+        """인코딩 통계 (saved_bytes: 원본 대비 누적 절감 바이트)"""
+        original = self._stats["original_bytes"]
+        saved = original - self._stats["payload_bytes"]
+        return {
+            "enabled": self.enabled,
+            **self._stats,
+            "saved_bytes": saved,
+            "saved_ratio": round(saved / original, 3) if original else None
+        }
+
+
+class PendingOutbound:
+    """
+    업로드 한 건의 전송 페이로드 (처음 필요할 때 한 번만 인코딩)
+
+    탐지기/검증기가 업로드 해시로 캐시에 적중하면 인코딩 자체를 건너뛰고,
+    둘 다 원격 호출이 필요하면 같은 인코딩 결과를 공유합니다.
+    """
+
+    def __init__(
+        self,
+        audio_bytes: bytes,
+        decoded: Optional[Tuple[np.ndarray, int]] = None,
+        encoder: Optional[OutboundEncoder] = None
+    ):
+        """
+        Args:
+            audio_bytes: 업로드 원본 바이트
+            decoded: 업로드 수신 중 디코딩한 (모노 float32 오디오, 샘플레이트)
+            encoder: 전송 오디오 인코더 (없으면 싱글톤 사용)
+        """
+        self.audio_bytes = audio_bytes
+        self.decoded = decoded
+        self.encoder = encoder or get_outbound_encoder()
+        self.elapsed: Optional[float] = None  # 인코딩 소요 시간(초), 인코딩하지 않았으면 None
+        self._task: Optional[asyncio.Future] = None
+
+    async def get(self) -> OutboundAudio:
+        """인코딩 결과 (첫 호출에서 시작, 이후 호출은 같은 결과를 기다림)"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._encode())
+        # 기다리던 쪽이 취소되어도 다른 쪽이 쓸 인코딩은 계속 진행
+        return await asyncio.shield(self._task)
+
+    async def _encode(self) -> OutboundAudio:
+        start = time.perf_counter()
+        try:
+            return await self.encoder.encode_async(self.audio_bytes, self.decoded)
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+    @property
+    def result(self) -> Optional[OutboundAudio]:
+        """완료된 인코딩 결과 (인코딩하지 않았거나 실패했으면 None)"""
+        if self._task is None or not self._task.done() or self._task.cancelled() or self._task.exception():
+            return None
+        return self._task.result()
+
+
+# 전역 인스턴스
+_encoder_instance = None
+
+def get_outbound_encoder() -> OutboundEncoder:
+    """전송 오디오 인코더 싱글톤 인스턴스 반환"""
+    global _encoder_instance
+    if _encoder_instance is None:
+        from config import settings
+        _encoder_instance = OutboundEncoder(
+            enabled=settings.OUTBOUND_ENCODING_ENABLED,
+            target_rate=settings.SAMPLE_RATE,
+            trim=settings.OUTBOUND_TRIM_SILENCE,
+            trim_threshold=settings.OUTBOUND_TRIM_THRESHOLD,
+            trim_pad=settings.OUTBOUND_TRIM_PAD,
+            min_seconds=settings.MIN_AUDIO_DURATION
+        )
+    return _encoder_instance
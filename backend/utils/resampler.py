@@ -0,0 +1,149 @@
+"""
+폴리페이즈 리샘플러
+Kaiser 윈도우 sinc 필터를 위상별로 분해하여 행렬 곱 한 번으로 블록 단위 변환 (NumPy 전용)
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+# 필터 반폭 (입출력 중 낮은 샘플레이트 기준 영점 교차 수)
+ZERO_CROSSINGS = 16
+# 차단 주파수 (낮은 쪽 나이퀴스트 대비) - 나머지는 전이 대역
+ROLLOFF = 0.94
+# Kaiser 윈도우 beta (약 80dB 저지 대역 감쇠)
+KAISER_BETA = 8.0
+# 블록당 중간 행렬 최대 원소 수 (float32 4MB)
+BLOCK_ELEMENTS = 1 << 20
+# up/down 최댓값 - 필터 행렬이 약 (down + 탭) x up이므로 서로소에 가까운 샘플레이트 쌍
+# (예: 22051 → 16000 = 16000/22051)은 이 범위의 가장 가까운 유리수로 근사
+# (비율 상대 오차 1/MAX_RATIO_TERM 미만, 실제로는 대개 1e-4 이하, 흔한 샘플레이트는 정확)
+MAX_RATIO_TERM = 1024
+
+
+def rational_ratio(src_rate: int, dst_rate: int, max_term: int = MAX_RATIO_TERM) -> Tuple[int, int]:
+    """
+    dst_rate / src_rate를 분자·분모가 max_term 이하인 (up, down)으로 표현
+
+    약분한 비율이 범위를 넘으면 가장 가까운 유리수로 근사합니다.
+
+    Raises:
+        ValueError: 비율 자체가 max_term배를 넘는 경우
+    """
+    ratio = Fraction(dst_rate, src_rate)
+    if max(ratio.numerator, ratio.denominator) <= max_term:
+        return ratio.numerator, ratio.denominator
+    if ratio > max_term or ratio < Fraction(1, max_term):
+        raise ValueError(f"샘플레이트 비율이 너무 큽니다 ({src_rate} → {dst_rate})")
+    # 1보다 작은 쪽에서 분모를 제한해야 분자도 함께 제한됨
+    if ratio < 1:
+        ratio = ratio.limit_denominator(max_term)
+    else:
+        ratio = 1 / (1 / ratio).limit_denominator(max_term)
+    return ratio.numerator, ratio.denominator
+
+
+class PolyphaseResampler:
+    """
+    유리수 비율(up/down) 폴리페이즈 리샘플러
+
+    출력 y[n]은 업샘플된 신호를 저역 통과 필터 h로 거른 뒤 down 간격으로 뽑은 값입니다.
+    n = m*up + j로 쓰면 출력 위상 j는 입력 x[m*down + r]들의 고정된 가중합이므로,
+    입력을 down 간격의 겹치는 윈도우(스트라이드 뷰, 복사 없음)로 보고
+    (윈도우 x 탭) @ (탭 x 위상) 행렬 곱으로 up개 출력을 한꺼번에 계산합니다.
+    긴 입력은 윈도우 행 단위 블록으로 나누어 중간 메모리를 BLOCK_ELEMENTS로 제한합니다.
+    up/down은 MAX_RATIO_TERM 이하로 제한하므로 (rational_ratio) 필터 행렬도 수 MB를 넘지 않습니다.
+    근사한 경우 실제 출력 샘플레이트는 src_rate * up / down입니다.
+    """
+
+    def __init__(
+        self,
+        src_rate: int,
+        dst_rate: int,
+        zero_crossings: int = ZERO_CROSSINGS,
+        rolloff: float = ROLLOFF,
+        beta: float = KAISER_BETA
+    ):
+        if src_rate <= 0 or dst_rate <= 0:
+            raise ValueError(f"잘못된 샘플레이트입니다 ({src_rate} → {dst_rate})")
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.up, self.down = rational_ratio(src_rate, dst_rate)
+
+        # 업샘플된 신호 기준 필터 (길이 2*half+1, 위상별 DC 이득 1)
+        max_rate = max(self.up, self.down)
+        half = zero_crossings * max_rate
+        taps = np.arange(-half, half + 1, dtype=np.float64)
+        h = np.sinc(rolloff * taps / max_rate) * np.kaiser(len(taps), beta)
+        h *= self.up / h.sum()
+
+        # 출력 위상 j가 참조하는 입력 오프셋 r의 범위 (y[m*up+j] = Σ_r x[m*down+r] · h[j*down+half-r*up])
+        phases = np.arange(self.up)
+        self._r_min = -(half // self.up)
+        r_max = ((self.up - 1) * self.down + half) // self.up
+        offsets = np.arange(self._r_min, r_max + 1)
+        index = phases[None, :] * self.down + half - offsets[:, None] * self.up
+        valid = (index >= 0) & (index < len(h))
+        matrix = np.where(valid, h[np.clip(index, 0, len(h) - 1)], 0.0)
+        self.filter = np.ascontiguousarray(matrix, dtype=np.float32)  # (탭 수 x up)
+
+    @property
+    def width(self) -> int:
+        """출력 한 주기(up개)가 읽는 입력 윈도우 길이"""
+        return self.filter.shape[0]
+
+    def output_length(self, length: int) -> int:
+        """입력 길이 → 출력 길이 (ceil(length * up / down))"""
+        return -(-length * self.up // self.down)
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        """
+        리샘플링
+
+        Args:
+            audio: 1차원 오디오 신호
+
+        Returns:
+            float32 오디오 (길이 ceil(len * dst / src))
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if self.up == self.down or not len(audio):
+            return audio
+
+        length = self.output_length(len(audio))
+        rows = -(-length // self.up)
+        # 윈도우 m은 x[m*down + r_min : m*down + r_min + width]
+        padded_length = (rows - 1) * self.down + self.width
+        padded = np.zeros(padded_length, dtype=np.float32)
+        lead = -self._r_min
+        padded[lead:lead + len(audio)] = audio[:padded_length - lead]
+
+        windows = np.lib.stride_tricks.as_strided(
+            padded, shape=(rows, self.width),
+            strides=(padded.strides[0] * self.down, padded.strides[0]),
+            writeable=False
+        )
+        output = np.empty((rows, self.up), dtype=np.float32)
+        block = max(1, BLOCK_ELEMENTS // self.width)
+        for start in range(0, rows, block):
+            # 스트라이드 뷰는 BLAS로 바로 곱할 수 없으므로 블록만 연속 배열로 복사
+            np.matmul(
+                np.ascontiguousarray(windows[start:start + block]), self.filter,
+                out=output[start:start + block]
+            )
+        return output.reshape(-1)[:length]
+
+
+@lru_cache(maxsize=16)
+def get_resampler(src_rate: int, dst_rate: int) -> PolyphaseResampler:
+    """샘플레이트 쌍별 리샘플러 (필터 설계 캐시)"""
+    return PolyphaseResampler(src_rate, dst_rate)
+
+
+def resample(audio: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """audio를 src_rate → dst_rate로 리샘플링 (같으면 float32 변환만)"""
+    if src_rate == dst_rate:
+        return np.asarray(audio, dtype=np.float32)
+    return get_resampler(src_rate, dst_rate)(audio)
@@ -0,0 +1,182 @@
+"""
+분석 결과 캐시
+오디오 SHA-256 해시를 키로 하는 LRU + TTL 캐시 (선택적 디스크 계층)
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def audio_digest(audio_bytes: bytes) -> str:
+    """오디오 바이트의 SHA-256 해시 (16진 문자열)"""
+    return hashlib.sha256(audio_bytes).hexdigest()
+
+
+class ResultCache:
+    """
+    콘텐츠 주소 기반 결과 캐시
+
+    - 메모리 계층: 직렬화된 바이트 크기 합으로 예산을 관리하는 LRU
+    - TTL: 만료된 항목은 조회 시 제거
+    - 디스크 계층(선택): 재시작 후에도 유지되도록 JSON 파일로 저장
+
+    값은 JSON 직렬화 가능한 객체(딕셔너리, 리스트)여야 합니다.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: float = 86400.0,
+        disk_dir: Optional[Path] = None
+    ):
+        """
+        캐시 초기화
+
+        Args:
+            namespace: 캐시 이름 (디스크 하위 폴더명)
+            max_bytes: 메모리 계층 최대 바이트 수
+            ttl: 항목 유효 시간 (초)
+            disk_dir: 디스크 계층 루트 경로 (None이면 메모리만 사용)
+        """
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = Path(disk_dir) / namespace if disk_dir else None
+
+        # key -> (만료 시각, 직렬화된 값)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        now = time.time()
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(payload)
+            self._remove(key)
+
+        payload = self._read_disk(key, now)
+        if payload is not None:
+            self._store(key, now + self.ttl, payload)
+            self.hits += 1
+            self.disk_hits += 1
+            return json.loads(payload)
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any):
+        """캐시 저장"""
+        payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        expires_at = time.time() + self.ttl
+        self._store(key, expires_at, payload)
+        self._write_disk(key, expires_at, payload)
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self.disk_dir is not None
+        }
+
+    def _store(self, key: str, expires_at: float, payload: bytes):
+        """메모리 계층 저장 후 예산 초과분 제거"""
+        if len(payload) > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (expires_at, payload)
+        self._bytes += len(payload)
+
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        """메모리 계층에서 항목 제거"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def _disk_path(self, key: str) -> Path:
+        """디스크 항목 경로 (해시 앞 2자리로 분산)"""
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float) -> Optional[bytes]:
+        """디스크 계층 조회"""
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                record = json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[ResultCache] 디스크 캐시 읽기 실패 ({self.namespace}): {e}")
+            return None
+
+        if record.get("expires_at", 0) <= now:
+            path.unlink(missing_ok=True)
+            return None
+
+        return json.dumps(record["value"], ensure_ascii=False).encode("utf-8")
+
+    def _write_disk(self, key: str, expires_at: float, payload: bytes):
+        """디스크 계층 저장 (임시 파일 후 교체)"""
+        if not self.disk_dir:
+            return
+
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(b'{"expires_at": ' + repr(expires_at).encode() + b', "value": ' + payload + b'}')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[ResultCache] 디스크 캐시 쓰기 실패 ({self.namespace}): {e}")
+
+
+def create_result_cache(namespace: str) -> Optional[ResultCache]:
+    """설정값으로 결과 캐시 생성 (비활성화 시 None)"""
+    from config import settings
+
+    if not settings.RESULT_CACHE_ENABLED:
+        return None
+
+    return ResultCache(
+        namespace,
+        max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+        ttl=settings.RESULT_CACHE_TTL,
+        disk_dir=settings.RESULT_CACHE_DIR if settings.RESULT_CACHE_DISK else None
+    )
@@ -0,0 +1,60 @@
+"""
+동일 요청 병합 (single-flight)
+같은 키로 동시에 들어온 요청은 진행 중인 하나의 호출 결과를 함께 기다림
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    진행 중인 비동기 호출 병합기
+
+    첫 요청만 실제 호출을 시작하고, 완료 전에 같은 키로 들어온 요청은
+    그 호출의 결과(또는 예외)를 공유합니다. 한 요청이 취소되어도
+    공유 호출은 취소되지 않습니다.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0  # 실제로 시작된 호출 수
+        self.coalesced = 0  # 진행 중인 호출에 합류한 요청 수
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        키 단위로 병합하여 호출
+
+        Args:
+            key: 병합 키 (예: 오디오 SHA-256)
+            fn: 실제 호출을 수행하는 코루틴 함수
+
+        Returns:
+            호출 결과 (병합된 요청들은 같은 객체를 공유)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._release(key, task))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _release(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 예외가 조용히 소실되지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict:
+        """병합 통계"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight)
+        }
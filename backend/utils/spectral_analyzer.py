@@ -0,0 +1,220 @@
+"""
+스펙트럼 아티팩트 분석기
+디코딩된 파형에서 합성 음성 특유의 스펙트럼/위상 아티팩트 지표를 계산 (NumPy 벡터 연산)
+"""
+
+import numpy as np
+from typing import Dict, Optional
+
+from .spectral_features import SpectralFeatures, frame_view, hann_window
+
+
+class SpectralArtifactAnalyzer:
+    """
+    로컬 CPU 스펙트럼 아티팩트 분석기
+
+    원격 호출 없이 단일 코어에서 수 밀리초 내에 다음 지표(0~1, 클수록 의심)를 계산합니다.
+
+    - high_freq_anomaly: 고대역(4kHz 이상) 에너지 비율의 비정상성 및 급격한 대역 차단
+    - phase_discontinuity: STFT 프레임 간 위상 진행(순간 주파수)의 흔들림
+    - mel_spectrogram_score: 음성 구간 스펙트럼 평탄도 (과도하게 매끈하거나 잡음 같은 스펙트럼)
+    - vocoder_artifacts: 장기 평균 스펙트럼의 주기적 피크 (업샘플링 보코더의 격자 아티팩트)
+    """
+
+    def __init__(
+        self,
+        n_fft: int = 400,
+        hop_length: int = 160,
+        max_frames: int = 600,
+        segment_frames: int = 30
+    ):
+        """
+        Args:
+            n_fft: STFT 프레임 길이 (16kHz 기준 25ms)
+            hop_length: 프레임 간격 (16kHz 기준 10ms)
+            max_frames: 분석할 최대 프레임 수 (긴 클립은 균등 간격 구간만 표본 추출)
+            segment_frames: 표본 구간당 연속 프레임 수 (위상 지표는 구간 안에서만 계산)
+        """
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.max_frames = max_frames
+        self.segment_frames = segment_frames
+        # 빈별 기대 위상 진행량을 상쇄하는 회전 인자 (정상 신호의 프레임 간 위상 변화)
+        expected_advance = 2 * np.pi * self.hop_length * np.arange(n_fft // 2 + 1) / n_fft
+        self._rotation = np.exp(-1j * expected_advance).astype(np.complex64)
+
+    def analyze(
+        self,
+        audio: Optional[np.ndarray],
+        sample_rate: int,
+        features: Optional[SpectralFeatures] = None
+    ) -> Optional[Dict[str, float]]:
+        """
+        아티팩트 지표 계산
+
+        Args:
+            audio: 모노 오디오 신호 (float, -1.0 ~ 1.0, features가 있으면 사용하지 않음)
+            sample_rate: 샘플레이트
+            features: 같은 n_fft/hop_length로 계산해 둔 공유 STFT 특징 (있으면 STFT 재계산 없음)
+
+        Returns:
+            지표 딕셔너리 (분석할 프레임이 부족하면 None)
+        """
+        if features is not None:
+            if (features.n_fft, features.hop_length) != (self.n_fft, self.hop_length):
+                raise ValueError("STFT 특징의 n_fft/hop_length가 분석기 설정과 다릅니다")
+            if features.length < self.n_fft * 4:
+                return None
+            spectrum, power = self._sample_features(features)
+        else:
+            audio = np.asarray(audio, dtype=np.float32)
+            if len(audio) < self.n_fft * 4:
+                return None
+            spectrum = self._stft(audio)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+        # spectrum/power: (구간, 프레임, 빈)
+
+        # 음성(유효 에너지) 프레임만 사용
+        frame_energy = power.sum(axis=2)
+        active = frame_energy > max(frame_energy.max() * 1e-4, 1e-10)
+        if active.sum() < 4:
+            return None
+
+        freqs = np.fft.rfftfreq(self.n_fft, d=1.0 / sample_rate)
+        active_power = power[active]
+
+        return {
+            "high_freq_anomaly": self._high_freq_anomaly(active_power, freqs),
+            "phase_discontinuity": self._phase_discontinuity(spectrum, active),
+            "mel_spectrogram_score": self._spectral_flatness(active_power),
+            "vocoder_artifacts": self._vocoder_periodicity(active_power)
+        }
+
+    def _segment_index(self, n_frames: int) -> Optional[np.ndarray]:
+        """max_frames를 넘으면 균등 간격 연속 구간의 프레임 인덱스 (구간 x 프레임), 아니면 None"""
+        if n_frames <= self.max_frames:
+            return None
+        n_segments = self.max_frames // self.segment_frames
+        starts = np.linspace(0, n_frames - self.segment_frames, n_segments).astype(np.int64)
+        return starts[:, None] + np.arange(self.segment_frames)
+
+    def _stft(self, audio: np.ndarray) -> np.ndarray:
+        """
+        구간별 STFT (segments x frames x bins)
+
+        프레임은 복사 없는 스트라이드 뷰로 만들고, 프레임 수가 max_frames를 넘으면
+        균등 간격의 연속 구간만 골라 FFT 비용을 클립 길이와 무관하게 유지합니다.
+        """
+        frames = frame_view(audio, self.n_fft, self.hop_length)
+        index = self._segment_index(len(frames))
+        frames = frames[index] if index is not None else frames[None]
+        return np.fft.rfft(frames * hann_window(self.n_fft), axis=-1).astype(np.complex64)
+
+    def _sample_features(self, features: SpectralFeatures):
+        """공유 STFT에서 분석 구간만 골라 (구간별 복소 스펙트럼, 파워) 반환 (파워는 캐시 재사용)"""
+        index = self._segment_index(features.n_frames)
+        if index is None:
+            return features.spectrum[None], features.power[None]
+        return features.spectrum[index], features.power[index]
+
+    @staticmethod
+    def _high_freq_anomaly(power: np.ndarray, freqs: np.ndarray) -> float:
+        """
+        고대역 에너지 비율 이상치
+
+        자연 음성의 4kHz 이상 에너지 비율은 대략 1~15% 범위입니다.
+        이 범위를 벗어나거나, 6kHz 이상이 4~6kHz 대비 급격히 잘려 있으면 점수가 높아집니다.
+        """
+        ltas = power.mean(axis=0)
+        total = ltas.sum() + 1e-12
+        high_ratio = ltas[freqs >= 4000].sum() / total
+
+        # 자연 범위 [1%, 15%]에서 로그 스케일로 벗어난 정도
+        low_dev = max(0.0, np.log10(0.01 / (high_ratio + 1e-9)))
+        high_dev = max(0.0, np.log10((high_ratio + 1e-9) / 0.15))
+        ratio_score = min(1.0, (low_dev + high_dev) / 1.5)
+
+        # 대역 차단(cutoff) 감지: 6kHz 이상 평균 에너지 / 4~6kHz 평균 에너지
+        mid = ltas[(freqs >= 4000) & (freqs < 6000)]
+        top = ltas[freqs >= 6000]
+        cutoff_score = 0.0
+        if len(mid) and len(top):
+            drop_db = 10 * np.log10((mid.mean() + 1e-12) / (top.mean() + 1e-12))
+            cutoff_score = float(np.clip((drop_db - 20.0) / 30.0, 0.0, 1.0))
+
+        return round(float(max(ratio_score, cutoff_score)), 3)
+
+    def _phase_discontinuity(self, spectrum: np.ndarray, active: np.ndarray) -> float:
+        """
+        프레임 간 위상 불연속
+
+        각 빈의 프레임 간 위상 진행(기대 진행량 제거)이 다음 프레임에서 얼마나 바뀌는지,
+        즉 순간 주파수의 흔들림을 [-π, π]로 감싸 에너지 가중 평균 |변화|/π로 계산합니다.
+        정상 성분은 0에 가깝고, 무작위 위상은 약 0.5입니다.
+        """
+        # 위상차는 복소수 곱으로 계산 (angle/exp 반복 호출 회피)
+        advance = spectrum[:, 1:] * np.conj(spectrum[:, :-1]) * self._rotation
+        change_vec = advance[:, 1:] * np.conj(advance[:, :-1])
+        change = np.abs(np.angle(change_vec)) / np.pi
+
+        # 연속 세 프레임이 모두 유효하고 에너지가 큰 빈에 가중치 (|change_vec|의 제곱근 ~ 프레임 에너지)
+        weights = np.sqrt(np.abs(change_vec))
+        weights *= (active[:, 2:] & active[:, 1:-1] & active[:, :-2])[..., None]
+        total = weights.sum()
+        if total <= 0:
+            return 0.0
+
+        mean_change = float((change * weights).sum() / total)
+        # 정상 음성은 대체로 0.15 이하 - 그 이상을 0~1로 확장
+        return round(float(np.clip((mean_change - 0.15) / 0.35, 0.0, 1.0)), 3)
+
+    @staticmethod
+    def _spectral_flatness(power: np.ndarray) -> float:
+        """
+        음성 구간 평균 스펙트럼 평탄도
+
+        기하평균/산술평균 비율 (배음 구조가 뚜렷할수록 0에 가까움).
+        """
+        power = power + 1e-12
+        flatness = np.exp(np.log(power).mean(axis=1)) / power.mean(axis=1)
+        return round(float(np.clip(np.median(flatness) * 2.0, 0.0, 1.0)), 3)
+
+    @staticmethod
+    def _vocoder_periodicity(power: np.ndarray) -> float:
+        """
+        장기 평균 스펙트럼의 주기적 피크 강도
+
+        로그 LTAS에서 완만한 추세를 제거한 잔차의 자기상관을 구해,
+        일정 간격 이상의 지연에서 나타나는 최대 상관값을 점수로 사용합니다.
+        """
+        ltas_db = 10 * np.log10(power.mean(axis=0) + 1e-12)
+
+        kernel = np.ones(9) / 9
+        trend = np.convolve(ltas_db, kernel, mode="same")
+        residual = (ltas_db - trend)[4:-4]
+        residual = residual - residual.mean()
+
+        energy = float(np.dot(residual, residual))
+        if energy <= 1e-9:
+            return 0.0
+
+        n = len(residual)
+        padded = np.fft.rfft(residual, 2 * n)
+        autocorr = np.fft.irfft(padded * np.conj(padded))[:n] / energy
+
+        min_lag, max_lag = 4, n // 4
+        if max_lag <= min_lag:
+            return 0.0
+        peak = float(autocorr[min_lag:max_lag].max())
+        return round(float(np.clip(peak, 0.0, 1.0)), 3)
+
+
+# 전역 인스턴스
+_analyzer_instance = None
+
+def get_spectral_analyzer() -> SpectralArtifactAnalyzer:
+    """스펙트럼 아티팩트 분석기 싱글톤 인스턴스 반환"""
+    global _analyzer_instance
+    if _analyzer_instance is None:
+        _analyzer_instance = SpectralArtifactAnalyzer()
+    return _analyzer_instance
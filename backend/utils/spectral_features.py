@@ -0,0 +1,271 @@
+"""
+STFT/멜 특징 추출
+스트라이드 프레임 뷰 + 블록 단위 rfft/멜 행렬 곱, 파라미터별로 캐시한 윈도우/멜 필터뱅크 (NumPy 전용)
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+N_FFT = 400  # 16kHz 기준 25ms
+HOP_LENGTH = 160  # 16kHz 기준 10ms
+N_MELS = 80
+TOP_DB = 80.0  # 로그 멜 동적 범위 (최댓값 대비)
+# rfft/멜 행렬 곱을 한 번에 처리할 프레임 수 (중간 배열을 CPU 캐시 안에 유지)
+BLOCK_FRAMES = 256
+
+
+@lru_cache(maxsize=8)
+def hann_window(n_fft: int) -> np.ndarray:
+    """주기적 Hann 윈도우 (float32, 읽기 전용)"""
+    window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+
+def _hz_to_mel(hz: np.ndarray) -> np.ndarray:
+    """Slaney 멜 척도 (1kHz 이하 선형, 이상 로그)"""
+    hz = np.asarray(hz, dtype=np.float64)
+    mel = hz / (200.0 / 3)
+    log_region = hz >= 1000.0
+    mel[log_region] = 15.0 + np.log(hz[log_region] / 1000.0) / (np.log(6.4) / 27.0)
+    return mel
+
+
+def _mel_to_hz(mel: np.ndarray) -> np.ndarray:
+    mel = np.asarray(mel, dtype=np.float64)
+    hz = mel * (200.0 / 3)
+    log_region = mel >= 15.0
+    hz[log_region] = 1000.0 * np.exp((np.log(6.4) / 27.0) * (mel[log_region] - 15.0))
+    return hz
+
+
+@lru_cache(maxsize=8)
+def mel_filterbank(
+    sample_rate: int,
+    n_fft: int = N_FFT,
+    n_mels: int = N_MELS,
+    fmin: float = 0.0,
+    fmax: Optional[float] = None
+) -> np.ndarray:
+    """
+    삼각 멜 필터뱅크 (Slaney 척도, 대역폭 정규화)
+
+    Returns:
+        (n_mels x (n_fft // 2 + 1)) float32 행렬 (읽기 전용)
+    """
+    fmax = sample_rate / 2 if fmax is None else fmax
+    fft_freqs = np.fft.rfftfreq(n_fft, d=1.0 / sample_rate)
+    edges = _mel_to_hz(np.linspace(_hz_to_mel(np.array([fmin]))[0], _hz_to_mel(np.array([fmax]))[0], n_mels + 2))
+
+    lower = (fft_freqs[None, :] - edges[:-2, None]) / np.maximum(np.diff(edges)[:-1, None], 1e-10)
+    upper = (edges[2:, None] - fft_freqs[None, :]) / np.maximum(np.diff(edges)[1:, None], 1e-10)
+    weights = np.maximum(0.0, np.minimum(lower, upper))
+    weights *= (2.0 / (edges[2:] - edges[:-2]))[:, None]  # 필터 면적을 같게 정규화
+
+    weights = weights.astype(np.float32)
+    weights.setflags(write=False)
+    return weights
+
+
+def frame_view(audio: np.ndarray, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """
+    겹치는 프레임의 스트라이드 뷰 (복사 없음, 읽기 전용)
+
+    Args:
+        audio: 1차원 신호 또는 (클립 수 x 길이) 배열
+
+    Returns:
+        (프레임 수 x n_fft) 또는 (클립 수 x 프레임 수 x n_fft)
+    """
+    n_frames = max(0, 1 + (audio.shape[-1] - n_fft) // hop_length)
+    step = audio.strides[-1]
+    return np.lib.stride_tricks.as_strided(
+        audio,
+        shape=audio.shape[:-1] + (n_frames, n_fft),
+        strides=audio.strides[:-1] + (step * hop_length, step),
+        writeable=False
+    )
+
+
+class SpectralFeatures:
+    """
+    클립 하나의 공유 스펙트럼 특징
+
+    복소 STFT를 한 번 계산해 두고, 파워/멜/로그 멜은 처음 요청될 때 STFT에서
+    파생해 보관합니다. 여러 지표가 같은 객체를 받으면 STFT를 다시 계산하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        spectrum: np.ndarray,
+        sample_rate: int,
+        length: int,
+        n_fft: int = N_FFT,
+        hop_length: int = HOP_LENGTH,
+        n_mels: int = N_MELS,
+        power: Optional[np.ndarray] = None,
+        mel: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            spectrum: 복소 STFT (프레임 수 x 빈 수)
+            sample_rate: 샘플레이트
+            length: 원본 샘플 수
+            n_fft: 프레임 길이
+            hop_length: 프레임 간격
+            n_mels: 멜 대역 수
+            power: 미리 계산한 파워 스펙트럼 (compute_features에서 함께 계산한 경우)
+            mel: 미리 계산한 멜 파워 (프레임 수 x n_mels, compute_features에서 함께 계산한 경우)
+        """
+        self.spectrum = spectrum
+        self.sample_rate = sample_rate
+        self.length = length
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self._power = power
+        self._mel = mel
+
+    @property
+    def n_frames(self) -> int:
+        return self.spectrum.shape[0]
+
+    @property
+    def freqs(self) -> np.ndarray:
+        """빈별 중심 주파수 (Hz)"""
+        return np.fft.rfftfreq(self.n_fft, d=1.0 / self.sample_rate)
+
+    @property
+    def power(self) -> np.ndarray:
+        """파워 스펙트럼 (프레임 수 x 빈 수, float32)"""
+        if self._power is None:
+            self._power = self.spectrum.real ** 2 + self.spectrum.imag ** 2
+        return self._power
+
+    @property
+    def mel(self) -> np.ndarray:
+        """멜 파워 스펙트럼 (프레임 수 x n_mels)"""
+        if self._mel is None:
+            self._mel = self.power @ mel_filterbank(self.sample_rate, self.n_fft, self.n_mels).T
+        return self._mel
+
+    def log_mel(self, top_db: Optional[float] = TOP_DB) -> np.ndarray:
+        """
+        로그 멜 스펙트로그램 (dB, 최댓값 기준)
+
+        Returns:
+            (n_mels x 프레임 수) float32
+        """
+        return _power_to_db(self.mel, top_db).T
+
+
+def _power_to_db(power: np.ndarray, top_db: Optional[float]) -> np.ndarray:
+    """파워 → dB (전체 최댓값을 0dB로, top_db 아래는 잘라냄)"""
+    db = 10.0 * np.log10(np.maximum(power, 1e-10))
+    db -= db.max(initial=10.0 * np.log10(1e-10))
+    if top_db is not None:
+        np.maximum(db, -top_db, out=db)
+    return db.astype(np.float32, copy=False)
+
+
+def _pad(audio: np.ndarray, n_fft: int, center: bool) -> np.ndarray:
+    """중앙 정렬 패딩 (프레임 t가 샘플 t*hop을 중심으로 하도록 반사 패딩)"""
+    audio = np.asarray(audio, dtype=np.float32)
+    if not center:
+        return audio
+    pad = n_fft // 2
+    return np.pad(audio, pad, mode="reflect" if len(audio) > pad else "constant")
+
+
+def _transform(
+    frames: np.ndarray,
+    sample_rate: int,
+    n_fft: int,
+    n_mels: int,
+    spectrum: np.ndarray,
+    power: np.ndarray,
+    mel: np.ndarray
+) -> None:
+    """
+    프레임 뷰 → 복소 STFT/파워/멜 파워 (미리 할당한 출력에 기록)
+
+    전체 프레임을 한 번에 변환하면 중간 배열이 캐시를 벗어나 오히려 느려지므로
+    BLOCK_FRAMES 단위로 윈도우 곱 → rfft → 파워 → 멜 행렬 곱을 이어서 처리합니다.
+    """
+    window = hann_window(n_fft)
+    filterbank = mel_filterbank(sample_rate, n_fft, n_mels).T
+    for start in range(0, len(frames), BLOCK_FRAMES):
+        block = slice(start, start + BLOCK_FRAMES)
+        spectrum[block] = np.fft.rfft(frames[block] * window, axis=-1)
+        np.square(spectrum[block].real, out=power[block])
+        power[block] += np.square(spectrum[block].imag)
+        np.matmul(power[block], filterbank, out=mel[block])
+
+
+def _allocate(n_frames: int, n_fft: int, n_mels: int):
+    """(복소 STFT, 파워, 멜 파워) 출력 배열"""
+    return (
+        np.empty((n_frames, n_fft // 2 + 1), dtype=np.complex64),
+        np.empty((n_frames, n_fft // 2 + 1), dtype=np.float32),
+        np.empty((n_frames, n_mels), dtype=np.float32)
+    )
+
+
+def compute_features(
+    audio: np.ndarray,
+    sample_rate: int,
+    n_fft: int = N_FFT,
+    hop_length: int = HOP_LENGTH,
+    n_mels: int = N_MELS,
+    center: bool = True
+) -> SpectralFeatures:
+    """
+    클립 하나의 STFT/멜 특징 계산
+
+    Args:
+        audio: 모노 오디오 신호
+        sample_rate: 샘플레이트
+        center: True면 양끝을 n_fft/2만큼 반사 패딩 (프레임 수 1 + len // hop)
+
+    Returns:
+        SpectralFeatures
+    """
+    frames = frame_view(_pad(audio, n_fft, center), n_fft, hop_length)
+    spectrum, power, mel = _allocate(len(frames), n_fft, n_mels)
+    _transform(frames, sample_rate, n_fft, n_mels, spectrum, power, mel)
+    return SpectralFeatures(spectrum, sample_rate, len(audio), n_fft, hop_length, n_mels, power=power, mel=mel)
+
+
+def compute_features_batch(
+    clips: Sequence[np.ndarray],
+    sample_rate: int,
+    n_fft: int = N_FFT,
+    hop_length: int = HOP_LENGTH,
+    n_mels: int = N_MELS,
+    center: bool = True
+) -> List[SpectralFeatures]:
+    """
+    여러 클립의 STFT/멜 특징 계산 (클립별 루프, 출력 배열 공유)
+
+    변환 자체는 클립마다 compute_features와 같이 순서대로 수행하는 루프이고, 차이는
+    전체 클립의 프레임 수만큼 출력 배열을 한 번만 할당해 클립별 구간에 기록한다는 점뿐입니다.
+    최대 길이로 0을 채운 프레임은 변환하지 않습니다. 클립별 결과는 공유 배열의 뷰입니다.
+
+    Returns:
+        클립 순서대로 SpectralFeatures 리스트
+    """
+    frames = [frame_view(_pad(clip, n_fft, center), n_fft, hop_length) for clip in clips]
+    bounds = np.cumsum([0] + [len(clip_frames) for clip_frames in frames])
+    spectrum, power, mel = _allocate(int(bounds[-1]), n_fft, n_mels)
+
+    features = []
+    for clip, clip_frames, start, end in zip(clips, frames, bounds[:-1], bounds[1:]):
+        block = slice(start, end)
+        _transform(clip_frames, sample_rate, n_fft, n_mels, spectrum[block], power[block], mel[block])
+        features.append(SpectralFeatures(
+            spectrum[block], sample_rate, len(clip), n_fft, hop_length, n_mels,
+            power=power[block], mel=mel[block]
+        ))
+    return features
@@ -0,0 +1,138 @@
+"""
+음성 구간 분할기
+긴 클립에서 음성 구간을 찾아 고정 길이 윈도우로 나누고 구간별 품질 점수를 계산
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+from .audio_processor import AudioProcessor, get_processor
+
+
+class SpeechSegmenter:
+    """
+    에너지 기반 음성 구간 분할기
+
+    - 프레임(기본 20ms) RMS를 잡음 바닥(하위 백분위)과 비교해 음성 프레임을 표시
+    - 짧은 끊김은 메우고, 너무 짧은 음성 구간은 버림
+    - 음성 구간을 고정 길이 윈도우로 자르고 윈도우별 품질(추정 SNR × 음성 비율)을 계산
+    - 윈도우 수가 상한을 넘으면 품질이 높은 윈도우만 남김 (시간 순서 유지)
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 3.0,
+        frame_seconds: float = 0.02,
+        min_window_seconds: float = 1.5,
+        max_gap_seconds: float = 0.3,
+        noise_percentile: float = 10.0,
+        speech_ratio: float = 3.0,
+        min_rms: float = 0.001,
+        processor: Optional[AudioProcessor] = None
+    ):
+        """
+        Args:
+            window_seconds: 윈도우 길이 (초)
+            frame_seconds: 음성 판정 프레임 길이 (초)
+            min_window_seconds: 구간 끝에 남은 조각을 윈도우로 인정할 최소 길이 (초)
+            max_gap_seconds: 하나의 음성 구간으로 이어 붙일 최대 무음 길이 (초)
+            noise_percentile: 잡음 바닥으로 사용할 프레임 RMS 백분위
+            speech_ratio: 잡음 바닥 대비 이 배수를 넘는 프레임을 음성으로 판정
+            min_rms: 음성 판정 절대 하한 RMS
+            processor: 디코딩/인코딩에 사용할 오디오 프로세서
+        """
+        self.window_seconds = window_seconds
+        self.frame_seconds = frame_seconds
+        self.min_window_seconds = min_window_seconds
+        self.max_gap_seconds = max_gap_seconds
+        self.noise_percentile = noise_percentile
+        self.speech_ratio = speech_ratio
+        self.min_rms = min_rms
+        self.processor = processor or get_processor()
+
+    def segment(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        max_segments: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        음성 윈도우 추출
+
+        Args:
+            audio: 모노 오디오 신호 (float, -1.0 ~ 1.0)
+            sample_rate: 샘플레이트
+            max_segments: 반환할 최대 윈도우 수 (None이면 제한 없음)
+
+        Returns:
+            윈도우 리스트 (start/end: 초, audio: 원본 신호의 뷰, quality: 0~1)
+        """
+        frame = max(1, int(self.frame_seconds * sample_rate))
+        n_frames = len(audio) // frame
+        if n_frames == 0:
+            return []
+
+        frames = np.asarray(audio[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+        noise_floor = max(float(np.percentile(rms, self.noise_percentile)), 1e-6)
+        speech = rms > max(noise_floor * self.speech_ratio, self.min_rms)
+
+        window = int(round(self.window_seconds / self.frame_seconds))
+        min_window = int(round(self.min_window_seconds / self.frame_seconds))
+        segments = []
+        for start, end in self._regions(speech):
+            for offset in range(start, end, window):
+                stop = min(offset + window, end)
+                if stop - offset < min_window:
+                    continue
+                segments.append({
+                    "start": offset * frame / sample_rate,
+                    "end": stop * frame / sample_rate,
+                    "audio": audio[offset * frame:stop * frame],
+                    "quality": self._quality(rms[offset:stop], speech[offset:stop], noise_floor)
+                })
+
+        if max_segments is not None and len(segments) > max_segments:
+            keep = sorted(range(len(segments)), key=lambda i: segments[i]["quality"], reverse=True)[:max_segments]
+            segments = [segments[i] for i in sorted(keep)]
+        return segments
+
+    def encode(self, segment: Dict, sample_rate: int) -> bytes:
+        """윈도우를 모노 16bit WAV로 인코딩 (임베딩 엔드포인트 전송용)"""
+        return self.processor.encode_wav(segment["audio"], sample_rate)
+
+    def _regions(self, speech: np.ndarray) -> List[tuple]:
+        """음성 프레임 마스크를 (시작, 끝) 프레임 구간으로 변환 (짧은 끊김은 병합)"""
+        edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        if len(starts) == 0:
+            return []
+
+        max_gap = int(round(self.max_gap_seconds / self.frame_seconds))
+        regions = [[starts[0], ends[0]]]
+        for start, end in zip(starts[1:], ends[1:]):
+            if start - regions[-1][1] <= max_gap:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+        return [(int(start), int(end)) for start, end in regions]
+
+    def _quality(self, rms: np.ndarray, speech: np.ndarray, noise_floor: float) -> float:
+        """윈도우 품질: 음성 프레임의 추정 SNR(30dB에서 포화) × 음성 프레임 비율"""
+        if not speech.any():
+            return 0.0
+        snr_db = 20 * np.log10(float(np.mean(rms[speech])) / noise_floor)
+        return float(np.clip(snr_db / 30.0, 0.0, 1.0) * speech.mean())
+
+
+# 전역 인스턴스
+_segmenter_instance = None
+
+def get_speech_segmenter() -> SpeechSegmenter:
+    """음성 구간 분할기 싱글톤 인스턴스 반환"""
+    global _segmenter_instance
+    if _segmenter_instance is None:
+        from config import settings
+        _segmenter_instance = SpeechSegmenter(window_seconds=settings.SPEAKER_SEGMENT_SECONDS)
+    return _segmenter_instance
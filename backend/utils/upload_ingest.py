@@ -0,0 +1,424 @@
+"""
+업로드 수신 유틸리티
+청크 단위 읽기, 크기 제한, 해시 계산, 임시 파일 스필
+
+주의: FastAPI/Starlette는 엔드포인트를 호출하기 전에 멀티파트 본문 전체를 이미
+임시 파일로 받아 둡니다. 따라서 본문 수신 중 조기 거부는 UploadLimitMiddleware가
+담당하고 (크기 413, 파일 파트 매직 바이트 415), ingest_upload는 수신된 본문을 다시
+검사하며 해시/디코딩/길이 확인을 수행합니다.
+"""
+
+import hashlib
+from tempfile import SpooledTemporaryFile
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, UploadFile
+
+from .audio_probe import AudioProbe, probe_audio
+from .wav_decoder import StreamingWavDecoder, WavFormatError
+
+
+class UploadRejectedError(Exception):
+    """업로드 거부 (status_code로 HTTP 응답 코드 지정)"""
+
+    status_code = 400
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class UploadTooLargeError(UploadRejectedError):
+    """업로드 크기 초과"""
+
+    status_code = 413
+
+
+class UnsupportedAudioError(UploadRejectedError):
+    """오디오가 아닌 업로드"""
+
+    status_code = 415
+
+
+class AudioDurationError(UploadRejectedError):
+    """재생 길이가 허용 범위를 벗어난 업로드"""
+
+    status_code = 422
+
+
+def max_upload_bytes() -> int:
+    """
+    업로드 최대 바이트 수
+
+    MAX_AUDIO_DURATION 동안 허용되는 최대 비압축 바이트율에
+    컨테이너 헤더 여유분을 더한 값입니다.
+    """
+    from config import settings
+    return int(settings.MAX_AUDIO_DURATION * settings.UPLOAD_MAX_BYTE_RATE) + settings.UPLOAD_HEADER_SLACK
+
+
+def sniff_audio_format(head: bytes) -> Optional[str]:
+    """
+    매직 바이트로 오디오 컨테이너 판별
+
+    Args:
+        head: 파일 앞부분 바이트 (최소 12바이트 권장)
+
+    Returns:
+        포맷 문자열 ('wav', 'flac', 'ogg', 'mp3', 'm4a', 'webm') 또는 None
+    """
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'wav'
+    if head[:4] == b'fLaC':
+        return 'flac'
+    if head[:4] == b'OggS':
+        return 'ogg'
+    if head[:3] == b'ID3':
+        return 'mp3'
+    if head[4:8] == b'ftyp':
+        return 'm4a'
+    if head[:4] == b'\x1a\x45\xdf\xa3':
+        return 'webm'
+    # MPEG 오디오 프레임 동기 비트 (11비트)
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0:
+        return 'mp3'
+    return None
+
+
+class IngestedAudio:
+    """
+    수신 완료된 업로드
+
+    작은 업로드는 메모리에, 임계값을 넘으면 임시 파일에 보관합니다.
+    수신 중 디코딩한 WAV는 decoded에 (모노 float32 오디오, 샘플레이트)로,
+    헤더 프로브 결과는 probe에 담깁니다.
+    """
+
+    def __init__(
+        self,
+        spool: SpooledTemporaryFile,
+        size: int,
+        digest: str,
+        audio_format: str,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        decoded: Optional[Tuple[np.ndarray, int]] = None,
+        probe: Optional[AudioProbe] = None
+    ):
+        self._spool = spool
+        self.size = size
+        self.digest = digest
+        self.format = audio_format
+        self.filename = filename
+        self.content_type = content_type
+        self.decoded = decoded
+        self.probe = probe
+
+    @property
+    def duration(self) -> Optional[float]:
+        """헤더상의 재생 길이 (초, 알 수 없으면 None)"""
+        return self.probe.duration if self.probe is not None else None
+
+    @property
+    def spilled(self) -> bool:
+        """임시 파일로 스필되었는지 여부"""
+        return bool(getattr(self._spool, "_rolled", False))
+
+    def read(self) -> bytes:
+        """전체 바이트 반환"""
+        self._spool.seek(0)
+        return self._spool.read()
+
+    def close(self):
+        """임시 저장소 정리"""
+        self._spool.close()
+
+
+async def ingest_upload(
+    file: UploadFile,
+    max_bytes: Optional[int] = None,
+    spill_threshold: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    decode: bool = False,
+    check_duration: bool = True
+) -> IngestedAudio:
+    """
+    업로드 파일을 청크 단위로 수신
+
+    첫 청크에서 오디오 여부를 판별하고, 읽는 동안 SHA-256 해시를 계산하며,
+    크기 제한을 넘는 즉시 중단합니다. 이 시점에는 Starlette가 본문을 이미 모두
+    받아 둔 상태이므로, 검사는 메모리 사용과 이후 처리 비용을 막을 뿐 수신 자체를
+    앞당겨 거부하지는 않습니다 (본문 수신 중 거부는 UploadLimitMiddleware).
+    decode=True이면 WAV 업로드를 받는 동안 청크별로 디코딩하여 수신이 끝나는
+    시점에 샘플도 준비됩니다. 로컬 디코더가 없는 압축 형식은 decoded=None으로
+    통과시키고 (원격 엔드포인트가 디코딩), 디코딩할 수 없는 WAV는 이후 단계에서
+    다른 신호로 분석되지 않도록 거부합니다.
+    수신 후에는 컨테이너 헤더만 읽어 샘플레이트와 재생 길이를 확인하고,
+    MIN/MAX_AUDIO_SAMPLE_RATE나 MIN/MAX_AUDIO_DURATION을 벗어나면 리샘플링과
+    원격 추론 전에 거부합니다 (헤더로 알 수 없는 값은 통과).
+
+    Args:
+        file: FastAPI 업로드 파일
+        max_bytes: 최대 바이트 수 (기본: max_upload_bytes())
+        spill_threshold: 임시 파일로 전환할 바이트 수
+        chunk_size: 읽기 청크 크기
+        decode: WAV 업로드를 수신 중 디코딩할지 여부
+        check_duration: 헤더상의 재생 길이 제한 적용 여부
+
+    Returns:
+        IngestedAudio
+
+    Raises:
+        UploadTooLargeError: 크기 제한 초과
+        UnsupportedAudioError: 오디오 형식이 아닌 경우 (decode=True이면 디코딩할 수 없는 WAV 포함),
+            샘플레이트가 허용 범위를 벗어난 경우
+        AudioDurationError: 재생 길이가 허용 범위를 벗어난 경우
+    """
+    from config import settings
+
+    max_bytes = max_bytes or max_upload_bytes()
+    spill_threshold = spill_threshold or settings.UPLOAD_SPILL_THRESHOLD
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+
+    spool = SpooledTemporaryFile(max_size=spill_threshold)
+    hasher = hashlib.sha256()
+    size = 0
+    audio_format = None
+    decoder = None
+    blocks = []
+
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+
+            if audio_format is None:
+                audio_format = sniff_audio_format(chunk[:16])
+                if audio_format is None:
+                    raise UnsupportedAudioError("오디오 파일이 아닙니다")
+                if decode and audio_format == 'wav':
+                    decoder = StreamingWavDecoder()
+
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(
+                    f"파일이 너무 큽니다 (최대 {max_bytes / (1024 * 1024):.1f}MB)"
+                )
+
+            hasher.update(chunk)
+            spool.write(chunk)
+
+            if decoder is not None:
+                try:
+                    blocks.append(decoder.feed(chunk))
+                except WavFormatError as e:
+                    raise UnsupportedAudioError(f"디코딩할 수 없는 WAV 파일입니다 ({e})")
+
+        if size == 0:
+            raise UnsupportedAudioError("빈 파일입니다")
+        if decoder is not None:
+            try:
+                decoder.finish()
+            except WavFormatError as e:
+                raise UnsupportedAudioError(f"디코딩할 수 없는 WAV 파일입니다 ({e})")
+
+        probe = probe_audio(spool)
+        sample_rate = probe.sample_rate if probe is not None else None
+        if decoder is not None:
+            sample_rate = decoder.format.sample_rate
+        if sample_rate:
+            _check_sample_rate(sample_rate, settings.MIN_AUDIO_SAMPLE_RATE, settings.MAX_AUDIO_SAMPLE_RATE)
+        if check_duration and probe is not None and probe.duration is not None:
+            _check_duration(probe.duration, settings.MIN_AUDIO_DURATION, settings.MAX_AUDIO_DURATION)
+
+    except BaseException:
+        spool.close()
+        raise
+
+    decoded = None
+    if decoder is not None:
+        audio = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+        decoded = (audio, decoder.format.sample_rate)
+
+    return IngestedAudio(
+        spool,
+        size=size,
+        digest=hasher.hexdigest(),
+        audio_format=audio_format,
+        filename=file.filename,
+        content_type=file.content_type,
+        decoded=decoded,
+        probe=probe
+    )
+
+
+def _check_sample_rate(sample_rate: int, min_rate: int, max_rate: int):
+    """헤더상의 샘플레이트 확인 (벗어나면 UnsupportedAudioError - 리샘플링 전에 거부)"""
+    if not min_rate <= sample_rate <= max_rate:
+        raise UnsupportedAudioError(
+            f"지원하지 않는 샘플레이트입니다 ({sample_rate}Hz, {min_rate}~{max_rate}Hz)"
+        )
+
+
+def _check_duration(duration: float, min_duration: float, max_duration: float):
+    """재생 길이 제한 확인 (벗어나면 AudioDurationError)"""
+    if duration < min_duration:
+        raise AudioDurationError(f"음성이 너무 짧습니다 ({duration:.1f}초, 최소 {min_duration:g}초)")
+    if duration > max_duration:
+        raise AudioDurationError(f"음성이 너무 깁니다 ({duration:.1f}초, 최대 {max_duration:g}초)")
+
+
+class _MultipartAudioSniffer:
+    """
+    수신 중인 멀티파트 본문에서 파일 파트의 첫 바이트가 오디오인지 확인
+
+    파트 헤더에 filename이 있는 파트만 검사합니다. 본문을 모아 두지 않고
+    경계 탐색에 필요한 꼬리와 파트 헤더만 버퍼에 유지합니다.
+    """
+
+    HEAD_BYTES = 16
+    MAX_HEADER_BYTES = 16 * 1024
+
+    def __init__(self, boundary: bytes):
+        self.delimiter = b"\r\n--" + boundary
+        self.buffer = b"\r\n"  # 첫 경계 앞에는 CRLF가 없으므로 보충
+        self.state = "boundary"
+
+    @staticmethod
+    def boundary_of(content_type: bytes) -> Optional[bytes]:
+        """Content-Type 헤더의 multipart/form-data 경계 (멀티파트가 아니면 None)"""
+        media_type, _, params = content_type.partition(b";")
+        if media_type.strip().lower() != b"multipart/form-data":
+            return None
+        for param in params.split(b";"):
+            key, _, value = param.strip().partition(b"=")
+            if key.lower() == b"boundary" and value:
+                return value.strip(b'"')
+        return None
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        수신한 본문 조각 검사
+
+        Returns:
+            오디오가 아닌 파일 파트를 발견하면 False
+        """
+        if self.state == "done":
+            return True
+        self.buffer += chunk
+
+        while True:
+            if self.state == "boundary":
+                index = self.buffer.find(self.delimiter)
+                if index < 0:
+                    self.buffer = self.buffer[-(len(self.delimiter) - 1):]
+                    return True
+                self.buffer = self.buffer[index + len(self.delimiter):]
+                self.state = "headers"
+
+            elif self.state == "headers":
+                if self.buffer[:2] == b"--":
+                    # 마지막 경계
+                    self.state, self.buffer = "done", b""
+                    return True
+                index = self.buffer.find(b"\r\n\r\n")
+                if index < 0:
+                    if len(self.buffer) > self.MAX_HEADER_BYTES:
+                        # 비정상 헤더는 멀티파트 파서가 처리
+                        self.state, self.buffer = "done", b""
+                    return True
+                headers = self.buffer[:index].lower()
+                self.buffer = self.buffer[index + 4:]
+                self.state = "head" if b"filename=" in headers else "boundary"
+
+            else:  # head
+                # 첫 바이트 뒤에 경계가 붙어 있는지도 확인할 수 있을 만큼 받을 때까지 대기
+                window = self.HEAD_BYTES + len(self.delimiter)
+                end = self.buffer.find(self.delimiter, 0, window)
+                if end < 0 and len(self.buffer) < window:
+                    return True
+                # HEAD_BYTES보다 짧은 파트는 ingest_upload가 판단 (빈 파일 등)
+                if not 0 <= end < self.HEAD_BYTES and sniff_audio_format(self.buffer[:self.HEAD_BYTES]) is None:
+                    self.state, self.buffer = "done", b""
+                    return False
+                self.state = "boundary"
+
+
+class UploadLimitMiddleware:
+    """
+    요청 본문 크기/형식 제한 ASGI 미들웨어
+
+    Content-Length가 제한을 넘으면 본문을 받기 전에 413을 반환하고,
+    청크 전송 등 길이를 알 수 없는 경우에는 수신 바이트를 세다가 초과 즉시 중단합니다.
+    멀티파트 본문은 수신하는 대로 파일 파트의 매직 바이트를 확인해, 오디오가 아니면
+    나머지 본문을 받기 전에 415로 중단합니다.
+    """
+
+    def __init__(self, app, limits: Iterable[Tuple[str, int]]):
+        """
+        Args:
+            app: ASGI 앱
+            limits: (경로 접두사, 최대 바이트) 목록 - 먼저 일치하는 항목 적용
+        """
+        self.app = app
+        self.limits = list(limits)
+
+    def _limit_for(self, path: str) -> Optional[int]:
+        for prefix, limit in self.limits:
+            if path.startswith(prefix):
+                return limit
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._limit_for(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        boundary = _MultipartAudioSniffer.boundary_of(headers.get(b"content-type", b""))
+        sniffer = _MultipartAudioSniffer(boundary) if boundary else None
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                received += len(body)
+                # 본문 파싱 중 발생한 HTTPException은 그대로 응답으로 변환됨
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=self._detail(limit))
+                if sniffer is not None and not sniffer.feed(body):
+                    raise HTTPException(status_code=415, detail="오디오 파일이 아닙니다")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _detail(limit: int) -> str:
+        return f"요청 본문이 너무 큽니다 (최대 {limit / (1024 * 1024):.1f}MB)"
+
+    async def _reject(self, send, limit: int):
+        body = ('{"detail":"' + self._detail(limit) + '"}').encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,259 @@
+"""
+WAV/PCM 디코더
+memoryview/np.frombuffer 기반으로 data 청크를 복사하지 않고 모노 float32로 변환 (일괄/스트리밍)
+"""
+
+import struct
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# 헤더(RIFF + fmt + 부가 청크)가 이 크기 안에서 끝나지 않으면 WAV로 보지 않음
+MAX_HEADER_BYTES = 1024 * 1024
+
+# data 청크 길이를 모르는 스트리밍 기록기의 표시값
+_UNKNOWN_SIZES = (0, 0xFFFFFFFF)
+
+_EMPTY = np.zeros(0, dtype=np.float32)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class WavFormatError(ValueError):
+    """지원하지 않거나 손상된 WAV"""
+
+
+class WavFormat:
+    """
+    WAV fmt 청크 정보
+
+    - 정수 PCM: 8(부호 없음)/16/24/32비트
+    - IEEE float: 32/64비트
+    - WAVE_FORMAT_EXTENSIBLE은 하위 형식 GUID로 PCM/float 판별
+    """
+
+    def __init__(self, audio_format: int, channels: int, sample_rate: int, bits_per_sample: int, block_align: int):
+        self.audio_format = audio_format
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.bits_per_sample = bits_per_sample
+        self.block_align = block_align
+
+        sample_bytes = bits_per_sample // 8
+        if channels < 1 or sample_rate < 1:
+            raise WavFormatError(f"잘못된 WAV 형식입니다 (채널 {channels}, 샘플레이트 {sample_rate})")
+        if bits_per_sample % 8 or block_align != sample_bytes * channels:
+            raise WavFormatError(f"지원하지 않는 샘플 배치입니다 ({bits_per_sample}비트, 블록 {block_align}바이트)")
+        if audio_format == WAVE_FORMAT_PCM and bits_per_sample not in (8, 16, 24, 32):
+            raise WavFormatError(f"지원하지 않는 PCM 비트 수입니다 ({bits_per_sample})")
+        if audio_format == WAVE_FORMAT_IEEE_FLOAT and bits_per_sample not in (32, 64):
+            raise WavFormatError(f"지원하지 않는 float 비트 수입니다 ({bits_per_sample})")
+        if audio_format not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+            raise WavFormatError(f"지원하지 않는 WAV 인코딩입니다 (0x{audio_format:04x})")
+
+    @classmethod
+    def parse(cls, chunk: memoryview) -> "WavFormat":
+        """fmt 청크 본문 파싱"""
+        if len(chunk) < 16:
+            raise WavFormatError("fmt 청크가 너무 짧습니다")
+        audio_format, channels, sample_rate, _, block_align, bits = struct.unpack_from("<HHIIHH", chunk)
+        if audio_format == WAVE_FORMAT_EXTENSIBLE:
+            # cbSize(2) + validBits(2) + channelMask(4) + SubFormat GUID(16) - GUID 앞 2바이트가 형식 코드
+            if len(chunk) < 40:
+                raise WavFormatError("WAVE_FORMAT_EXTENSIBLE fmt 청크가 너무 짧습니다")
+            audio_format = struct.unpack_from("<H", chunk, 24)[0]
+        return cls(audio_format, channels, sample_rate, bits, block_align)
+
+
+def parse_wav_header(data: Buffer) -> Optional[Tuple[WavFormat, int, Optional[int]]]:
+    """
+    RIFF/WAVE 헤더에서 fmt 정보와 data 청크 위치 찾기
+
+    Args:
+        data: 파일 앞부분 (전체일 필요 없음)
+
+    Returns:
+        (형식, data 시작 오프셋, data 바이트 수 또는 None(길이 미상)),
+        헤더가 아직 다 들어오지 않았으면 None
+
+    Raises:
+        WavFormatError: RIFF/WAVE가 아니거나 지원하지 않는 형식
+    """
+    view = memoryview(data)
+    if len(view) < 12:
+        if view[:4] != b"RIFF"[:len(view)]:
+            raise WavFormatError("RIFF 파일이 아닙니다")
+        return None
+    if view[:4] != b"RIFF" or view[8:12] != b"WAVE":
+        raise WavFormatError("RIFF/WAVE 파일이 아닙니다")
+
+    pos = 12
+    wav_format = None
+    while pos + 8 <= len(view):
+        chunk_id = view[pos:pos + 4]
+        chunk_size = struct.unpack_from("<I", view, pos + 4)[0]
+        body = pos + 8
+
+        if chunk_id == b"data":
+            if wav_format is None:
+                raise WavFormatError("fmt 청크보다 data 청크가 먼저 나왔습니다")
+            return wav_format, body, None if chunk_size in _UNKNOWN_SIZES else chunk_size
+
+        if body + chunk_size > len(view):
+            break  # 이 청크 본문을 더 받아야 함
+        if chunk_id == b"fmt ":
+            wav_format = WavFormat.parse(view[body:body + chunk_size])
+        pos = body + chunk_size + (chunk_size & 1)  # 홀수 길이 청크 패딩
+
+    if len(view) > MAX_HEADER_BYTES:
+        raise WavFormatError("WAV 헤더에서 data 청크를 찾지 못했습니다")
+    return None
+
+
+def decode_frames(wav_format: WavFormat, data: Buffer) -> np.ndarray:
+    """
+    인터리브된 샘플 프레임 → 모노 float32 (-1.0 ~ 1.0)
+
+    data는 block_align의 배수여야 합니다. 입력 버퍼는 np.frombuffer 뷰로만 읽으며,
+    모노 float32 입력은 복사 없이 읽기 전용 뷰를 그대로 반환합니다.
+    """
+    if not len(data):
+        return _EMPTY
+    bits = wav_format.bits_per_sample
+    channels = wav_format.channels
+
+    if wav_format.audio_format == WAVE_FORMAT_IEEE_FLOAT:
+        samples = np.frombuffer(data, dtype="<f4" if bits == 32 else "<f8")
+        scale = 1.0
+    elif bits == 8:
+        samples = np.frombuffer(data, dtype=np.uint8)
+        scale = 1.0 / 128
+    elif bits == 24:
+        # 3바이트 샘플을 int32 상위 3바이트에 놓고 산술 시프트로 부호 확장
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        widened = np.zeros((len(packed), 4), dtype=np.uint8)
+        widened[:, 1:] = packed
+        samples = widened.view("<i4").reshape(-1) >> 8
+        scale = 1.0 / (1 << 23)
+    else:
+        samples = np.frombuffer(data, dtype="<i2" if bits == 16 else "<i4")
+        scale = 1.0 / (1 << (bits - 1))
+
+    if channels > 1:
+        audio = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32 if bits < 32 else np.float64)
+    else:
+        audio = samples
+
+    if bits == 8:
+        audio = audio.astype(np.float32) - 128.0
+    # 모노 float32 입력은 입력 버퍼의 뷰 그대로, 그 외에는 새 배열에서 제자리 배율 적용
+    audio = audio.astype(np.float32, copy=False)
+    if scale != 1.0:
+        audio *= np.float32(scale)
+    return audio
+
+
+def decode_wav(data: Buffer) -> Tuple[np.ndarray, int]:
+    """
+    WAV 전체 디코딩
+
+    Returns:
+        (모노 float32 오디오, 샘플레이트)
+
+    Raises:
+        WavFormatError: RIFF/WAVE가 아니거나 지원하지 않는 형식, 헤더가 잘린 경우
+    """
+    view = memoryview(data)
+    parsed = parse_wav_header(view)
+    if parsed is None:
+        raise WavFormatError("WAV 헤더가 잘렸습니다")
+    wav_format, offset, size = parsed
+    end = len(view) if size is None else min(len(view), offset + size)
+    usable = (end - offset) - (end - offset) % wav_format.block_align
+    return decode_frames(wav_format, view[offset:offset + usable]), wav_format.sample_rate
+
+
+class StreamingWavDecoder:
+    """
+    청크 단위 WAV 디코더
+
+    업로드가 끝나기 전에 들어온 청크부터 디코딩합니다. 헤더가 완성될 때까지는
+    앞부분만 모으고, 이후에는 청크를 뷰로 바로 해석하며 프레임 경계에서 잘린
+    바이트(한 프레임 미만)만 다음 청크로 넘깁니다.
+    """
+
+    def __init__(self):
+        self.format: Optional[WavFormat] = None
+        self.data_size: Optional[int] = None  # data 청크 바이트 수 (헤더에 없으면 None)
+        self.frames_decoded = 0
+        self._header = bytearray()
+        self._remaining: Optional[int] = None
+        self._partial = b""
+
+    @property
+    def expected_duration(self) -> Optional[float]:
+        """헤더에 기록된 길이 (초, 헤더 전이거나 길이 미상이면 None)"""
+        if self.format is None or self.data_size is None:
+            return None
+        return self.data_size // self.format.block_align / self.format.sample_rate
+
+    @property
+    def done(self) -> bool:
+        """data 청크를 끝까지 받았는지 여부"""
+        return self._remaining == 0
+
+    def feed(self, chunk: Buffer) -> np.ndarray:
+        """
+        청크 디코딩
+
+        Returns:
+            이번 청크로 완성된 모노 float32 샘플 (헤더 수신 중이면 빈 배열)
+
+        Raises:
+            WavFormatError: RIFF/WAVE가 아니거나 지원하지 않는 형식
+        """
+        if self.format is None:
+            self._header += chunk
+            parsed = parse_wav_header(self._header)
+            if parsed is None:
+                return _EMPTY
+            self.format, offset, self.data_size = parsed
+            self._remaining = self.data_size
+            view = memoryview(self._header)[offset:]
+            self._header = bytearray()
+            return self._decode(view)
+        return self._decode(memoryview(chunk))
+
+    def finish(self):
+        """스트림 종료 확인 (헤더가 완성되지 않았으면 WavFormatError)"""
+        if self.format is None:
+            raise WavFormatError("WAV 헤더가 잘렸습니다")
+
+    def _decode(self, view: memoryview) -> np.ndarray:
+        if self._remaining is not None:
+            view = view[:self._remaining]
+            self._remaining -= len(view)
+
+        align = self.format.block_align
+        head = None
+        if self._partial:
+            # 이전 청크에서 잘린 프레임을 완성 (한 프레임 미만만 복사)
+            need = align - len(self._partial)
+            joined = self._partial + bytes(view[:need])
+            view = view[need:]
+            if len(joined) < align:
+                self._partial = joined
+                return _EMPTY
+            head = decode_frames(self.format, joined)
+
+        usable = len(view) - len(view) % align
+        self._partial = bytes(view[usable:])
+        audio = decode_frames(self.format, view[:usable])
+        if head is not None:
+            audio = np.concatenate([head, audio])
+        self.frames_decoded += len(audio)
+        return audio